@@ -0,0 +1,58 @@
+import csv
+import importlib.util
+import io
+import json
+from typing import Any, AsyncIterator, Dict, Sequence
+from fastapi import Response
+
+# orjson sérialise directement en octets, beaucoup plus vite que json; repli sur json s'il est absent
+ORJSON_AVAILABLE = importlib.util.find_spec("orjson") is not None
+
+# Taille des blocs envoyés lors d'un export en flux
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+def dumps(content: Any) -> bytes:
+    """Sérialise des données en JSON compact (UTF-8)"""
+    if ORJSON_AVAILABLE:
+        import orjson
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+class FastJSONResponse(Response):
+    """Réponse JSON sérialisée directement, sans validation par un response_model
+
+    Réservée aux données déjà validées à l'écriture (articles lus en base): les
+    dictionnaires sont écrits tels quels, sans construction de modèles Pydantic.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+async def ndjson_chunks(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode des articles en NDJSON (un objet par ligne), par blocs d'environ EXPORT_CHUNK_SIZE octets"""
+    buffer = bytearray()
+    async for row in rows:
+        buffer += dumps(row)
+        buffer += b"\n"
+        if len(buffer) >= EXPORT_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+async def csv_chunks(rows: AsyncIterator[Dict[str, Any]], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    """Encode des articles en CSV (en-tête puis une ligne par article; tags: noms séparés par des virgules)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for row in rows:
+        if "tags" in row:
+            row["tags"] = ", ".join(tag.get("name", "") for tag in row["tags"])
+        writer.writerow([row.get(column) for column in columns])
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
@@ -1,7 +1,15 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from datetime import datetime
 from typing import List, Optional
-from ..models.schemas import Article, ArticleResponse, SourceConfig
+from .responses import FastJSONResponse, csv_chunks, ndjson_chunks
+from ..models.schemas import Article, ArticleResponse, ArticleCounts, SourceConfig, TagFacet
+from ..services.executor import TaskExecutor
+from ..services.feed_fetcher import FeedFetcher
 from ..services.rss_parser import RSSParser
+from ..services.ingestion import ingest_articles
+from ..services.ingestion_worker import IngestionWorker
+from ..services.scheduler import FeedScheduler
 from ..services.tag_generator import TagGenerator
 from ..db import database
 import logging
@@ -11,39 +19,237 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-rss_parser = RSSParser()
-tag_generator = TagGenerator()
+# Couche d'exécution partagée: threads pour les téléchargements, processus pour le parsing et les tags
+# (taille des pools: variables TECHPULSE_*_WORKERS, voir executor.py)
+task_executor = TaskExecutor()
+feed_fetcher = FeedFetcher(max_concurrency=task_executor.io_workers, per_host_limit=4, timeout=20.0, executor=task_executor)
+rss_parser = RSSParser(fetcher=feed_fetcher, executor=task_executor)
+tag_generator = TagGenerator(executor=task_executor)
+# Worker des tâches d'ingestion: démarré par l'application, sauf s'il tourne dans un processus séparé
+ingestion_worker = IngestionWorker(rss_parser=rss_parser, tag_generator=tag_generator)
+# Planificateur de la récupération périodique de chaque source, démarré avec le worker
+feed_scheduler = FeedScheduler(on_enqueue=ingestion_worker.notify)
+
+async def _not_modified(request: Request, response: Response, scope: str) -> Optional[Response]:
+    """
+    Traite une requête conditionnelle (If-None-Match) sur les données d'une table
+    
+    L'ETag est dérivé de la version des données: si le client possède déjà cette
+    version, une réponse 304 est retournée sans exécuter la requête ni sérialiser
+    la réponse. Sinon l'ETag est ajouté à la réponse et None est retourné. Les
+    caches de réponses sont indexés par la même version: le corps servi n'est
+    jamais plus ancien que l'ETag, même après une écriture d'un autre processus.
+    """
+    etag = f'"{await database.get_data_version(scope)}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Comparaison faible (RFC 9110): le préfixe W/ est ignoré
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return None
+
+def _fast_json(content, response: Response) -> FastJSONResponse:
+    """
+    Sérialise des données lues en base sans passer par le response_model
+    
+    Les articles sont validés à l'écriture (voir ingestion): le response_model ne
+    sert plus qu'à documenter l'API. Les en-têtes ajoutés à response (ETag) sont repris.
+    """
+    return FastJSONResponse(content, headers={
+        name: response.headers[name] for name in ("etag", "cache-control") if name in response.headers
+    })
 
 @router.get("/articles", response_model=ArticleResponse)
 async def get_articles(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1, description="Numéro de page"),
     page_size: int = Query(20, ge=5, le=100, description="Nombre d'articles par page"),
     source: Optional[str] = Query(None, description="Filtrer par source"),
     tag: Optional[str] = Query(None, description="Filtrer par tag"),
-    search: Optional[str] = Query(None, description="Recherche dans le titre et la description"),
+    search: Optional[str] = Query(None, description="Recherche plein texte dans le titre, la description et le contenu"),
     read_later: Optional[bool] = Query(None, description="Filtrer par articles à lire plus tard"),
-    read: Optional[bool] = Query(None, description="Filtrer par articles lus")
+    read: Optional[bool] = Query(None, description="Filtrer par articles lus"),
+    highlight: bool = Query(False, description="Ajouter un extrait surligné des termes recherchés"),
+    cursor: Optional[str] = Query(None, description="Pagination par curseur: vide pour la première page, puis la valeur next_cursor reçue"),
+    include_total: bool = Query(True, description="Calculer le nombre total d'articles correspondant aux filtres"),
+    collapse: bool = Query(False, description="Regrouper les quasi-doublons sous leur article canonique"),
+    fields: Optional[str] = Query(None, description="Champs retournés: 'list' (par défaut, sans le contenu complet), 'full', ou noms séparés par des virgules")
 ):
-    """Récupère les articles avec pagination et filtrage"""
+    """Récupère les articles avec pagination (par numéro de page ou par curseur) et filtrage"""
     try:
+        not_modified = await _not_modified(request, response, "articles")
+        if not_modified:
+            return not_modified
+        
         result = await database.get_articles(
+            fields=database.resolve_article_fields(fields),
             page=page,
             page_size=page_size,
             source=source,
             tag=tag,
             search=search,
             read_later=read_later,
-            read=read
+            read=read,
+            highlight=highlight,
+            cursor=cursor,
+            include_total=include_total,
+            collapse=collapse
         )
-        return result
+        return _fast_json(result, response)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Erreur lors de la récupération des articles: {str(e)}")
         raise HTTPException(status_code=500, detail="Erreur serveur lors de la récupération des articles")
 
+@router.get("/articles/facets", response_model=List[TagFacet])
+async def get_tag_facets(
+    request: Request,
+    response: Response,
+    source: Optional[str] = Query(None, description="Filtrer par source"),
+    tag: Optional[str] = Query(None, description="Filtrer par tag"),
+    search: Optional[str] = Query(None, description="Recherche plein texte dans le titre, la description et le contenu"),
+    read_later: Optional[bool] = Query(None, description="Filtrer par articles à lire plus tard"),
+    read: Optional[bool] = Query(None, description="Filtrer par articles lus"),
+    limit: int = Query(50, ge=1, le=500, description="Nombre maximal de tags retournés")
+):
+    """Retourne le nombre d'articles par tag pour les filtres courants"""
+    try:
+        not_modified = await _not_modified(request, response, "articles")
+        if not_modified:
+            return not_modified
+        
+        return await database.get_tag_facets(
+            source=source,
+            tag=tag,
+            search=search,
+            read_later=read_later,
+            read=read,
+            limit=limit
+        )
+    except Exception as e:
+        logger.error(f"Erreur lors du calcul des facettes de tags: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erreur serveur lors du calcul des facettes de tags")
+
+# Formats d'export des articles (charset=utf-8 ajouté par Starlette aux types text/*)
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+@router.get("/articles/export")
+async def export_articles(
+    format: str = Query("ndjson", description="Format de l'export: ndjson ou csv"),
+    source: Optional[str] = Query(None, description="Filtrer par source"),
+    tag: Optional[str] = Query(None, description="Filtrer par tag"),
+    search: Optional[str] = Query(None, description="Recherche plein texte dans le titre, la description et le contenu"),
+    read_later: Optional[bool] = Query(None, description="Filtrer par articles à lire plus tard"),
+    read: Optional[bool] = Query(None, description="Filtrer par articles lus"),
+    collapse: bool = Query(False, description="Regrouper les quasi-doublons sous leur article canonique"),
+    since: Optional[str] = Query(None, description="Date ISO: uniquement les articles ingérés ou modifiés depuis cette date (export incrémental)"),
+    fields: Optional[str] = Query(None, description="Champs exportés: 'full' (par défaut), 'list', ou noms séparés par des virgules")
+):
+    """
+    Exporte en flux tous les articles correspondant aux filtres, dans l'ordre de mise à jour
+    
+    Chaque article porte ses dates d'ingestion (created_at) et de dernière écriture
+    (updated_at): la plus récente updated_at reçue peut servir de valeur since pour
+    l'export incrémental suivant.
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Format d'export inconnu (ndjson ou csv)")
+    
+    try:
+        columns = database.resolve_article_fields(fields or "full")
+        if since:
+            datetime.fromisoformat(since)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    rows = database.export_articles(
+        source=source,
+        tag=tag,
+        search=search,
+        read_later=read_later,
+        read=read,
+        collapse=collapse,
+        since=since,
+        fields=columns
+    )
+    chunks = ndjson_chunks(rows) if format == "ndjson" else csv_chunks(rows, columns + ("created_at", "updated_at"))
+    
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="articles.{format}"'}
+    )
+
+@router.get("/articles/{article_id}", response_model=Article)
+async def get_article(article_id: str, request: Request, response: Response):
+    """Récupère un article complet, avec son contenu"""
+    try:
+        not_modified = await _not_modified(request, response, "articles")
+        if not_modified:
+            return not_modified
+        
+        article = await database.get_article(article_id)
+        if article is None:
+            raise HTTPException(status_code=404, detail="Article non trouvé")
+        return _fast_json(article, response)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erreur lors de la récupération de l'article {article_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erreur serveur lors de la récupération de l'article")
+
+@router.get("/counts", response_model=ArticleCounts)
+async def get_counts(request: Request, response: Response):
+    """Récupère les compteurs d'articles (total, lus, à lire plus tard, par source)"""
+    try:
+        not_modified = await _not_modified(request, response, "articles")
+        if not_modified:
+            return not_modified
+        
+        return await database.get_counts()
+    except Exception as e:
+        logger.error(f"Erreur lors de la récupération des compteurs: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erreur serveur lors de la récupération des compteurs")
+
+@router.get("/metrics")
+async def get_metrics():
+    """Retourne les métriques internes (couche d'exécution, cache des tags, caches de lecture)"""
+    return {
+        "executor": task_executor.metrics(),
+        "tag_cache": await task_executor.run_io(tag_generator.cache_stats),
+        "response_cache": database.response_cache_stats()
+    }
+
+@router.get("/ready")
+async def get_readiness():
+    """
+    Indique que le serveur est prêt et l'état des modèles de génération des tags
+    
+    Les modèles ne sont chargés qu'au premier tagging: dans les processus du pool CPU
+    lorsque la couche d'exécution en utilise (état rapporté par le dernier lot tagué),
+    sinon dans le processus du serveur.
+    """
+    return {
+        "status": "ready",
+        "tagging": "worker_processes" if task_executor.uses_processes else "in_process",
+        "models": tag_generator.tagging_model_status()
+    }
+
 @router.get("/sources", response_model=List[SourceConfig])
-async def get_sources():
+async def get_sources(request: Request, response: Response):
     """Récupère les sources RSS configurées"""
     try:
+        not_modified = await _not_modified(request, response, "sources")
+        if not_modified:
+            return not_modified
+        
         sources = await database.get_sources()
         return sources
     except Exception as e:
@@ -62,15 +268,8 @@ async def add_source(source: SourceConfig):
         # Sauvegarder la source
         await database.save_source(source.dict())
         
-        # Optionnel: sauvegarder les premiers articles
-        for article in articles[:10]:  # Limiter aux 10 premiers
-            # Générer des tags si nécessaire
-            if not article.get("tags"):
-                title = article.get("title", "")
-                content = article.get("content", article.get("description", ""))
-                article["tags"] = await tag_generator.generate_tags(title, content)
-            
-            await database.save_article(article)
+        # Optionnel: sauvegarder les premiers articles (limités aux 10 premiers)
+        await ingest_articles(articles[:10], tag_generator)
         
         return source
     except HTTPException:
@@ -118,37 +317,52 @@ async def update_article_status(
         raise HTTPException(status_code=500, detail="Erreur serveur lors de la mise à jour du statut")
 
 @router.post("/refresh")
-async def refresh_feeds():
-    """Rafraîchit tous les flux RSS actifs"""
+async def refresh_feeds(
+    sources: Optional[List[str]] = Query(None, description="Sources à rafraîchir (toutes les sources actives par défaut)")
+):
+    """
+    Met en file le rafraîchissement des flux RSS et retourne immédiatement l'identifiant de la tâche
+    
+    Le travail est effectué par le worker d'ingestion; son avancement est consultable
+    via /jobs/{job_id}. Les sources déjà en cours de rafraîchissement ne sont pas
+    traitées deux fois.
+    """
     try:
-        sources = await database.get_sources(active_only=True)
+        active_sources = [source["name"] for source in await database.get_sources(active_only=True)]
+        if sources:
+            unknown = set(sources) - set(active_sources)
+            if unknown:
+                raise HTTPException(status_code=404, detail=f"Sources introuvables ou inactives: {', '.join(sorted(unknown))}")
+            active_sources = sources
+        
+        if not active_sources:
+            return {"status": "success", "message": "Aucune source active à rafraîchir", "job_id": None, "sources_count": 0}
         
-        total_articles = 0
-        for source in sources:
-            # Récupérer et parser les articles
-            articles = await rss_parser.fetch_and_parse(source["name"], source["url"])
-            
-            # Générer des tags et sauvegarder
-            for article in articles:
-                if not article.get("tags"):
-                    title = article.get("title", "")
-                    content = article.get("content", article.get("description", ""))
-                    article["tags"] = await tag_generator.generate_tags(title, content)
-                
-                await database.save_article(article)
-            
-            total_articles += len(articles)
-            
-            # Mettre à jour la date de dernier fetch
-            source["last_fetch"] = database.datetime.now().isoformat()
-            await database.save_source(source)
+        job = await database.enqueue_refresh_job(active_sources)
+        ingestion_worker.notify()
         
         return {
-            "status": "success", 
-            "message": f"Tous les flux ont été rafraîchis", 
-            "sources_count": len(sources),
-            "articles_count": total_articles
+            "status": "queued",
+            "message": "Rafraîchissement des flux mis en file",
+            "job_id": job["job_id"],
+            "merged": job["merged"],
+            "sources_count": len(active_sources)
         }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erreur lors de la mise en file du rafraîchissement des flux: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erreur serveur lors du rafraîchissement des flux")
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: int):
+    """Retourne l'état d'une tâche d'ingestion et l'avancement de chacune de ses sources"""
+    try:
+        job = await database.get_job(job_id)
     except Exception as e:
-        logger.error(f"Erreur lors du rafraîchissement des flux: {str(e)}")
-        raise HTTPException(status_code=500, detail="Erreur serveur lors du rafraîchissement des flux") 
\ No newline at end of file
+        logger.error(f"Erreur lors de la récupération de la tâche: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erreur serveur lors de la récupération de la tâche")
+    
+    if job is None:
+        raise HTTPException(status_code=404, detail="Tâche introuvable")
+    return job
@@ -1,10 +1,39 @@
 from .database import (
     init_db,
+    init_pool,
+    close_pool,
     save_article,
+    save_articles,
+    mark_articles_seen,
+    mark_source_seen,
+    get_article_hashes,
+    get_simhash_candidates,
     get_articles,
+    get_article,
+    resolve_article_fields,
+    get_tag_facets,
+    export_articles,
+    get_counts,
+    response_cache_stats,
+    get_data_version,
+    rebuild_counts,
     delete_old_articles,
     save_source,
     get_sources,
+    get_due_sources,
+    get_unscheduled_sources,
+    schedule_first_polls,
+    get_next_poll_at,
     update_article_status,
-    datetime
+    rebuild_search_index,
+    enqueue_refresh_job,
+    claim_job,
+    touch_job,
+    update_job_source,
+    finish_job,
+    requeue_stale_jobs,
+    get_job,
+    delete_old_jobs,
+    datetime,
+    HTTP_CACHE_FIELDS
 ) 
\ No newline at end of file
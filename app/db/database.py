@@ -1,9 +1,21 @@
 import sqlite3
+import asyncio
+import base64
 import json
+import logging
 import os
+import re
+import time
 import aiosqlite
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable
+from .response_cache import ResponseCache
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Chemin de la base de données
 DATABASE_PATH = "data/rss_data.db"
@@ -11,9 +23,168 @@ DATABASE_PATH = "data/rss_data.db"
 # S'assurer que le dossier data existe
 os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
 
+# Champs de cache HTTP conservés pour chaque source (requêtes conditionnelles)
+HTTP_CACHE_FIELDS = ("etag", "last_modified", "content_hash")
+
+# État de planification de la récupération de chaque source
+POLL_STATE_COLUMNS = {
+    "poll_interval": "INTEGER",  # Intervalle appris, en secondes
+    "next_poll_at": "TEXT",
+    "failure_count": "INTEGER DEFAULT 0",  # Échecs consécutifs
+    "poll_hint": "INTEGER"  # Intervalle annoncé par le flux (ttl, sy:updatePeriod), en secondes
+}
+
+# Précision de la date de dernière présence dans leur flux des articles d'un flux
+# inchangé (last_seen_at): elle n'est renouvelée qu'une fois par période, pour ne pas
+# réécrire les articles (ni invalider les ETags) à chaque récupération
+LAST_SEEN_RESOLUTION = 24 * 3600  # secondes
+
+# Paramètres du pool de connexions
+POOL_READERS = 4
+STATEMENT_CACHE_SIZE = 256  # Requêtes préparées conservées par connexion
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # Les lecteurs ne sont jamais bloqués par l'écrivain
+    "PRAGMA synchronous=NORMAL",  # Suffisant en mode WAL, évite un fsync par commit
+    "PRAGMA cache_size=-16000",  # Cache de pages de ~16 Mo par connexion
+    "PRAGMA mmap_size=268435456",  # Lecture via mmap jusqu'à 256 Mo
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Cache des lectures les plus fréquentes (pages d'articles, compteurs, sources), vidé à chaque écriture
+RESPONSE_CACHE_TTL = 30  # secondes
+ARTICLES_CACHE_SIZE = 256
+SOURCES_CACHE_SIZE = 8
+_articles_cache = ResponseCache(max_entries=ARTICLES_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+_sources_cache = ResponseCache(max_entries=SOURCES_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+
+def response_cache_stats() -> Dict[str, Any]:
+    """Retourne les compteurs des caches de lecture"""
+    return {"articles": _articles_cache.stats(), "sources": _sources_cache.stats()}
+
+async def _connect(readonly: bool = False) -> aiosqlite.Connection:
+    """Ouvre une connexion configurée (pragmas, cache de requêtes préparées)"""
+    db = await aiosqlite.connect(DATABASE_PATH, cached_statements=STATEMENT_CACHE_SIZE)
+    db.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        await db.execute(pragma)
+    if readonly:
+        await db.execute("PRAGMA query_only=1")
+    return db
+
+class ConnectionPool:
+    """Pool de connexions SQLite: plusieurs lecteurs et un écrivain unique"""
+    
+    def __init__(self, readers: int = POOL_READERS):
+        """
+        Initialise le pool
+        
+        Args:
+            readers: Nombre de connexions de lecture
+        """
+        self.readers = readers
+        self._readers: asyncio.Queue = asyncio.Queue()
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock = asyncio.Lock()
+        self._connections: List[aiosqlite.Connection] = []
+    
+    async def open(self):
+        """Ouvre les connexions du pool"""
+        self._writer = await _connect()
+        self._connections.append(self._writer)
+        for _ in range(self.readers):
+            db = await _connect(readonly=True)
+            self._connections.append(db)
+            self._readers.put_nowait(db)
+    
+    async def close(self):
+        """Ferme toutes les connexions du pool"""
+        for db in self._connections:
+            await db.close()
+        self._connections.clear()
+        self._writer = None
+    
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Emprunte une connexion de lecture"""
+        db = await self._readers.get()
+        try:
+            yield db
+        finally:
+            self._readers.put_nowait(db)
+    
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Emprunte la connexion d'écriture (accès exclusif)"""
+        async with self._writer_lock:
+            try:
+                yield self._writer
+            except Exception:
+                await self._writer.rollback()
+                raise
+
+# Pool partagé, créé au démarrage de l'application
+_pool: Optional[ConnectionPool] = None
+
+async def init_pool(readers: int = POOL_READERS):
+    """Crée le pool de connexions partagé"""
+    global _pool
+    if _pool is not None:
+        return
+    _pool = ConnectionPool(readers=readers)
+    await _pool.open()
+    logger.info(f"Pool de connexions ouvert ({readers} lecteurs, 1 écrivain)")
+
+async def close_pool():
+    """Ferme le pool de connexions partagé"""
+    global _pool
+    if _pool is None:
+        return
+    await _pool.close()
+    _pool = None
+    logger.info("Pool de connexions fermé")
+
+@asynccontextmanager
+async def _read_connection() -> AsyncIterator[aiosqlite.Connection]:
+    """Connexion de lecture: issue du pool, ou ponctuelle hors application (scripts)"""
+    if _pool is not None:
+        async with _pool.reader() as db:
+            yield db
+    else:
+        db = await _connect(readonly=True)
+        try:
+            yield db
+        finally:
+            await db.close()
+
+@asynccontextmanager
+async def _write_connection() -> AsyncIterator[aiosqlite.Connection]:
+    """Connexion d'écriture: issue du pool, ou ponctuelle hors application (scripts)"""
+    if _pool is not None:
+        async with _pool.writer() as db:
+            yield db
+    else:
+        db = await _connect()
+        try:
+            yield db
+        finally:
+            await db.close()
+
+async def _ensure_columns(db: aiosqlite.Connection, table: str, columns: Dict[str, str]) -> List[str]:
+    """Ajoute les colonnes manquantes à une table existante (migration légère), retourne les colonnes ajoutées"""
+    async with db.execute(f"PRAGMA table_info({table})") as cursor:
+        existing = {row[1] async for row in cursor}
+    
+    added = []
+    for name, definition in columns.items():
+        if name not in existing:
+            await db.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+            added.append(name)
+    return added
+
 async def init_db():
     """Initialise la base de données avec les tables nécessaires"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _write_connection() as db:
         # Création de la table articles
         await db.execute("""
         CREATE TABLE IF NOT EXISTS articles (
@@ -29,10 +200,20 @@ async def init_db():
             read_later INTEGER DEFAULT 0,
             read INTEGER DEFAULT 0,
             image_url TEXT,
-            created_at TEXT NOT NULL
+            created_at TEXT NOT NULL,
+            content_hash TEXT,
+            simhash INTEGER,
+            canonical_id TEXT,
+            updated_at TEXT,
+            last_seen_at TEXT
         )
         """)
         
+        # Migration des bases existantes: empreinte du contenu, quasi-doublons et dates de suivi des articles
+        await _ensure_columns(db, "articles", {"content_hash": "TEXT", "simhash": "INTEGER", "canonical_id": "TEXT"})
+        if await _ensure_columns(db, "articles", {"updated_at": "TEXT", "last_seen_at": "TEXT"}):
+            await db.execute("UPDATE articles SET updated_at = created_at, last_seen_at = created_at")
+        
         # Création de la table sources
         await db.execute("""
         CREATE TABLE IF NOT EXISTS sources (
@@ -41,125 +222,987 @@ async def init_db():
             icon TEXT,
             category TEXT NOT NULL,
             active INTEGER DEFAULT 1,
-            last_fetch TEXT
+            last_fetch TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            content_hash TEXT,
+            poll_interval INTEGER,
+            next_poll_at TEXT,
+            failure_count INTEGER DEFAULT 0,
+            poll_hint INTEGER,
+            last_parsed_at TEXT
         )
         """)
         
+        # Migration des bases existantes: état du cache HTTP, planification et dernier parsing des sources
+        await _ensure_columns(db, "sources", {field: "TEXT" for field in HTTP_CACHE_FIELDS})
+        await _ensure_columns(db, "sources", POLL_STATE_COLUMNS)
+        await _ensure_columns(db, "sources", {"last_parsed_at": "TEXT"})
+        
         # Index pour accélérer les recherches
         await db.execute("CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_articles_pubdate ON articles(pub_date)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_sources_next_poll ON sources(active, next_poll_at)")
+        # Index composite du tri chronologique, utilisé aussi par la pagination par curseur
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_articles_pubdate_id ON articles(pub_date DESC, id DESC)")
+        await db.execute("DROP INDEX IF EXISTS idx_articles_pubdate")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_articles_canonical ON articles(canonical_id)")
+        # Export incrémental par date de mise à jour, purge par date de dernière présence dans le flux
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_articles_updated ON articles(updated_at, id)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_articles_last_seen ON articles(last_seen_at)")
+        await db.execute("DROP INDEX IF EXISTS idx_articles_created")
+        
+        # Index plein texte de la recherche
+        await _init_search_index(db)
+        
+        # Table normalisée des tags
+        await _init_tag_index(db)
+        
+        # Bandes des empreintes SimHash (recherche des quasi-doublons)
+        await _init_simhash_index(db)
+        
+        # Compteurs maintenus à l'écriture
+        await _init_counters(db)
+        
+        # File des tâches d'ingestion
+        await _init_jobs(db)
+        
+        # Versions des données (ETags de l'API)
+        await _init_data_versions(db)
         
         await db.commit()
 
-async def save_article(article_data: Dict[str, Any]) -> str:
-    """Sauvegarde un article dans la base de données"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        # Convertir les tags en JSON pour stockage
-        if "tags" in article_data and article_data["tags"]:
-            article_data["tags"] = json.dumps([t.dict() if hasattr(t, "dict") else t for t in article_data["tags"]])
-        else:
-            article_data["tags"] = "[]"
+async def _init_tag_index(db: aiosqlite.Connection):
+    """Crée la table normalisée des tags et la remplit à partir des articles existants"""
+    async with db.execute("SELECT 1 FROM sqlite_master WHERE name = 'article_tags'") as cursor:
+        exists = await cursor.fetchone() is not None
+    
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS article_tags (
+        article_id TEXT NOT NULL,
+        tag TEXT NOT NULL COLLATE NOCASE,
+        confidence REAL DEFAULT 1.0,
+        PRIMARY KEY (article_id, tag)
+    )
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_article_tags_tag ON article_tags(tag, article_id)")
+    
+    # Les tags suivent la suppression de leur article, quel que soit l'auteur de la suppression
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS article_tags_delete AFTER DELETE ON articles BEGIN
+        DELETE FROM article_tags WHERE article_id = old.id;
+    END
+    """)
+    
+    # Base existante: migrer les tags stockés en JSON dans articles.tags
+    if not exists:
+        await db.execute("""
+        INSERT OR IGNORE INTO article_tags (article_id, tag, confidence)
+        SELECT articles.id, json_extract(tag.value, '$.name'), COALESCE(json_extract(tag.value, '$.confidence'), 1.0)
+        FROM articles, json_each(articles.tags) AS tag
+        WHERE json_valid(articles.tags) AND json_extract(tag.value, '$.name') IS NOT NULL
+        """)
+        logger.info("Table des tags normalisée créée")
+
+async def _init_simhash_index(db: aiosqlite.Connection):
+    """Crée la table des bandes d'empreintes SimHash, indexée par valeur de bande"""
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS article_simhash (
+        band INTEGER NOT NULL,
+        value INTEGER NOT NULL,
+        article_id TEXT NOT NULL,
+        PRIMARY KEY (band, value, article_id)
+    ) WITHOUT ROWID
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_article_simhash_article ON article_simhash(article_id)")
+    
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS article_simhash_delete AFTER DELETE ON articles BEGIN
+        DELETE FROM article_simhash WHERE article_id = old.id;
+    END
+    """)
+
+# Tables dont les modifications changent la version des données servies par l'API
+DATA_VERSION_SCOPES = ("articles", "sources")
+
+async def _init_data_versions(db: aiosqlite.Connection):
+    """
+    Crée les versions des données, incrémentées par trigger à chaque modification
+    
+    Les triggers suivent aussi les écritures des autres processus (worker séparé).
+    L'époque, tirée au hasard à la création de la base, distingue deux bases
+    successives dont les versions repartent de zéro.
+    """
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS data_versions (
+        scope TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    await db.execute("INSERT OR IGNORE INTO data_versions (scope, version) VALUES ('epoch', abs(random() % 1000000000))")
+    
+    for scope in DATA_VERSION_SCOPES:
+        await db.execute("INSERT OR IGNORE INTO data_versions (scope, version) VALUES (?, 0)", (scope,))
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            await db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS data_versions_{scope}_{event.lower()} AFTER {event} ON {scope} BEGIN
+                UPDATE data_versions SET version = version + 1 WHERE scope = '{scope}';
+            END
+            """)
+
+async def get_data_version(scope: str) -> str:
+    """Version courante des données d'une table (articles ou sources), identifiant aussi la base"""
+    async with _read_connection() as db:
+        return await _read_data_version(db, scope)
+
+async def _read_data_version(db: aiosqlite.Connection, scope: str) -> str:
+    """Lit la version des données d'une table sur une connexion donnée (voir get_data_version)"""
+    async with db.execute(
+        "SELECT scope, version FROM data_versions WHERE scope IN ('epoch', ?)", (scope,)
+    ) as cursor:
+        versions = {row["scope"]: row["version"] async for row in cursor}
+    return f"{versions.get('epoch', 0):x}-{versions.get(scope, 0):x}"
+
+def _count_delta(scope: str, key: str, delta: int, condition: str = "1") -> str:
+    """Instruction de trigger ajoutant delta au compteur (scope, key) si la condition est vraie"""
+    return f"""
+        INSERT INTO article_counts (scope, key, count) SELECT '{scope}', {key}, {delta} WHERE {condition}
+        ON CONFLICT(scope, key) DO UPDATE SET count = count + excluded.count;"""
+
+COUNTER_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS article_counts_insert AFTER INSERT ON articles BEGIN
+        {_count_delta("all", "''", 1)}
+        {_count_delta("source", "new.source", 1)}
+        {_count_delta("read_later", "''", 1, "new.read_later = 1")}
+        {_count_delta("read", "''", 1, "new.read = 1")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS article_counts_delete AFTER DELETE ON articles BEGIN
+        {_count_delta("all", "''", -1)}
+        {_count_delta("source", "old.source", -1)}
+        {_count_delta("read_later", "''", -1, "old.read_later = 1")}
+        {_count_delta("read", "''", -1, "old.read = 1")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS article_counts_update AFTER UPDATE OF source, read_later, read ON articles BEGIN
+        {_count_delta("source", "old.source", -1)}
+        {_count_delta("source", "new.source", 1)}
+        {_count_delta("read_later", "''", -1, "old.read_later = 1")}
+        {_count_delta("read_later", "''", 1, "new.read_later = 1")}
+        {_count_delta("read", "''", -1, "old.read = 1")}
+        {_count_delta("read", "''", 1, "new.read = 1")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS article_counts_tag_insert AFTER INSERT ON article_tags BEGIN
+        {_count_delta("tag", "new.tag", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS article_counts_tag_delete AFTER DELETE ON article_tags BEGIN
+        {_count_delta("tag", "old.tag", -1)}
+    END
+    """,
+)
+
+async def _init_counters(db: aiosqlite.Connection):
+    """Crée la table des compteurs maintenus par triggers et l'initialise si elle vient d'être créée"""
+    async with db.execute("SELECT 1 FROM sqlite_master WHERE name = 'article_counts'") as cursor:
+        exists = await cursor.fetchone() is not None
+    
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS article_counts (
+        scope TEXT NOT NULL,
+        key TEXT NOT NULL COLLATE NOCASE,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (scope, key)
+    )
+    """)
+    
+    for trigger in COUNTER_TRIGGERS:
+        await db.execute(trigger)
+    
+    if not exists:
+        await _recount(db)
+        logger.info("Compteurs d'articles initialisés")
+
+async def _recount(db: aiosqlite.Connection):
+    """Recalcule tous les compteurs à partir des tables"""
+    await db.execute("DELETE FROM article_counts")
+    await db.execute("""
+    INSERT INTO article_counts (scope, key, count)
+    SELECT 'all', '', COUNT(*) FROM articles
+    UNION ALL SELECT 'read_later', '', COUNT(*) FROM articles WHERE read_later = 1
+    UNION ALL SELECT 'read', '', COUNT(*) FROM articles WHERE read = 1
+    """)
+    await db.execute("INSERT INTO article_counts (scope, key, count) SELECT 'source', source, COUNT(*) FROM articles GROUP BY source")
+    await db.execute("INSERT INTO article_counts (scope, key, count) SELECT 'tag', tag, COUNT(*) FROM article_tags GROUP BY tag")
+
+async def rebuild_counts():
+    """Recalcule les compteurs maintenus (après une modification externe de la base)"""
+    async with _write_connection() as db:
+        await _recount(db)
+        await db.commit()
+    _articles_cache.bump()
+
+async def get_counts() -> Dict[str, Any]:
+    """Retourne les compteurs maintenus: total, lus, à lire plus tard et par source"""
+    key = ("counts", await get_data_version("articles"))
+    generation = _articles_cache.generation
+    cached = _articles_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    counts = {"total": 0, "read": 0, "read_later": 0, "sources": {}}
+    async with _read_connection() as db:
+        async with db.execute("SELECT scope, key, count FROM article_counts WHERE scope != 'tag' AND count > 0") as cursor:
+            async for row in cursor:
+                if row["scope"] == "source":
+                    counts["sources"][row["key"]] = row["count"]
+                elif row["scope"] == "all":
+                    counts["total"] = row["count"]
+                else:
+                    counts[row["scope"]] = row["count"]
+    
+    _articles_cache.put(key, counts, generation)
+    return counts
+
+# Nombre de quasi-doublons rattachés à un article (via idx_articles_canonical)
+DUPLICATE_COUNT = "(SELECT COUNT(*) FROM articles AS duplicate WHERE duplicate.canonical_id = articles.id)"
+
+# Cache des totaux pour les combinaisons de filtres sans compteur maintenu,
+# indexé par la version des articles en base comme les caches de réponses
+COUNT_CACHE_TTL = 30  # secondes
+COUNT_CACHE_SIZE = 256
+_count_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+def _maintained_counter(
+    source: Optional[str],
+    tag: Optional[str],
+    search: Optional[str],
+    read_later: Optional[bool],
+    read: Optional[bool],
+    collapse: bool = False
+) -> Optional[tuple]:
+    """
+    Identifie le compteur maintenu correspondant aux filtres, s'il existe
+    
+    Returns:
+        Tuple (scope, key, complement) où complement indique que le total
+        est le nombre total d'articles moins le compteur, ou None
+    """
+    active = [name for name, value in (
+        ("source", source), ("tag", tag), ("search", search),
+        ("read_later", read_later), ("read", read)
+    ) if value is not None and value != ""]
+    
+    # Les compteurs incluent les quasi-doublons
+    if collapse and not source:
+        return None
+    if not active:
+        return ("all", "", False)
+    if len(active) > 1:
+        return None
+    
+    name = active[0]
+    if name == "source":
+        return ("source", source, False)
+    if name == "tag":
+        return ("tag", tag, False)
+    if name == "read_later":
+        return ("read_later", "", not read_later)
+    if name == "read":
+        return ("read", "", not read)
+    return None
+
+async def _count_articles(
+    db: aiosqlite.Connection,
+    from_clause: str,
+    where_clause: str,
+    params: List[Any],
+    filters: tuple
+) -> int:
+    """Total des articles pour des filtres: compteur maintenu, sinon COUNT(*) mis en cache"""
+    counter = _maintained_counter(*filters)
+    if counter:
+        scope, key, complement = counter
+        query = """
+        SELECT
+            (SELECT COALESCE(SUM(count), 0) FROM article_counts WHERE scope = ? AND key = ?),
+            (SELECT COALESCE(SUM(count), 0) FROM article_counts WHERE scope = 'all')
+        """
+        async with db.execute(query, (scope, key)) as cursor:
+            count, total = await cursor.fetchone()
+        return total - count if complement else count
+    
+    # Toute écriture, y compris d'un autre processus, change la version et donc la clé
+    key = (await _read_data_version(db, "articles"),) + filters
+    now = time.monotonic()
+    cached = _count_cache.get(key)
+    if cached and now - cached[1] < COUNT_CACHE_TTL:
+        _count_cache.move_to_end(key)
+        return cached[0]
+    
+    async with db.execute(f"SELECT COUNT(*) FROM {from_clause} WHERE {where_clause}", params) as cursor:
+        count = (await cursor.fetchone())[0]
+    
+    _count_cache[key] = (count, now)
+    _count_cache.move_to_end(key)
+    while len(_count_cache) > COUNT_CACHE_SIZE:
+        _count_cache.popitem(last=False)
+    return count
+
+# Index plein texte FTS5 (désactivé si SQLite n'a pas été compilé avec FTS5)
+SEARCH_INDEX_AVAILABLE = True
+
+# Pondération bm25 des colonnes indexées: titre, description, contenu
+SEARCH_RANK = "bm25(articles_fts, 10.0, 5.0, 1.0)"
+SEARCH_SNIPPET = "snippet(articles_fts, -1, '<mark>', '</mark>', '…', 24)"
+
+SEARCH_INDEX_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, description, content)
+        VALUES (new.rowid, new.title, new.description, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, description, content)
+        VALUES ('delete', old.rowid, old.title, old.description, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, description, content ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, description, content)
+        VALUES ('delete', old.rowid, old.title, old.description, old.content);
+        INSERT INTO articles_fts(rowid, title, description, content)
+        VALUES (new.rowid, new.title, new.description, new.content);
+    END
+    """,
+)
+
+async def _init_search_index(db: aiosqlite.Connection):
+    """Crée l'index FTS5 synchronisé par triggers, et l'alimente s'il vient d'être créé"""
+    global SEARCH_INDEX_AVAILABLE
+    
+    async with db.execute("SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'") as cursor:
+        exists = await cursor.fetchone() is not None
+    
+    try:
+        await db.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, description, content,
+            content='articles', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """)
+    except sqlite3.OperationalError as e:
+        SEARCH_INDEX_AVAILABLE = False
+        logger.warning(f"FTS5 indisponible, la recherche utilisera LIKE: {str(e)}")
+        return
+    
+    for trigger in SEARCH_INDEX_TRIGGERS:
+        await db.execute(trigger)
+    
+    # Base existante: indexer les articles déjà présents
+    if not exists:
+        await db.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+        logger.info("Index de recherche plein texte créé")
+
+async def rebuild_search_index():
+    """Reconstruit entièrement l'index plein texte (après un VACUUM ou un import externe)"""
+    async with _write_connection() as db:
+        await db.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+        await db.execute("INSERT INTO articles_fts(articles_fts) VALUES ('optimize')")
+        await db.commit()
+
+def _search_match_query(search: str) -> Optional[str]:
+    """Convertit une saisie utilisateur en requête FTS5 (tous les termes, par préfixe)"""
+    terms = re.findall(r"\w+", search)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+# Colonnes écrites par l'ingestion, et colonnes mises à jour lors d'un upsert.
+# Les statuts read/read_later de l'utilisateur et la date de création sont préservés;
+# updated_at et last_seen_at sont renouvelées à chaque écriture.
+ARTICLE_INSERT_FIELDS = (
+    "id", "title", "link", "pub_date", "description", "content", "summary",
+    "source", "tags", "read_later", "read", "image_url", "created_at", "content_hash",
+    "simhash", "canonical_id", "updated_at", "last_seen_at"
+)
+ARTICLE_UPDATE_FIELDS = (
+    "title", "link", "pub_date", "description", "content", "summary",
+    "source", "tags", "image_url", "content_hash", "simhash", "canonical_id",
+    "updated_at", "last_seen_at"
+)
+UPSERT_ARTICLE_QUERY = f"""
+INSERT INTO articles ({", ".join(ARTICLE_INSERT_FIELDS)})
+VALUES ({", ".join("?" for _ in ARTICLE_INSERT_FIELDS)})
+ON CONFLICT(id) DO UPDATE SET {", ".join(f"{field} = excluded.{field}" for field in ARTICLE_UPDATE_FIELDS)}
+"""
+
+def _article_row(article_data: Dict[str, Any], saved_at: str) -> tuple:
+    """Convertit un article en ligne prête pour l'upsert"""
+    # Convertir les tags en JSON pour stockage
+    tags = article_data.get("tags") or []
+    tags_json = json.dumps([t.dict() if hasattr(t, "dict") else t for t in tags])
+    
+    row = dict(article_data, tags=tags_json, created_at=saved_at, updated_at=saved_at, last_seen_at=saved_at)
+    row["read_later"] = 1 if row.get("read_later") else 0
+    row["read"] = 1 if row.get("read") else 0
+    return tuple(row.get(field) for field in ARTICLE_INSERT_FIELDS)
+
+async def save_articles(
+    articles: List[Dict[str, Any]],
+    link_duplicates: Optional[Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], int]] = None
+) -> List[str]:
+    """
+    Sauvegarde un lot d'articles en une seule transaction
+    
+    Les articles existants sont mis à jour sans toucher aux statuts
+    read et read_later choisis par l'utilisateur.
+    
+    Args:
+        articles: Articles à insérer ou mettre à jour
+        link_duplicates: Rattachement des quasi-doublons (voir services.dedup.link_near_duplicates),
+            rejoué dans la transaction pour les articles encore sans article canonique afin
+            de prendre en compte ceux enregistrés entre-temps par une ingestion concurrente
         
-        # Ajouter la date de création
-        article_data["created_at"] = datetime.now().isoformat()
+    Returns:
+        Identifiants des articles sauvegardés
+    """
+    if not articles:
+        return []
+    
+    saved_at = datetime.now().isoformat()
+    article_ids = json.dumps([article["id"] for article in articles])
+    
+    async with _write_connection() as db:
+        if link_duplicates is not None:
+            # Transaction d'écriture ouverte avant la recherche: aucun autre écrivain entre les deux
+            await db.execute("BEGIN IMMEDIATE")
+            unlinked = [
+                article for article in articles
+                if article.get("simhash") is not None and not article.get("canonical_id")
+            ]
+            if unlinked:
+                batch_ids = {article["id"] for article in articles}
+                candidates = await _simhash_candidates(db, [
+                    (band, value) for article in unlinked for band, value in enumerate(article["simhash_bands"])
+                ])
+                link_duplicates(unlinked, [candidate for candidate in candidates if candidate["id"] not in batch_ids])
         
-        # Insérer ou mettre à jour l'article
-        fields = ", ".join(article_data.keys())
-        placeholders = ", ".join("?" for _ in article_data)
-        values = list(article_data.values())
+        rows = [_article_row(article, saved_at) for article in articles]
         
-        query = f"""
-        INSERT OR REPLACE INTO articles ({fields})
-        VALUES ({placeholders})
-        """
+        # Tags normalisés, remplacés intégralement pour chaque article du lot
+        tag_rows = [
+            (article["id"], tag["name"], tag.get("confidence", 1.0))
+            for article in articles
+            for tag in (t.dict() if hasattr(t, "dict") else t for t in article.get("tags") or [])
+            if tag.get("name")
+        ]
         
-        await db.execute(query, values)
-        await db.commit()
+        # Bandes des empreintes SimHash (voir services.dedup), remplacées de même
+        band_rows = [
+            (band, value, article["id"])
+            for article in articles
+            for band, value in enumerate(article.get("simhash_bands") or [])
+        ]
         
-        return article_data["id"]
+        await db.executemany(UPSERT_ARTICLE_QUERY, rows)
+        await db.execute(
+            "DELETE FROM article_tags WHERE article_id IN (SELECT value FROM json_each(?))",
+            (article_ids,)
+        )
+        await db.executemany(
+            "INSERT OR IGNORE INTO article_tags (article_id, tag, confidence) VALUES (?, ?, ?)",
+            tag_rows
+        )
+        await db.execute(
+            "DELETE FROM article_simhash WHERE article_id IN (SELECT value FROM json_each(?))",
+            (article_ids,)
+        )
+        await db.executemany(
+            "INSERT OR IGNORE INTO article_simhash (band, value, article_id) VALUES (?, ?, ?)",
+            band_rows
+        )
+        await db.commit()
+    _articles_cache.bump()
+    
+    return [article["id"] for article in articles]
+
+async def save_article(article_data: Dict[str, Any]) -> str:
+    """Sauvegarde un article dans la base de données"""
+    await save_articles([article_data])
+    return article_data["id"]
+
+async def mark_articles_seen(article_ids: List[str]):
+    """
+    Enregistre la présence dans leur flux d'articles connus et inchangés
+    
+    Ces articles ne sont pas réécrits: seule leur date de dernière présence
+    (last_seen_at, utilisée par delete_old_articles) est mise à jour.
+    """
+    if not article_ids:
+        return
+    
+    async with _write_connection() as db:
+        await db.execute(
+            "UPDATE articles SET last_seen_at = ? WHERE id IN (SELECT value FROM json_each(?))",
+            (datetime.now().isoformat(), json.dumps(article_ids))
+        )
+        await db.commit()
+
+async def mark_source_seen(source: str, parsed_at: str):
+    """
+    Enregistre la présence des articles d'un flux récupéré sans changement
+    
+    Le flux n'est pas parsé: ses articles sont ceux vus lors de son dernier parsing
+    (last_seen_at postérieure à parsed_at). La date n'est renouvelée qu'une fois
+    par LAST_SEEN_RESOLUTION.
+    
+    Args:
+        source: Nom de la source
+        parsed_at: Date du début du dernier parsing du flux (sources.last_parsed_at)
+    """
+    now = datetime.now()
+    async with _write_connection() as db:
+        await db.execute(
+            "UPDATE articles SET last_seen_at = ? WHERE source = ? AND last_seen_at >= ? AND last_seen_at < ?",
+            (now.isoformat(), source, parsed_at, (now - timedelta(seconds=LAST_SEEN_RESOLUTION)).isoformat())
+        )
+        await db.commit()
+
+async def get_article_hashes(article_ids: List[str]) -> Dict[str, Optional[str]]:
+    """Retourne l'empreinte de contenu des articles déjà connus parmi les identifiants donnés"""
+    known = {}
+    if not article_ids:
+        return known
+    
+    async with _read_connection() as db:
+        # Requête unique et stable (réutilisable depuis le cache de requêtes préparées)
+        query = "SELECT id, content_hash FROM articles WHERE id IN (SELECT value FROM json_each(?))"
+        async with db.execute(query, (json.dumps(article_ids),)) as cursor:
+            async for row in cursor:
+                known[row[0]] = row[1]
+    
+    return known
+
+async def get_simhash_candidates(bands: List[tuple]) -> List[Dict[str, Any]]:
+    """
+    Retourne les articles dont une bande d'empreinte SimHash correspond
+    
+    Args:
+        bands: Couples (numéro de bande, valeur) recherchés
+    
+    Returns:
+        Articles candidats (id, source, simhash, canonical_id, tags)
+    """
+    if not bands:
+        return []
+    
+    async with _read_connection() as db:
+        return await _simhash_candidates(db, bands)
+
+async def _simhash_candidates(db: aiosqlite.Connection, bands: List[tuple]) -> List[Dict[str, Any]]:
+    """Recherche des candidats SimHash sur une connexion donnée (voir get_simhash_candidates)"""
+    candidates = []
+    query = """
+    SELECT articles.id, articles.source, articles.simhash, articles.canonical_id, articles.tags
+    FROM articles WHERE articles.id IN (
+        SELECT article_simhash.article_id
+        FROM json_each(?) AS wanted
+        JOIN article_simhash
+            ON article_simhash.band = json_extract(wanted.value, '$[0]')
+            AND article_simhash.value = json_extract(wanted.value, '$[1]')
+    ) AND articles.simhash IS NOT NULL
+    ORDER BY articles.created_at, articles.id
+    """
+    async with db.execute(query, (json.dumps(list(set(bands))),)) as cursor:
+        async for row in cursor:
+            candidate = dict(row)
+            candidate["tags"] = json.loads(candidate["tags"]) if candidate["tags"] else []
+            candidates.append(candidate)
+    
+    return candidates
+
+def _build_article_filters(
+    source: Optional[str] = None,
+    tag: Optional[str] = None,
+    search: Optional[str] = None,
+    read_later: Optional[bool] = None,
+    read: Optional[bool] = None,
+    collapse: bool = False
+) -> tuple:
+    """
+    Construit la clause FROM/WHERE commune aux requêtes d'articles
+    
+    Avec collapse, les quasi-doublons dont l'article canonique existe encore sont
+    masqués (sans effet avec un filtre par source: les doublons viennent toujours
+    d'une autre source).
+    
+    Returns:
+        Tuple (from_clause, where_clause, params, ranked) où ranked indique
+        que la recherche plein texte est utilisée et qu'un tri bm25 est possible
+    """
+    from_clause = "articles"
+    conditions = []
+    params = []
+    ranked = False
+    
+    if search:
+        match_query = _search_match_query(search) if SEARCH_INDEX_AVAILABLE else None
+        if match_query:
+            from_clause = "articles_fts JOIN articles ON articles.rowid = articles_fts.rowid"
+            conditions.append("articles_fts MATCH ?")
+            params.append(match_query)
+            ranked = True
+        else:
+            conditions.append("(articles.title LIKE ? OR articles.description LIKE ?)")
+            params.append(f"%{search}%")
+            params.append(f"%{search}%")
+    
+    if source:
+        conditions.append("articles.source = ?")
+        params.append(source)
+    
+    if tag:
+        conditions.append("articles.id IN (SELECT article_id FROM article_tags WHERE tag = ?)")
+        params.append(tag)
+    
+    if read_later is not None:
+        conditions.append("articles.read_later = ?")
+        params.append(1 if read_later else 0)
+    
+    if read is not None:
+        conditions.append("articles.read = ?")
+        params.append(1 if read else 0)
+    
+    if collapse and not source:
+        conditions.append(
+            "(articles.canonical_id IS NULL OR NOT EXISTS "
+            "(SELECT 1 FROM articles AS canonical WHERE canonical.id = articles.canonical_id))"
+        )
+    
+    where_clause = " AND ".join(conditions) if conditions else "1=1"
+    return from_clause, where_clause, params, ranked
+
+def encode_cursor(pub_date: str, article_id: str) -> str:
+    """Encode la position (pub_date, id) du dernier article d'une page en curseur opaque"""
+    raw = json.dumps([pub_date, article_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Décode un curseur opaque en position (pub_date, id)
+    
+    Raises:
+        ValueError: Si le curseur est invalide
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        pub_date, article_id = json.loads(raw)
+    except Exception:
+        raise ValueError("Curseur de pagination invalide")
+    if not isinstance(pub_date, str) or not isinstance(article_id, str):
+        raise ValueError("Curseur de pagination invalide")
+    return pub_date, article_id
+
+# Colonnes d'un article exposées par l'API, et projection par défaut des listes:
+# le contenu complet n'est lu que pour le détail d'un article (get_article)
+ARTICLE_FIELDS = (
+    "id", "title", "link", "pub_date", "description", "content", "summary", "source",
+    "tags", "read_later", "read", "image_url", "canonical_id"
+)
+ARTICLE_LIST_FIELDS = tuple(field for field in ARTICLE_FIELDS if field != "content")
+ARTICLE_FIELD_SETS = {"list": ARTICLE_LIST_FIELDS, "full": ARTICLE_FIELDS}
+
+def resolve_article_fields(fields: Optional[str]) -> tuple:
+    """
+    Convertit le paramètre fields de l'API en colonnes à lire
+    
+    Args:
+        fields: "list" (par défaut), "full" ou noms de champs séparés par des virgules
+    
+    Returns:
+        Colonnes dans l'ordre de ARTICLE_FIELDS (id et pub_date toujours inclus)
+    
+    Raises:
+        ValueError: Si un champ est inconnu
+    """
+    if not fields or fields.strip() in ARTICLE_FIELD_SETS:
+        return ARTICLE_FIELD_SETS[(fields or "list").strip()]
+    
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(ARTICLE_FIELDS)
+    if unknown:
+        raise ValueError(f"Champs inconnus: {', '.join(sorted(unknown))}")
+    
+    # id et pub_date servent à la pagination par curseur
+    requested |= {"id", "pub_date"}
+    return tuple(field for field in ARTICLE_FIELDS if field in requested)
+
+def _decode_article(article: Dict[str, Any]) -> Dict[str, Any]:
+    """Convertit une ligne d'article (éventuellement partielle) en données prêtes à sérialiser"""
+    # Convertir les tags de JSON à liste
+    if "tags" in article:
+        article["tags"] = json.loads(article["tags"]) if article["tags"] else []
+    for field in ("read_later", "read"):
+        if field in article:
+            article[field] = bool(article[field])
+    return article
+
+async def get_article(article_id: str) -> Optional[Dict[str, Any]]:
+    """Récupère un article complet par son identifiant, ou None s'il n'existe pas"""
+    columns = ", ".join(ARTICLE_FIELDS)
+    async with _read_connection() as db:
+        async with db.execute(f"SELECT {columns} FROM articles WHERE id = ?", (article_id,)) as cursor:
+            row = await cursor.fetchone()
+    
+    if row is None:
+        return None
+    return _decode_article(dict(row))
 
 async def get_articles(
+    page: int = 1,
+    page_size: int = 20,
+    source: Optional[str] = None,
+    tag: Optional[str] = None,
+    search: Optional[str] = None,
+    read_later: Optional[bool] = None,
+    read: Optional[bool] = None,
+    highlight: bool = False,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    collapse: bool = False,
+    fields: tuple = ARTICLE_LIST_FIELDS
+) -> Dict[str, Any]:
+    """
+    Récupère les articles selon les critères de filtrage (voir _query_articles)
+    
+    Le résultat est mis en cache par combinaison de filtres et par version des
+    articles en base (voir get_data_version): toute écriture, y compris d'un
+    autre processus, le rend inaccessible. Il ne doit pas être modifié.
+    
+    Raises:
+        ValueError: Si le curseur est invalide
+    """
+    search = " ".join((search or "").split()) or None
+    version = await get_data_version("articles")
+    key = (
+        "articles", version, page, page_size, source or None, tag or None, search,
+        read_later, read, highlight and bool(search), cursor, include_total, collapse, tuple(fields)
+    )
+    
+    generation = _articles_cache.generation
+    cached = _articles_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    result = await _query_articles(
+        page=page, page_size=page_size, source=source, tag=tag, search=search,
+        read_later=read_later, read=read, highlight=highlight, cursor=cursor,
+        include_total=include_total, collapse=collapse, fields=fields
+    )
+    _articles_cache.put(key, result, generation)
+    return result
+
+async def _query_articles(
     page: int = 1, 
     page_size: int = 20, 
     source: Optional[str] = None,
     tag: Optional[str] = None,
     search: Optional[str] = None,
     read_later: Optional[bool] = None,
-    read: Optional[bool] = None
+    read: Optional[bool] = None,
+    highlight: bool = False,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    collapse: bool = False,
+    fields: tuple = ARTICLE_LIST_FIELDS
 ) -> Dict[str, Any]:
-    """Récupère les articles selon les critères de filtrage"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = sqlite3.Row
-        
+    """
+    Récupère les articles selon les critères de filtrage
+    
+    Seules les colonnes de fields (voir resolve_article_fields) sont lues: par
+    défaut, le contenu complet des articles n'est pas lu.
+    
+    Avec une recherche, les résultats sont classés par pertinence (bm25) et
+    highlight ajoute un extrait avec les termes trouvés entourés de <mark>.
+    
+    Si cursor est fourni (chaîne vide pour la première page), la pagination se
+    fait par curseur: les articles sont triés par date, la page suivante est
+    atteinte via l'index (pub_date, id) sans OFFSET, et next_cursor est retourné.
+    
+    Le total provient des compteurs maintenus quand un seul filtre simple est
+    actif, sinon d'un COUNT(*) mis en cache quelques secondes. Avec
+    include_total=False, aucun total n'est calculé et total vaut None.
+    
+    Avec collapse, seul l'article canonique de chaque groupe de quasi-doublons est
+    retourné, avec le nombre de doublons masqués (duplicate_count).
+    
+    Raises:
+        ValueError: Si le curseur est invalide
+    """
+    cursor_mode = cursor is not None
+    position = decode_cursor(cursor) if cursor else None
+    
+    async with _read_connection() as db:
         # Construire la requête avec conditions
-        query = "SELECT * FROM articles WHERE 1=1"
-        params = []
-        
-        if source:
-            query += " AND source = ?"
-            params.append(source)
-        
-        if tag:
-            query += " AND tags LIKE ?"
-            params.append(f"%{tag}%")
-        
-        if search:
-            query += " AND (title LIKE ? OR description LIKE ?)"
-            params.append(f"%{search}%")
-            params.append(f"%{search}%")
-        
-        if read_later is not None:
-            query += " AND read_later = ?"
-            params.append(1 if read_later else 0)
-        
-        if read is not None:
-            query += " AND read = ?"
-            params.append(1 if read else 0)
+        from_clause, where_clause, params, ranked = _build_article_filters(
+            source=source, tag=tag, search=search, read_later=read_later, read=read, collapse=collapse
+        )
         
         # Obtenir le compte total
-        count_query = query.replace("SELECT *", "SELECT COUNT(*)")
-        async with db.execute(count_query, params) as cursor:
-            total = await cursor.fetchone()
-            total = dict(total)["COUNT(*)"] if total else 0
+        total = None
+        if include_total:
+            filters = (source, tag, search, read_later, read, collapse)
+            total = await _count_articles(db, from_clause, where_clause, params, filters)
         
-        # Ajouter ordre et pagination
-        query += " ORDER BY pub_date DESC LIMIT ? OFFSET ?"
-        params.append(page_size)
-        params.append((page - 1) * page_size)
+        # Colonnes, ordre et pagination
+        columns = ", ".join(f"articles.{field}" for field in fields)
+        if ranked and highlight:
+            columns += f", {SEARCH_SNIPPET} AS snippet"
+        if collapse and not source:
+            columns += f", {DUPLICATE_COUNT} AS duplicate_count"
+        
+        if cursor_mode:
+            # Pagination par curseur: tri chronologique et recherche directe dans l'index
+            if position:
+                where_clause += " AND (articles.pub_date, articles.id) < (?, ?)"
+                params = params + list(position)
+            query = f"""
+            SELECT {columns} FROM {from_clause} WHERE {where_clause}
+            ORDER BY articles.pub_date DESC, articles.id DESC LIMIT ?
+            """
+            params = params + [page_size]
+        else:
+            order_by = "articles.pub_date DESC, articles.id DESC"
+            if ranked:
+                order_by = f"{SEARCH_RANK}, {order_by}"
+            query = f"SELECT {columns} FROM {from_clause} WHERE {where_clause} ORDER BY {order_by} LIMIT ? OFFSET ?"
+            params = params + [page_size, (page - 1) * page_size]
         
         # Exécuter la requête
         articles = []
         async with db.execute(query, params) as cursor:
             async for row in cursor:
-                article = dict(row)
-                # Convertir les tags de JSON à liste
-                if article["tags"]:
-                    article["tags"] = json.loads(article["tags"])
-                else:
-                    article["tags"] = []
-                articles.append(article)
+                articles.append(_decode_article(dict(row)))
+        
+        # Curseur de la page suivante si la page est complète
+        next_cursor = None
+        if cursor_mode and len(articles) == page_size:
+            next_cursor = encode_cursor(articles[-1]["pub_date"], articles[-1]["id"])
         
         return {
             "articles": articles,
             "total": total,
             "page": page,
-            "page_size": page_size
+            "page_size": page_size,
+            "next_cursor": next_cursor
         }
 
+async def export_articles(
+    source: Optional[str] = None,
+    tag: Optional[str] = None,
+    search: Optional[str] = None,
+    read_later: Optional[bool] = None,
+    read: Optional[bool] = None,
+    collapse: bool = False,
+    since: Optional[str] = None,
+    fields: tuple = ARTICLE_FIELDS
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Parcourt tous les articles correspondant aux filtres, en mémoire constante
+    
+    Les articles sont lus au fil d'un curseur SQLite, dans l'ordre de leur dernière
+    écriture (updated_at, toujours inclus avec created_at), sur une connexion dédiée
+    pour ne pas occuper un lecteur du pool pendant tout l'export.
+    
+    Args:
+        since: Date ISO: seuls les articles ingérés ou modifiés à partir de cette date sont exportés (export incrémental)
+        fields: Colonnes exportées (voir resolve_article_fields)
+    """
+    from_clause, where_clause, params, _ = _build_article_filters(
+        source=source, tag=tag, search=search, read_later=read_later, read=read, collapse=collapse
+    )
+    if since:
+        where_clause += " AND articles.updated_at >= ?"
+        params.append(since)
+    
+    columns = ", ".join(f"articles.{field}" for field in fields)
+    query = f"""
+    SELECT {columns}, articles.created_at, articles.updated_at FROM {from_clause} WHERE {where_clause}
+    ORDER BY articles.updated_at, articles.id
+    """
+    
+    db = await _connect(readonly=True)
+    try:
+        async with db.execute(query, params) as cursor:
+            async for row in cursor:
+                yield _decode_article(dict(row))
+    finally:
+        await db.close()
+
+async def get_tag_facets(
+    source: Optional[str] = None,
+    tag: Optional[str] = None,
+    search: Optional[str] = None,
+    read_later: Optional[bool] = None,
+    read: Optional[bool] = None,
+    limit: int = 50
+) -> List[Dict[str, Any]]:
+    """Compte les articles par tag pour les filtres donnés, du plus fréquent au moins fréquent"""
+    from_clause, where_clause, params, _ = _build_article_filters(
+        source=source, tag=tag, search=search, read_later=read_later, read=read
+    )
+    
+    if where_clause == "1=1":
+        # Sans filtre, les compteurs maintenus suffisent
+        query = """
+        SELECT key AS tag, count FROM article_counts
+        WHERE scope = 'tag' AND count > 0 ORDER BY count DESC, key LIMIT ?
+        """
+    else:
+        query = f"""
+        SELECT tag, COUNT(*) AS count FROM article_tags
+        WHERE article_id IN (SELECT articles.id FROM {from_clause} WHERE {where_clause})
+        GROUP BY tag ORDER BY count DESC, tag LIMIT ?
+        """
+    
+    facets = []
+    async with _read_connection() as db:
+        async with db.execute(query, params + [limit]) as cursor:
+            async for row in cursor:
+                facets.append({"name": row["tag"], "count": row["count"]})
+    
+    return facets
+
 async def delete_old_articles(days: int = 30):
-    """Supprime les articles plus anciens que le nombre de jours spécifié"""
+    """
+    Supprime les articles absents de leur flux depuis plus que le nombre de jours spécifié
+    
+    Un article toujours présent dans son flux est conservé quelle que soit sa date
+    d'ingestion (voir mark_articles_seen et mark_source_seen): supprimé, il serait
+    réingéré avec ses statuts read/read_later perdus.
+    """
     cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
     
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _write_connection() as db:
         await db.execute(
-            "DELETE FROM articles WHERE created_at < ?",
+            "DELETE FROM articles WHERE last_seen_at < ?",
             (cutoff_date,)
         )
         await db.commit()
+    _articles_cache.bump()
 
 async def save_source(source_data: Dict[str, Any]):
     """Sauvegarde ou met à jour une source RSS"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _write_connection() as db:
         fields = ", ".join(source_data.keys())
         placeholders = ", ".join("?" for _ in source_data)
         values = list(source_data.values())
@@ -171,12 +1214,18 @@ async def save_source(source_data: Dict[str, Any]):
         
         await db.execute(query, values)
         await db.commit()
+    _sources_cache.bump()
 
 async def get_sources(active_only: bool = True) -> List[Dict[str, Any]]:
     """Récupère les sources RSS configurées"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = sqlite3.Row
-        
+    # Copies des sources en cache: les appelants (ingestion) les modifient
+    key = ("sources", await get_data_version("sources"), active_only)
+    generation = _sources_cache.generation
+    cached = _sources_cache.get(key)
+    if cached is not None:
+        return [dict(source) for source in cached]
+    
+    async with _read_connection() as db:
         query = "SELECT * FROM sources"
         if active_only:
             query += " WHERE active = 1"
@@ -185,12 +1234,60 @@ async def get_sources(active_only: bool = True) -> List[Dict[str, Any]]:
         async with db.execute(query) as cursor:
             async for row in cursor:
                 sources.append(dict(row))
-        
-        return sources
+    
+    _sources_cache.put(key, sources, generation)
+    return [dict(source) for source in sources]
+
+async def get_due_sources(now: str) -> List[str]:
+    """Noms des sources actives dont la prochaine récupération est échue (voir schedule_first_polls)"""
+    async with _read_connection() as db:
+        async with db.execute(
+            """
+            SELECT name FROM sources
+            WHERE active = 1 AND next_poll_at <= ?
+            ORDER BY next_poll_at
+            """,
+            (now,)
+        ) as cursor:
+            return [row["name"] async for row in cursor]
+
+async def get_unscheduled_sources() -> List[str]:
+    """Noms des sources actives dont aucune récupération n'a encore été planifiée"""
+    async with _read_connection() as db:
+        async with db.execute("SELECT name FROM sources WHERE active = 1 AND next_poll_at IS NULL") as cursor:
+            return [row["name"] async for row in cursor]
+
+async def schedule_first_polls(first_polls: Dict[str, str]):
+    """
+    Fixe la première récupération des sources jamais planifiées
+    
+    Args:
+        first_polls: Nom de la source -> date de sa première récupération (ISO)
+    """
+    if not first_polls:
+        return
+    
+    async with _write_connection() as db:
+        await db.executemany(
+            "UPDATE sources SET next_poll_at = ? WHERE name = ? AND next_poll_at IS NULL",
+            [(next_poll_at, name) for name, next_poll_at in first_polls.items()]
+        )
+        await db.commit()
+    _sources_cache.bump()
+
+async def get_next_poll_at(now: str) -> Optional[str]:
+    """Prochaine échéance à venir parmi les sources actives"""
+    async with _read_connection() as db:
+        async with db.execute(
+            "SELECT MIN(next_poll_at) FROM sources WHERE active = 1 AND next_poll_at > ?",
+            (now,)
+        ) as cursor:
+            row = await cursor.fetchone()
+    return row[0]
 
 async def update_article_status(article_id: str, read_later: Optional[bool] = None, read: Optional[bool] = None):
     """Met à jour le statut de lecture d'un article"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _write_connection() as db:
         updates = []
         params = []
         
@@ -209,4 +1306,239 @@ async def update_article_status(article_id: str, read_later: Optional[bool] = No
         params.append(article_id)
         
         await db.execute(query, params)
-        await db.commit() 
\ No newline at end of file
+        await db.commit()
+    _articles_cache.bump()
+# File des tâches d'ingestion (rafraîchissement des sources)
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_HEARTBEAT_INTERVAL = 10  # Secondes entre deux signes de vie d'un worker sur sa tâche
+JOB_STALE_AFTER = 60  # Secondes sans signe de vie après lesquelles une tâche en cours est abandonnée
+
+async def _init_jobs(db: aiosqlite.Connection):
+    """Crée les tables de la file des tâches d'ingestion"""
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        status TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        started_at TEXT,
+        heartbeat_at TEXT,
+        finished_at TEXT,
+        worker TEXT,
+        error TEXT
+    )
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id)")
+    
+    # Avancement de chaque source d'une tâche
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS job_sources (
+        job_id INTEGER NOT NULL,
+        source TEXT NOT NULL,
+        status TEXT NOT NULL,
+        articles_count INTEGER DEFAULT 0,
+        error TEXT,
+        started_at TEXT,
+        finished_at TEXT,
+        PRIMARY KEY (job_id, source)
+    )
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_job_sources_source ON job_sources(source, status)")
+
+async def enqueue_refresh_job(sources: List[str]) -> Dict[str, Any]:
+    """
+    Met en file le rafraîchissement de sources, en fusionnant avec les tâches existantes
+    
+    Les sources déjà en attente ou en cours dans une autre tâche ne sont pas
+    ajoutées une seconde fois. Les autres rejoignent la tâche encore en attente,
+    s'il y en a une, ou une nouvelle tâche.
+    
+    Args:
+        sources: Noms des sources à rafraîchir
+    
+    Returns:
+        Dictionnaire avec l'identifiant de la tâche (job_id) et merged, vrai si
+        aucune nouvelle tâche n'a été créée
+    """
+    now = datetime.now().isoformat()
+    
+    async with _write_connection() as db:
+        # Verrou d'écriture immédiat: un worker d'un autre processus ne peut pas démarrer la tâche entre-temps
+        await db.execute("BEGIN IMMEDIATE")
+        
+        covered = {}
+        async with db.execute("""
+        SELECT job_sources.source, job_sources.job_id FROM job_sources
+        JOIN jobs ON jobs.id = job_sources.job_id
+        WHERE jobs.status IN (?, ?) AND job_sources.status IN (?, ?)
+        """, (JOB_QUEUED, JOB_RUNNING, JOB_QUEUED, JOB_RUNNING)) as cursor:
+            async for row in cursor:
+                covered[row["source"]] = row["job_id"]
+        
+        missing = list(dict.fromkeys(source for source in sources if source not in covered))
+        if not missing:
+            await db.commit()
+            job_ids = [covered[source] for source in sources]
+            return {"job_id": max(job_ids) if job_ids else None, "merged": True}
+        
+        async with db.execute(
+            "SELECT id FROM jobs WHERE status = ? AND kind = 'refresh' ORDER BY id LIMIT 1",
+            (JOB_QUEUED,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        
+        merged = row is not None
+        if merged:
+            job_id = row["id"]
+        else:
+            cursor = await db.execute(
+                "INSERT INTO jobs (kind, status, created_at) VALUES ('refresh', ?, ?)",
+                (JOB_QUEUED, now)
+            )
+            job_id = cursor.lastrowid
+        
+        await db.executemany(
+            "INSERT OR IGNORE INTO job_sources (job_id, source, status) VALUES (?, ?, ?)",
+            [(job_id, source, JOB_QUEUED) for source in missing]
+        )
+        await db.commit()
+        
+        return {"job_id": job_id, "merged": merged}
+
+async def claim_job(worker: str) -> Optional[Dict[str, Any]]:
+    """Réserve la plus ancienne tâche en attente pour un worker, retourne None si la file est vide"""
+    async with _write_connection() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        async with db.execute(
+            "SELECT id FROM jobs WHERE status = ? ORDER BY id LIMIT 1",
+            (JOB_QUEUED,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        
+        if row is None:
+            await db.commit()
+            return None
+        
+        now = datetime.now().isoformat()
+        await db.execute(
+            "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ?, worker = ? WHERE id = ?",
+            (JOB_RUNNING, now, now, worker, row["id"])
+        )
+        await db.commit()
+    
+    return await get_job(row["id"])
+
+async def touch_job(job_id: int):
+    """Enregistre un signe de vie du worker qui exécute la tâche"""
+    async with _write_connection() as db:
+        await db.execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?",
+            (datetime.now().isoformat(), job_id, JOB_RUNNING)
+        )
+        await db.commit()
+
+async def update_job_source(
+    job_id: int,
+    source: str,
+    status: str,
+    articles_count: int = 0,
+    error: Optional[str] = None
+):
+    """Met à jour l'avancement d'une source dans une tâche"""
+    now = datetime.now().isoformat()
+    
+    async with _write_connection() as db:
+        if status == JOB_RUNNING:
+            await db.execute(
+                "UPDATE job_sources SET status = ?, started_at = ? WHERE job_id = ? AND source = ?",
+                (status, now, job_id, source)
+            )
+        else:
+            await db.execute(
+                """
+                UPDATE job_sources SET status = ?, articles_count = ?, error = ?, finished_at = ?
+                WHERE job_id = ? AND source = ?
+                """,
+                (status, articles_count, error, now, job_id, source)
+            )
+        await db.commit()
+
+async def finish_job(job_id: int, status: str = JOB_DONE, error: Optional[str] = None):
+    """Marque une tâche comme terminée (ou en échec)"""
+    async with _write_connection() as db:
+        await db.execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?",
+            (status, datetime.now().isoformat(), error, job_id)
+        )
+        await db.commit()
+
+async def requeue_stale_jobs(max_age_seconds: int = JOB_STALE_AFTER) -> int:
+    """Remet en file les tâches en cours sans signe de vie depuis max_age_seconds (worker arrêté en cours de route)"""
+    cutoff = (datetime.now() - timedelta(seconds=max_age_seconds)).isoformat()
+    
+    async with _write_connection() as db:
+        cursor = await db.execute(
+            """
+            UPDATE jobs SET status = ?, started_at = NULL, heartbeat_at = NULL, worker = NULL
+            WHERE status = ? AND heartbeat_at <= ?
+            """,
+            (JOB_QUEUED, JOB_RUNNING, cutoff)
+        )
+        requeued = cursor.rowcount
+        # Les sources interrompues seront traitées à nouveau
+        await db.execute(
+            """
+            UPDATE job_sources SET status = ?, started_at = NULL
+            WHERE status = ? AND job_id IN (SELECT id FROM jobs WHERE status = ?)
+            """,
+            (JOB_QUEUED, JOB_RUNNING, JOB_QUEUED)
+        )
+        await db.commit()
+    
+    if requeued:
+        logger.info(f"{requeued} tâches d'ingestion interrompues remises en file")
+    return requeued
+
+async def get_job(job_id: int) -> Optional[Dict[str, Any]]:
+    """Récupère une tâche avec l'avancement de chacune de ses sources"""
+    async with _read_connection() as db:
+        async with db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        
+        job = dict(row)
+        async with db.execute(
+            """
+            SELECT source AS name, status, articles_count, error, started_at, finished_at
+            FROM job_sources WHERE job_id = ? ORDER BY source
+            """,
+            (job_id,)
+        ) as cursor:
+            job["sources"] = [dict(source) async for source in cursor]
+    
+    progress = {"total": len(job["sources"])}
+    for state in (JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED):
+        progress[state] = sum(1 for source in job["sources"] if source["status"] == state)
+    job["progress"] = progress
+    job["articles_count"] = sum(source["articles_count"] or 0 for source in job["sources"])
+    
+    return job
+
+async def delete_old_jobs(days: int = 7):
+    """Supprime les tâches terminées depuis plus du nombre de jours spécifié"""
+    cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+    
+    async with _write_connection() as db:
+        await db.execute(
+            "DELETE FROM job_sources WHERE job_id IN (SELECT id FROM jobs WHERE status IN (?, ?) AND finished_at < ?)",
+            (JOB_DONE, JOB_FAILED, cutoff_date)
+        )
+        await db.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+            (JOB_DONE, JOB_FAILED, cutoff_date)
+        )
+        await db.commit()
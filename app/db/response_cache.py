@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# Surcoût approximatif d'un objet Python (en-tête, pointeurs) pour l'estimation de la mémoire
+OBJECT_OVERHEAD = 64
+
+def approximate_size(value: Any) -> int:
+    """Estime la mémoire occupée par une réponse (dictionnaires, listes et valeurs simples)"""
+    if isinstance(value, dict):
+        return OBJECT_OVERHEAD + sum(approximate_size(key) + approximate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return OBJECT_OVERHEAD + sum(approximate_size(item) for item in value)
+    if isinstance(value, (str, bytes)):
+        return OBJECT_OVERHEAD + len(value)
+    return OBJECT_OVERHEAD
+
+class ResponseCache:
+    """Cache LRU à durée de vie limitée des résultats de lecture
+
+    Chaque écriture incrémente la génération du cache (bump) et le vide. Un
+    résultat n'est enregistré que si la génération lue avant la requête est
+    toujours la génération courante: un résultat calculé pendant une écriture
+    n'est jamais conservé. Les écritures d'un autre processus (worker séparé)
+    ne passent pas par bump: les appelants incluent dans la clé la version des
+    données en base, et la durée de vie borne la conservation des résultats
+    devenus inaccessibles.
+
+    Les résultats retournés sont partagés et ne doivent pas être modifiés.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 30.0):
+        """
+        Initialise le cache
+
+        Args:
+            max_entries: Nombre maximal de résultats conservés
+            ttl: Durée de vie d'un résultat en secondes
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # clé -> (résultat, date, taille)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retourne le résultat en cache pour la clé, ou None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, generation: int):
+        """
+        Enregistre un résultat
+
+        Args:
+            key: Clé normalisée de la requête
+            value: Résultat
+            generation: Génération lue avant d'exécuter la requête
+        """
+        size = approximate_size(value)
+        with self._lock:
+            if generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic(), size)
+            self._size += size
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def bump(self):
+        """Invalide tous les résultats après une écriture"""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key: Hashable):
+        _, _, size = self._entries.pop(key)
+        self._size -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les compteurs du cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "approximate_bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "generation": self.generation,
+                "invalidations": self.invalidations
+            }
@@ -5,11 +5,14 @@ from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+import importlib.util
 import uvicorn
 import os
 
 from .api import router as api_router
-from .db import init_db
+from .api.router import feed_fetcher, task_executor, ingestion_worker, feed_scheduler
+from .db import init_db, init_pool, close_pool
 from .utils.cleaner import DataCleaner
 
 # Configuration du logging
@@ -19,6 +22,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Worker d'ingestion: "inline" (dans le processus du serveur) ou "external" (python -m app.worker)
+INGESTION_WORKER_MODE = os.environ.get("TECHPULSE_INGESTION_WORKER", "inline")
+
 # Création de l'application FastAPI
 app = FastAPI(
     title="TechPulse",
@@ -35,6 +41,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression des réponses (JSON de l'API et fichiers statiques): brotli si brotli-asgi
+# est installé (avec repli sur gzip pour les clients qui ne l'acceptent pas), sinon gzip
+COMPRESSION_MINIMUM_SIZE = 1000  # octets
+if importlib.util.find_spec("brotli_asgi") is not None:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE)
+
 # Montage des fichiers statiques
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -60,10 +75,28 @@ async def startup_event():
     await init_db()
     logger.info("Base de données initialisée")
     
+    # Ouvrir le pool de connexions partagé
+    await init_pool(readers=4)
+    
     # Démarrer le nettoyeur de données en arrière-plan
     cleaner = DataCleaner(retention_days=30)
     asyncio.create_task(cleaner.schedule_cleaning(interval_hours=24))
     logger.info("Nettoyeur de données démarré")
+    
+    # Démarrer le worker des tâches d'ingestion et le planificateur des sources, sauf s'ils tournent dans un processus séparé
+    if INGESTION_WORKER_MODE == "inline":
+        asyncio.create_task(ingestion_worker.run())
+        asyncio.create_task(feed_scheduler.run())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Libération des ressources à l'arrêt de l'application"""
+    feed_scheduler.stop()
+    ingestion_worker.stop()
+    feed_fetcher.close()
+    task_executor.shutdown()
+    logger.info("Couche d'exécution arrêtée")
+    await close_pool()
 
 if __name__ == "__main__":
     # Exécution de l'application avec uvicorn
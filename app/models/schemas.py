@@ -1,5 +1,5 @@
 from pydantic import BaseModel, HttpUrl, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 class Tag(BaseModel):
@@ -21,13 +21,47 @@ class Article(BaseModel):
     read_later: bool = False
     read: bool = False
     image_url: Optional[HttpUrl] = None
+    snippet: Optional[str] = None  # Extrait surligné lors d'une recherche
+    canonical_id: Optional[str] = None  # Article canonique si l'article est un quasi-doublon
+    duplicate_count: Optional[int] = None  # Quasi-doublons regroupés sous l'article (avec collapse)
+
+class ArticleListItem(BaseModel):
+    """Article d'une liste: seuls les champs demandés (paramètre fields) sont présents"""
+    id: str
+    title: Optional[str] = None
+    link: Optional[HttpUrl] = None
+    pub_date: Optional[datetime] = None
+    description: Optional[str] = None
+    content: Optional[str] = None
+    summary: Optional[str] = None
+    source: Optional[str] = None
+    tags: Optional[List[Tag]] = None
+    read_later: Optional[bool] = None
+    read: Optional[bool] = None
+    image_url: Optional[HttpUrl] = None
+    snippet: Optional[str] = None
+    canonical_id: Optional[str] = None
+    duplicate_count: Optional[int] = None
 
 class ArticleResponse(BaseModel):
     """Schéma pour la réponse API contenant les articles"""
-    articles: List[Article]
-    total: int
+    articles: List[ArticleListItem]
+    total: Optional[int] = None  # None si le total n'a pas été demandé
     page: int = 1
     page_size: int = 20
+    next_cursor: Optional[str] = None  # Curseur opaque de la page suivante (pagination par curseur)
+
+class TagFacet(BaseModel):
+    """Nombre d'articles associés à un tag pour un ensemble de filtres"""
+    name: str
+    count: int
+
+class ArticleCounts(BaseModel):
+    """Compteurs d'articles maintenus par la base"""
+    total: int
+    read: int
+    read_later: int
+    sources: Dict[str, int] = {}
 
 class SourceConfig(BaseModel):
     """Configuration d'une source RSS"""
@@ -35,4 +69,7 @@ class SourceConfig(BaseModel):
     url: HttpUrl
     icon: Optional[str] = None
     category: str
-    active: bool = True 
\ No newline at end of file
+    active: bool = True
+    poll_interval: Optional[int] = None  # Intervalle de récupération appris, en secondes
+    next_poll_at: Optional[str] = None  # Prochaine récupération planifiée
+    failure_count: int = 0  # Échecs de récupération consécutifs 
\ No newline at end of file
@@ -0,0 +1,157 @@
+import hashlib
+import logging
+import re
+from typing import Any, Dict, List, Optional
+from ..db import database
+from .executor import TaskExecutor
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Empreinte SimHash de 64 bits découpée en 4 bandes de 16 bits: deux empreintes à au
+# plus 3 bits d'écart ont forcément une bande identique, ce qui permet de trouver les
+# candidats par recherche indexée sur les bandes plutôt qu'en comparant tous les articles
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+NEAR_DUPLICATE_DISTANCE = 3
+
+# Texte pris en compte: titre et description, découpés en séquences de 3 mots
+SHINGLE_SIZE = 3
+MIN_TOKENS = 12  # En dessous, l'empreinte n'est pas assez discriminante
+MAX_TEXT_CHARS = 2000
+
+_TOKEN = re.compile(r"\w+")
+
+def article_text(article: Dict[str, Any]) -> str:
+    """Texte d'un article utilisé pour l'empreinte"""
+    body = article.get("description") or article.get("content") or ""
+    return f"{article.get('title') or ''} {body[:MAX_TEXT_CHARS]}"
+
+def simhash(text: str) -> Optional[int]:
+    """
+    Calcule l'empreinte SimHash d'un texte
+
+    Returns:
+        Empreinte signée sur 64 bits (stockable dans une colonne INTEGER SQLite),
+        ou None si le texte est trop court
+    """
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < MIN_TOKENS:
+        return None
+
+    shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=SIMHASH_BITS // 8).digest(), "big")
+        for shingle in shingles
+    ]
+
+    # Chaque bit vaut 1 si la majorité des séquences ont ce bit à 1
+    value = 0
+    half = len(hashes) / 2
+    for bit in range(SIMHASH_BITS):
+        if sum(h >> bit & 1 for h in hashes) > half:
+            value |= 1 << bit
+
+    return value - (1 << SIMHASH_BITS) if value >> (SIMHASH_BITS - 1) else value
+
+def simhash_texts(texts: List[str]) -> List[Optional[int]]:
+    """Calcule les empreintes d'un lot de textes (fonction de module exécutée dans le pool CPU)"""
+    return [simhash(text) for text in texts]
+
+def simhash_bands(value: int) -> List[int]:
+    """Découpe une empreinte en bandes indexées (une valeur par bande, dans l'ordre)"""
+    value &= (1 << SIMHASH_BITS) - 1
+    width = SIMHASH_BITS // SIMHASH_BANDS
+    return [value >> (band * width) & ((1 << width) - 1) for band in range(SIMHASH_BANDS)]
+
+def hamming_distance(a: int, b: int) -> int:
+    """Nombre de bits différents entre deux empreintes"""
+    return bin((a ^ b) & ((1 << SIMHASH_BITS) - 1)).count("1")
+
+async def mark_near_duplicates(
+    articles: List[Dict[str, Any]],
+    executor: Optional[TaskExecutor] = None
+) -> int:
+    """
+    Calcule l'empreinte des articles et les rattache à leur article canonique
+
+    Un article est un quasi-doublon s'il est à au plus NEAR_DUPLICATE_DISTANCE bits
+    d'un article d'une autre source, déjà enregistré ou placé avant lui dans le lot.
+    Il reçoit alors canonical_id (l'article canonique du groupe, le premier reçu) et,
+    si l'article trouvé en a déjà, ses tags: ils n'ont pas à être regénérés.
+
+    Args:
+        articles: Articles à sauvegarder (simhash, simhash_bands et canonical_id sont ajoutés)
+        executor: Couche d'exécution; les empreintes sont alors calculées dans son pool CPU
+
+    Returns:
+        Nombre de quasi-doublons trouvés
+    """
+    if not articles:
+        return 0
+
+    # Calcul des empreintes hors de la boucle d'événements: seules la recherche par
+    # bandes et la sauvegarde restent dans la transaction d'écriture
+    texts = [article_text(article) for article in articles]
+    if executor is None:
+        fingerprints = simhash_texts(texts)
+    else:
+        fingerprints = await executor.run_cpu(simhash_texts, texts)
+
+    for article, fingerprint in zip(articles, fingerprints):
+        article["simhash"] = fingerprint
+        article["simhash_bands"] = simhash_bands(article["simhash"]) if article["simhash"] is not None else []
+        article["canonical_id"] = None
+
+    fingerprinted = [article for article in articles if article["simhash"] is not None]
+    if not fingerprinted:
+        return 0
+
+    # Une seule recherche indexée pour toutes les bandes du lot
+    candidates = await database.get_simhash_candidates([
+        (band, value) for article in fingerprinted for band, value in enumerate(article["simhash_bands"])
+    ])
+    batch_ids = {article["id"] for article in articles}
+    candidates = [candidate for candidate in candidates if candidate["id"] not in batch_ids]
+
+    duplicates = link_near_duplicates(fingerprinted, candidates)
+    if duplicates:
+        logger.info(f"{duplicates} quasi-doublons rattachés à un article existant")
+    return duplicates
+
+def link_near_duplicates(articles: List[Dict[str, Any]], candidates: List[Dict[str, Any]]) -> int:
+    """
+    Rattache des articles au premier article proche d'une autre source
+
+    Rejoué par database.save_articles dans la transaction d'écriture pour les articles
+    encore sans article canonique: deux sources ingérées en parallèle ne peuvent pas
+    enregistrer chacune leur version d'une même annonce comme article canonique.
+
+    Args:
+        articles: Articles du lot dont l'empreinte est calculée, dans l'ordre de réception
+        candidates: Articles enregistrés partageant une bande d'empreinte, hors lot
+
+    Returns:
+        Nombre d'articles rattachés
+    """
+    duplicates = 0
+    for index, article in enumerate(articles):
+        # Les articles enregistrés, puis ceux placés avant dans le lot
+        for candidate in candidates + articles[:index]:
+            if candidate["source"] == article["source"]:
+                continue
+            if hamming_distance(candidate["simhash"], article["simhash"]) > NEAR_DUPLICATE_DISTANCE:
+                continue
+
+            canonical_id = candidate["canonical_id"] or candidate["id"]
+            if canonical_id == article["id"]:
+                continue
+
+            article["canonical_id"] = canonical_id
+            if candidate.get("tags") and not article.get("tags"):
+                article["tags"] = list(candidate["tags"])
+            duplicates += 1
+            break
+
+    return duplicates
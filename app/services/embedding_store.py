@@ -0,0 +1,120 @@
+import logging
+import os
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Emplacement par défaut des embeddings de documents
+DEFAULT_EMBEDDINGS_PATH = "data/embeddings.db"
+
+class EmbeddingStore:
+    """Stockage sur disque des embeddings de documents, par identifiant d'article
+
+    numpy n'est importé qu'à l'usage, avec les modèles qui produisent les embeddings.
+
+    Chaque embedding est conservé sous forme de tableau float32 compact, avec
+    l'empreinte du contenu qui l'a produit: un embedding n'est réutilisé que si
+    le contenu de l'article n'a pas changé. Le stockage utilise une base SQLite
+    séparée pour ne pas concurrencer l'écrivain de la base principale.
+    """
+
+    def __init__(self, path: str = DEFAULT_EMBEDDINGS_PATH):
+        """
+        Initialise le stockage
+
+        Args:
+            path: Chemin du fichier SQLite des embeddings
+        """
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Ouvre la base au premier usage"""
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("""
+            CREATE TABLE IF NOT EXISTS document_embeddings (
+                article_id TEXT PRIMARY KEY,
+                content_hash TEXT,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL
+            )
+            """)
+        return self._db
+
+    def get_many(self, keys: Dict[str, Optional[str]]) -> Dict[str, "np.ndarray"]:
+        """
+        Récupère les embeddings connus
+
+        Args:
+            keys: Identifiant d'article -> empreinte du contenu attendue
+
+        Returns:
+            Identifiant d'article -> embedding float32, pour les embeddings à jour
+        """
+        if not keys:
+            return {}
+
+        import numpy as np
+
+        ids = list(keys)
+        found = {}
+        with self._lock:
+            db = self._connection()
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                query = f"SELECT article_id, content_hash, dim, vector FROM document_embeddings WHERE article_id IN ({placeholders})"
+                for article_id, content_hash, dim, vector in db.execute(query, batch):
+                    if content_hash == keys[article_id]:
+                        found[article_id] = np.frombuffer(vector, dtype=np.float32, count=dim)
+        return found
+
+    def put_many(self, embeddings: Dict[str, "np.ndarray"], hashes: Dict[str, Optional[str]]):
+        """Enregistre des embeddings (convertis en float32) avec l'empreinte de leur contenu"""
+        if not embeddings:
+            return
+
+        import numpy as np
+
+        rows = [
+            (article_id, hashes.get(article_id), int(vector.shape[-1]), np.asarray(vector, dtype=np.float32).tobytes())
+            for article_id, vector in embeddings.items()
+        ]
+        with self._lock:
+            db = self._connection()
+            db.executemany("INSERT OR REPLACE INTO document_embeddings VALUES (?, ?, ?, ?)", rows)
+            db.commit()
+
+    def get(self, article_id: str) -> Optional["np.ndarray"]:
+        """Récupère l'embedding d'un article, quel que soit son contenu courant"""
+        import numpy as np
+
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT dim, vector FROM document_embeddings WHERE article_id = ?",
+                (article_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[1], dtype=np.float32, count=row[0])
+
+    def close(self):
+        """Ferme la base"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
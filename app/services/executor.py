@@ -0,0 +1,148 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Valeurs par défaut de la couche d'exécution
+DEFAULT_IO_WORKERS = 20
+DEFAULT_CPU_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+DEFAULT_MAX_PENDING = 64
+
+# Taille des pools du serveur et du worker d'ingestion, ajustable au déploiement
+IO_WORKERS = int(os.environ.get("TECHPULSE_IO_WORKERS", DEFAULT_IO_WORKERS))
+CPU_WORKERS = int(os.environ.get("TECHPULSE_CPU_WORKERS", DEFAULT_CPU_WORKERS))
+MAX_PENDING = int(os.environ.get("TECHPULSE_MAX_PENDING", DEFAULT_MAX_PENDING))
+
+class _PoolMetrics:
+    """Compteurs d'activité d'un pool"""
+
+    def __init__(self):
+        self.waiting = 0  # Tâches bloquées par la contre-pression
+        self.running = 0  # Tâches soumises au pool et non terminées
+        self.completed = 0
+        self.failed = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "queue_depth": self.waiting + self.running,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+class TaskExecutor:
+    """Couche d'exécution des tâches bloquantes hors de la boucle d'événements
+
+    Les entrées/sorties bloquantes (téléchargements) passent par un pool de
+    threads, le travail CPU (parsing HTML, génération de tags) par un pool de
+    processus. Chaque pool accepte au plus max_pending tâches en cours: au-delà,
+    les appelants attendent qu'une place se libère (contre-pression) au lieu
+    d'empiler du travail sans limite.
+    """
+
+    def __init__(
+        self,
+        io_workers: int = IO_WORKERS,
+        cpu_workers: int = CPU_WORKERS,
+        max_pending: int = MAX_PENDING
+    ):
+        """
+        Initialise la couche d'exécution
+
+        Args:
+            io_workers: Nombre de threads du pool d'entrées/sorties
+            cpu_workers: Nombre de processus du pool CPU (0 = travail CPU exécuté dans le pool de threads)
+            max_pending: Nombre maximal de tâches en cours par pool avant mise en attente
+        """
+        self.io_workers = io_workers
+        self.cpu_workers = cpu_workers
+        self.max_pending = max_pending
+
+        self._io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="techpulse-io")
+        # Pool de processus créé au premier usage (démarrage rapide, processus "spawn" sûrs)
+        self._cpu_pool: Optional[Executor] = None
+
+        self._io_slots = asyncio.Semaphore(max_pending)
+        self._cpu_slots = asyncio.Semaphore(max_pending)
+        self._io_metrics = _PoolMetrics()
+        self._cpu_metrics = _PoolMetrics()
+
+    @property
+    def uses_processes(self) -> bool:
+        """Indique si le travail CPU est exécuté dans des processus séparés"""
+        return self.cpu_workers > 0
+
+    def _get_cpu_pool(self) -> Executor:
+        """Retourne le pool CPU, en le créant si nécessaire"""
+        if self._cpu_pool is None:
+            if self.cpu_workers > 0:
+                self._cpu_pool = ProcessPoolExecutor(
+                    max_workers=self.cpu_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"Pool de processus CPU démarré ({self.cpu_workers} processus)")
+            else:
+                self._cpu_pool = self._io_pool
+        return self._cpu_pool
+
+    async def _submit(
+        self,
+        pool: Executor,
+        slots: asyncio.Semaphore,
+        metrics: _PoolMetrics,
+        func: Callable,
+        *args,
+        **kwargs
+    ) -> Any:
+        """Soumet une tâche à un pool en respectant la contre-pression"""
+        metrics.waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            metrics.waiting -= 1
+
+        metrics.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+            metrics.completed += 1
+            return result
+        except Exception:
+            metrics.failed += 1
+            raise
+        finally:
+            metrics.running -= 1
+            slots.release()
+
+    async def run_io(self, func: Callable, *args, **kwargs) -> Any:
+        """Exécute une fonction d'entrées/sorties bloquante dans le pool de threads"""
+        return await self._submit(self._io_pool, self._io_slots, self._io_metrics, func, *args, **kwargs)
+
+    async def run_cpu(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Exécute une fonction coûteuse en CPU dans le pool de processus
+
+        La fonction et ses arguments doivent être picklables (fonction de module).
+        """
+        return await self._submit(self._get_cpu_pool(), self._cpu_slots, self._cpu_metrics, func, *args, **kwargs)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Retourne l'état des pools (profondeur de file, tâches terminées, échecs)"""
+        return {
+            "io": dict(self._io_metrics.as_dict(), workers=self.io_workers, max_pending=self.max_pending),
+            "cpu": dict(self._cpu_metrics.as_dict(), workers=self.cpu_workers, max_pending=self.max_pending)
+        }
+
+    def shutdown(self):
+        """Arrête les pools sans attendre les tâches en cours"""
+        if self._cpu_pool is not None and self._cpu_pool is not self._io_pool:
+            self._cpu_pool.shutdown(wait=False, cancel_futures=True)
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Any, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from .executor import TaskExecutor
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Valeurs par défaut du moteur de récupération
+DEFAULT_MAX_CONCURRENCY = 20
+DEFAULT_PER_HOST_LIMIT = 4
+DEFAULT_TIMEOUT = 20.0
+STREAM_CHUNK_SIZE = 64 * 1024  # Taille des blocs lus lors d'un téléchargement en flux
+USER_AGENT = "TechPulse/1.0 (+https://github.com/KhalidOUARDIRHI/TechPulse)"
+
+class FeedFetcher:
+    """Moteur de téléchargement concurrent des flux RSS
+
+    Les téléchargements sont exécutés dans le pool d'entrées/sorties de la
+    couche d'exécution pour ne jamais bloquer la boucle d'événements. Le
+    nombre de téléchargements simultanés est borné globalement et par hôte,
+    et chaque flux dispose d'un délai maximal.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        timeout: float = DEFAULT_TIMEOUT,
+        executor: Optional[TaskExecutor] = None
+    ):
+        """
+        Initialise le moteur de récupération
+
+        Args:
+            max_concurrency: Nombre maximal de téléchargements simultanés
+            per_host_limit: Nombre maximal de téléchargements simultanés par hôte
+            timeout: Délai maximal en secondes pour récupérer un flux
+            executor: Couche d'exécution partagée (un pool de threads privé est créé sinon)
+        """
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._owns_executor = executor is None
+        self.executor = executor or TaskExecutor(io_workers=max_concurrency, cpu_workers=0)
+        # Une session HTTP par thread (les sessions requests ne sont pas thread-safe)
+        self._local = threading.local()
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Retourne le sémaphore associé à l'hôte de l'URL"""
+        host = urlparse(url).netloc.lower()
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    def _session(self) -> requests.Session:
+        """Retourne la session HTTP du thread courant"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+            self._local.session = session
+        return session
+
+    def _download(self, url: str, headers: Dict[str, str]) -> Dict[str, Any]:
+        """Télécharge un flux de manière bloquante (exécuté dans le pool de threads)"""
+        response = self._session().get(url, headers=headers, timeout=self.timeout)
+        return {
+            "status": response.status_code,
+            "url": response.url,
+            # En-têtes en minuscules, comme attendu par feedparser
+            "headers": {key.lower(): value for key, value in response.headers.items()},
+            "content": response.content
+        }
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Récupère un flux sans bloquer la boucle d'événements
+
+        Args:
+            url: URL du flux
+            headers: En-têtes HTTP supplémentaires
+
+        Returns:
+            Dictionnaire contenant le statut, l'URL finale, les en-têtes et le contenu brut
+
+        Raises:
+            asyncio.TimeoutError: Si le flux n'a pas été récupéré dans le délai imparti
+            requests.RequestException: En cas d'erreur réseau
+        """
+        # Réserver d'abord la place sur l'hôte pour ne pas monopoliser un slot global en attente
+        async with self._host_semaphore(url), self._semaphore:
+            return await asyncio.wait_for(
+                self.executor.run_io(self._download, url, headers or {}),
+                timeout=self.timeout
+            )
+
+    def _open(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        """Ouvre une réponse en flux de manière bloquante (exécuté dans le pool de threads)"""
+        return self._session().get(url, headers=headers, timeout=self.timeout, stream=True)
+    
+    @staticmethod
+    def _remaining(deadline: float) -> float:
+        """Temps restant avant l'échéance d'une requête"""
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError()
+        return remaining
+    
+    async def _iter_chunks(
+        self,
+        response: requests.Response,
+        chunk_size: int,
+        deadline: float
+    ) -> AsyncIterator[bytes]:
+        """Lit le corps d'une réponse bloc par bloc, chaque lecture étant exécutée dans le pool de threads"""
+        chunks = response.iter_content(chunk_size=chunk_size)
+        while True:
+            chunk = await asyncio.wait_for(
+                self.executor.run_io(next, chunks, None),
+                timeout=self._remaining(deadline)
+            )
+            if chunk is None:
+                return
+            yield chunk
+    
+    @asynccontextmanager
+    async def stream(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Ouvre un flux sans le télécharger entièrement
+        
+        Les places de concurrence (globale et par hôte) sont conservées jusqu'à la
+        sortie du contexte. Le délai maximal s'applique à toute la requête: l'ouverture
+        puis chaque bloc disposent du temps restant avant l'échéance.
+        
+        Args:
+            url: URL du flux
+            headers: En-têtes HTTP supplémentaires
+            chunk_size: Taille des blocs lus
+        
+        Yields:
+            Dictionnaire contenant le statut, l'URL finale, les en-têtes et chunks,
+            itérateur asynchrone sur les blocs du corps
+        """
+        async with self._host_semaphore(url), self._semaphore:
+            # Échéance fixée une fois les places obtenues, comme pour fetch
+            deadline = asyncio.get_running_loop().time() + self.timeout
+            response = await asyncio.wait_for(
+                self.executor.run_io(self._open, url, headers or {}),
+                timeout=self._remaining(deadline)
+            )
+            try:
+                yield {
+                    "status": response.status_code,
+                    "url": response.url,
+                    # En-têtes en minuscules, comme attendu par feedparser
+                    "headers": {key.lower(): value for key, value in response.headers.items()},
+                    "chunks": self._iter_chunks(response, chunk_size, deadline)
+                }
+            finally:
+                response.close()
+    
+    def close(self):
+        """Libère le pool de threads privé, le cas échéant"""
+        if self._owns_executor:
+            self.executor.shutdown()
@@ -0,0 +1,161 @@
+import logging
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Espaces de noms rencontrés dans les flux
+ATOM_NS = "http://www.w3.org/2005/Atom"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+MEDIA_NS = "http://search.yahoo.com/mrss/"
+SY_NS = "http://purl.org/rss/1.0/modules/syndication/"
+RSS1_NS = "http://purl.org/rss/1.0/"
+
+# Éléments correspondant à une entrée (RSS 2.0, RSS 1.0/RDF, Atom)
+ENTRY_TAGS = {"item", f"{{{RSS1_NS}}}item", f"{{{ATOM_NS}}}entry"}
+
+# Indications de fréquence de mise à jour au niveau du canal
+CHANNEL_HINT_TAGS = {
+    "ttl": "ttl",
+    f"{{{SY_NS}}}updatePeriod": "sy_updateperiod",
+    f"{{{SY_NS}}}updateFrequency": "sy_updatefrequency"
+}
+
+def _local_name(tag: str) -> str:
+    """Nom d'une balise sans son espace de noms"""
+    return tag.rsplit("}", 1)[-1]
+
+def _text(element: ET.Element) -> str:
+    return (element.text or "").strip()
+
+def _inner_xml(element: ET.Element) -> str:
+    """Contenu XHTML d'un élément Atom de type xhtml"""
+    parts = [element.text or ""]
+    for child in element:
+        parts.append(ET.tostring(child, encoding="unicode"))
+    return "".join(parts).strip()
+
+def _atom_content(element: ET.Element) -> Dict[str, str]:
+    """Contenu Atom sous la forme utilisée par feedparser (type MIME et valeur)"""
+    content_type = element.get("type", "text")
+    if content_type == "xhtml":
+        return {"type": "application/xhtml+xml", "value": _inner_xml(element)}
+    if content_type == "html":
+        return {"type": "text/html", "value": element.text or ""}
+    return {"type": "text/plain" if content_type == "text" else content_type, "value": element.text or ""}
+
+def element_to_entry(element: ET.Element) -> Dict[str, Any]:
+    """
+    Convertit un élément item/entry en dictionnaire aux clés de feedparser
+
+    Seuls les champs lus par les handlers du RSSParser sont extraits; le
+    dictionnaire ne contient que des types simples (transmissible à un processus).
+    """
+    entry: Dict[str, Any] = {}
+    tags, enclosures, media, links, content = [], [], [], [], []
+
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue
+        namespace = child.tag[1:].split("}", 1)[0] if child.tag.startswith("{") else ""
+        name = _local_name(child.tag)
+
+        if name == "title" and namespace in ("", ATOM_NS, RSS1_NS, DC_NS):
+            entry.setdefault("title", _text(child))
+        elif name == "link" and namespace == ATOM_NS:
+            rel = child.get("rel", "alternate")
+            if rel == "alternate" and "link" not in entry:
+                entry["link"] = child.get("href", "")
+            links.append({"rel": rel, "type": child.get("type", ""), "href": child.get("href", "")})
+        elif name == "link":
+            entry.setdefault("link", _text(child))
+        elif name in ("guid", "id"):
+            entry["id"] = _text(child)
+        elif name in ("pubDate", "published") or (name == "date" and namespace == DC_NS):
+            entry.setdefault("published", _text(child))
+        elif name == "updated":
+            entry.setdefault("updated", _text(child))
+        elif name in ("description", "summary"):
+            entry["summary"] = child.text or ""
+        elif name == "encoded" and namespace == CONTENT_NS:
+            content.append({"type": "text/html", "value": child.text or ""})
+        elif name == "content" and namespace == ATOM_NS:
+            content.append(_atom_content(child))
+        elif name == "content" and namespace == MEDIA_NS:
+            item = {"url": child.get("url", "")}
+            if child.get("type"):
+                item["type"] = child.get("type")
+            media.append(item)
+        elif name == "category":
+            term = child.get("term") or _text(child)
+            if term:
+                tags.append({"term": term})
+        elif name == "enclosure":
+            enclosures.append({"href": child.get("url", ""), "type": child.get("type", "")})
+
+    # Comme feedparser: à défaut de résumé, le premier contenu en tient lieu
+    if "summary" not in entry and content:
+        entry["summary"] = content[0]["value"]
+    for key, values in (("tags", tags), ("enclosures", enclosures), ("media_content", media),
+                        ("links", links), ("content", content)):
+        if values:
+            entry[key] = values
+    return entry
+
+class FeedStreamParser:
+    """Parser XML incrémental des flux RSS et Atom
+
+    Les blocs du corps de la réponse sont fournis au fur et à mesure; chaque
+    entrée est retournée dès que son élément est complet, puis retirée de
+    l'arbre. La mémoire utilisée ne dépend que de la taille d'une entrée, pas
+    de celle du flux.
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack: List[ET.Element] = []
+        self.channel: Dict[str, str] = {}  # Indications du canal (ttl, sy:updatePeriod...)
+        self.entry_count = 0
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """
+        Analyse un bloc du flux
+
+        Returns:
+            Entrées complétées par ce bloc
+
+        Raises:
+            xml.etree.ElementTree.ParseError: Si le flux n'est pas du XML bien formé
+        """
+        self._parser.feed(chunk)
+        return self._collect()
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Termine l'analyse et retourne les dernières entrées"""
+        self._parser.close()
+        return self._collect()
+
+    def _collect(self) -> List[Dict[str, Any]]:
+        entries = []
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._stack.append(element)
+                continue
+
+            self._stack.pop()
+            parent = self._stack[-1] if self._stack else None
+            in_entry = any(ancestor.tag in ENTRY_TAGS for ancestor in self._stack)
+
+            if element.tag in ENTRY_TAGS and not in_entry:
+                entries.append(element_to_entry(element))
+                self.entry_count += 1
+                # Libérer l'entrée: l'arbre ne conserve que les éléments du canal
+                element.clear()
+                if parent is not None:
+                    parent.remove(element)
+            elif element.tag in CHANNEL_HINT_TAGS and not in_entry:
+                self.channel[CHANNEL_HINT_TAGS[element.tag]] = _text(element)
+        return entries
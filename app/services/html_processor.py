@@ -0,0 +1,157 @@
+import hashlib
+import importlib.util
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Moteur d'analyse HTML: le plus rapide disponible parmi selectolax (lexbor) et lxml,
+# sinon BeautifulSoup avec le parser pur Python. Seule leur présence est vérifiée ici.
+if importlib.util.find_spec("selectolax") is not None:
+    HTML_BACKEND = "selectolax"
+elif importlib.util.find_spec("lxml") is not None:
+    HTML_BACKEND = "lxml"
+else:
+    HTML_BACKEND = "html.parser"
+
+# Balises dont le contenu n'est pas du texte
+IGNORED_TAGS = ("script", "style")
+
+# Taille minimale (largeur ou hauteur) d'une image "substantielle", par opposition aux icônes
+MIN_IMAGE_SIZE = 150
+
+# Fragments déjà traités: la description, le contenu et le résumé d'une entrée sont souvent identiques.
+# Le cache est indexé par empreinte: les fragments HTML eux-mêmes ne sont pas conservés.
+HTML_CACHE_SIZE = 256
+_html_cache: "OrderedDict[tuple, ProcessedHtml]" = OrderedDict()
+_html_cache_lock = threading.Lock()
+
+_WHITESPACE = re.compile(r'\s+')
+
+class ProcessedHtml(NamedTuple):
+    """Résultat de l'analyse d'un fragment HTML"""
+    text: str  # Texte nettoyé (sans scripts ni styles, espaces normalisés)
+    image: Optional[str]  # Image principale du fragment
+    first_image: Optional[str]  # Première image du fragment, quelle que soit sa taille
+
+EMPTY_HTML = ProcessedHtml(text="", image=None, first_image=None)
+
+def _pick_image(images: List[Tuple[Optional[str], Optional[str], Optional[str]]]) -> Optional[str]:
+    """
+    Choisit l'image principale parmi les balises img (src, width, height) dans l'ordre du document
+
+    La première image "substantielle" (plus grande qu'une icône, ou sans dimensions
+    déclarées) est retenue, sinon la première image du fragment.
+    """
+    for src, width, height in images:
+        if not src:
+            continue
+        if width is None and height is None:
+            return src
+        for size in (width, height):
+            try:
+                if size is not None and int(size) > MIN_IMAGE_SIZE:
+                    return src
+            except ValueError:
+                pass
+
+    if images and images[0][0]:
+        return images[0][0]
+    return None
+
+def _parse_selectolax(html: str) -> Tuple[str, list]:
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    images = [
+        (img.attributes.get("src"), img.attributes.get("width"), img.attributes.get("height"))
+        for img in tree.css("img")
+    ]
+    tree.strip_tags(list(IGNORED_TAGS))
+    return tree.root.text(separator=" ", strip=True), images
+
+def _parse_lxml(html: str) -> Tuple[str, list]:
+    from lxml import etree
+    from lxml import html as lxml_html
+
+    try:
+        root = lxml_html.document_fromstring(html)
+    except etree.ParserError:
+        # Fragment vide ou composé uniquement d'espaces
+        return "", []
+
+    images = [(img.get("src"), img.get("width"), img.get("height")) for img in root.iter("img")]
+    for element in list(root.iter(*IGNORED_TAGS)):
+        element.drop_tree()
+    strings = (string.strip() for string in root.itertext())
+    return " ".join(string for string in strings if string), images
+
+def _parse_beautifulsoup(html: str) -> Tuple[str, list]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    images = [(img.get("src"), img.get("width"), img.get("height")) for img in soup.find_all("img")]
+    for element in soup(list(IGNORED_TAGS)):
+        element.extract()
+    return soup.get_text(separator=" ", strip=True), images
+
+_PARSERS = {
+    "selectolax": _parse_selectolax,
+    "lxml": _parse_lxml,
+    "html.parser": _parse_beautifulsoup
+}
+
+def process_html(html: str, backend: str = HTML_BACKEND) -> ProcessedHtml:
+    """
+    Analyse un fragment HTML en une seule passe
+
+    Args:
+        html: Fragment HTML (description ou contenu d'une entrée de flux)
+        backend: Moteur d'analyse (selectolax, lxml ou html.parser)
+
+    Returns:
+        Texte nettoyé, image principale et première image du fragment
+    """
+    if not html:
+        return EMPTY_HTML
+
+    key = (hashlib.blake2b(html.encode(), digest_size=16).digest(), backend)
+    with _html_cache_lock:
+        cached = _html_cache.get(key)
+        if cached is not None:
+            _html_cache.move_to_end(key)
+            return cached
+
+    processed = _process_html(html, backend)
+
+    with _html_cache_lock:
+        _html_cache[key] = processed
+        while len(_html_cache) > HTML_CACHE_SIZE:
+            _html_cache.popitem(last=False)
+    return processed
+
+def clear_html_cache():
+    """Vide le cache des fragments déjà traités"""
+    with _html_cache_lock:
+        _html_cache.clear()
+
+def _process_html(html: str, backend: str) -> ProcessedHtml:
+    """Analyse effective d'un fragment HTML non vide (voir process_html)"""
+    try:
+        text, images = _PARSERS[backend](html)
+    except Exception as e:
+        # Fragment refusé par le moteur rapide: repli sur BeautifulSoup
+        logger.warning(f"Analyse HTML avec {backend} impossible ({str(e)}), utilisation de html.parser")
+        text, images = _parse_beautifulsoup(html)
+    text = _WHITESPACE.sub(" ", text).strip()
+
+    return ProcessedHtml(
+        text=text,
+        image=_pick_image(images),
+        first_image=images[0][0] or None if images else None
+    )
@@ -0,0 +1,187 @@
+import hashlib
+import logging
+from typing import AsyncIterator, Dict, List, Any, Optional
+from pydantic import ValidationError
+from ..db import database
+from ..models.schemas import Article
+from .dedup import link_near_duplicates, mark_near_duplicates
+from .rss_parser import RSSParser
+from .scheduler import next_poll
+from .tag_generator import TagGenerator
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Nombre d'articles lus en flux tagués et sauvegardés ensemble
+INGEST_BATCH_SIZE = 100
+
+def compute_content_hash(article: Dict[str, Any]) -> str:
+    """Calcule l'empreinte du contenu textuel d'un article"""
+    parts = [article.get(field) or "" for field in ("title", "description", "content")]
+    return hashlib.md5("\x1f".join(parts).encode()).hexdigest()
+
+async def filter_changed_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Filtre les articles déjà connus dont le contenu n'a pas changé
+
+    Args:
+        articles: Articles normalisés par le RSSParser
+
+    Returns:
+        Articles nouveaux ou dont le contenu a changé, avec leur empreinte
+    """
+    for article in articles:
+        article["content_hash"] = compute_content_hash(article)
+
+    # Une seule recherche groupée pour tous les identifiants du lot
+    known = await database.get_article_hashes([article["id"] for article in articles])
+
+    return [
+        article for article in articles
+        if article["id"] not in known or known[article["id"]] != article["content_hash"]
+    ]
+
+def validate_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Valide les articles avant leur écriture
+    
+    L'API sert ensuite les articles lus en base sans les revalider. Une image
+    invalide est retirée; un article dont d'autres champs sont invalides est ignoré.
+    
+    Returns:
+        Articles valides
+    """
+    valid = []
+    for article in articles:
+        try:
+            Article(**article)
+        except ValidationError as e:
+            fields = {str(error["loc"][0]) for error in e.errors() if error["loc"]}
+            if fields != {"image_url"}:
+                logger.warning(f"Article {article.get('id')} ignoré, champs invalides: {', '.join(sorted(fields))}")
+                continue
+            article["image_url"] = None
+        valid.append(article)
+    return valid
+
+async def ingest_articles(articles: List[Dict[str, Any]], tag_generator: TagGenerator) -> int:
+    """
+    Génère les tags et sauvegarde les articles nouveaux ou modifiés
+
+    Args:
+        articles: Articles normalisés par le RSSParser
+        tag_generator: Générateur de tags à utiliser
+
+    Returns:
+        Nombre d'articles sauvegardés
+    """
+    changed = await filter_changed_articles(articles)
+    if len(changed) < len(articles):
+        logger.info(f"{len(articles) - len(changed)} articles déjà connus ignorés")
+        # Toujours présents dans leur flux: protégés de la purge (voir database.delete_old_articles)
+        changed_ids = {article["id"] for article in changed}
+        await database.mark_articles_seen([article["id"] for article in articles if article["id"] not in changed_ids])
+    
+    changed = validate_articles(changed)
+
+    # Rattacher les quasi-doublons (même annonce reçue d'une autre source) à leur article canonique
+    await mark_near_duplicates(changed, tag_generator.executor)
+    
+    # Générer en un seul lot les tags des articles qui n'en ont pas, hors quasi-doublons
+    untagged = [article for article in changed if not article.get("tags") and not article.get("canonical_id")]
+    if untagged:
+        for article, tags in zip(untagged, await tag_generator.generate_tags_batch(untagged)):
+            article["tags"] = tags
+    
+    # Les quasi-doublons d'un article du lot reprennent ses tags
+    batch = {article["id"]: article for article in changed}
+    for article in changed:
+        if not article.get("tags") and article.get("canonical_id") in batch:
+            article["tags"] = list(batch[article["canonical_id"]].get("tags") or [])
+
+    # Écriture groupée en une seule transaction, où les quasi-doublons sont revérifiés
+    await database.save_articles(changed, link_duplicates=link_near_duplicates)
+
+    return len(changed)
+
+async def ingest_stream(
+    articles: AsyncIterator[Dict[str, Any]],
+    tag_generator: TagGenerator,
+    batch_size: int = INGEST_BATCH_SIZE
+) -> int:
+    """
+    Tague et sauvegarde par lots de taille fixe des articles produits au fil de l'eau
+    
+    Args:
+        articles: Articles normalisés (voir RSSParser.iter_articles)
+        tag_generator: Générateur de tags à utiliser
+        batch_size: Nombre d'articles par lot
+    
+    Returns:
+        Nombre d'articles sauvegardés
+    """
+    saved_count = 0
+    batch = []
+    async for article in articles:
+        batch.append(article)
+        if len(batch) >= batch_size:
+            saved_count += await ingest_articles(batch, tag_generator)
+            batch = []
+    
+    if batch:
+        saved_count += await ingest_articles(batch, tag_generator)
+    return saved_count
+
+async def refresh_source(source: Dict[str, Any], rss_parser: RSSParser, tag_generator: TagGenerator) -> int:
+    """
+    Récupère, tague et sauvegarde les articles d'une source
+    
+    Args:
+        source: Source telle que retournée par database.get_sources
+        rss_parser: Parser utilisé pour la récupération (requête conditionnelle)
+        tag_generator: Générateur de tags à utiliser
+    
+    Returns:
+        Nombre d'articles sauvegardés
+    
+    Raises:
+        Exception: L'erreur de récupération ou d'ingestion, une fois l'état de la source enregistré
+    
+    La prochaine récupération de la source est planifiée selon le résultat, y compris en cas d'échec.
+    """
+    # Récupérer et parser les articles en flux (requête conditionnelle), par lots de taille fixe.
+    # Flux inchangé: pas de parsing, de tags ni de sauvegarde d'articles
+    cache_state = {field: source.get(field) for field in database.HTTP_CACHE_FIELDS}
+    parsed_at = database.datetime.now().isoformat()
+    saved_count = 0
+    error: Optional[Exception] = None
+    try:
+        saved_count = await ingest_stream(
+            rss_parser.iter_articles(source["name"], source["url"], cache_state=cache_state),
+            tag_generator
+        )
+    except Exception as e:
+        error = e
+    
+    # État du cache HTTP enregistré seulement si tous les articles ont été sauvegardés:
+    # après un échec, la prochaine récupération doit retélécharger et reparser le flux
+    if error is None:
+        if cache_state["content_hash"] != source.get("content_hash"):
+            # Flux parsé: ses articles ont tous été enregistrés ou marqués présents depuis parsed_at
+            source["last_parsed_at"] = parsed_at
+        elif source.get("last_parsed_at"):
+            # Flux inchangé: ses articles sont toujours ceux du dernier parsing
+            await database.mark_source_seen(source["name"], source["last_parsed_at"])
+        source.update(cache_state)
+    
+    # Mettre à jour la date de dernier fetch et planifier le suivant
+    source["last_fetch"] = database.datetime.now().isoformat()
+    source.update(next_poll(source, saved_count, failed=error is not None))
+    await database.save_source(source)
+    
+    # Échec signalé à l'appelant (statut de la tâche) après la planification du nouvel essai
+    if error is not None:
+        raise error
+    
+    return saved_count
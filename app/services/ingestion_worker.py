@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Dict, Any, Optional
+from ..db import database
+from .ingestion import refresh_source
+from .rss_parser import RSSParser
+from .tag_generator import TagGenerator
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Intervalle par défaut de consultation de la file, en secondes
+DEFAULT_POLL_INTERVAL = 5.0
+
+class IngestionWorker:
+    """Worker exécutant les tâches d'ingestion de la file SQLite
+
+    Le worker peut tourner dans le processus du serveur web (tâche asyncio
+    démarrée au lancement de l'application) ou dans un processus séparé
+    (python -m app.worker). Il réserve une tâche à la fois et traite ses
+    sources en parallèle, en enregistrant l'avancement de chacune.
+    """
+    
+    def __init__(
+        self,
+        rss_parser: RSSParser,
+        tag_generator: TagGenerator,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        name: Optional[str] = None
+    ):
+        """
+        Initialise le worker
+        
+        Args:
+            rss_parser: Parser utilisé pour récupérer les flux
+            tag_generator: Générateur de tags à utiliser
+            poll_interval: Délai maximal en secondes entre deux consultations de la file
+            name: Nom du worker enregistré sur les tâches qu'il traite (hôte et pid par défaut)
+        """
+        self.rss_parser = rss_parser
+        self.tag_generator = tag_generator
+        self.poll_interval = poll_interval
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+    
+    def notify(self):
+        """Réveille le worker après la mise en file d'une tâche (même processus)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    def stop(self):
+        """Demande l'arrêt du worker après la tâche en cours"""
+        self._stopping = True
+        self.notify()
+    
+    async def run(self):
+        """Boucle principale: réserve et exécute les tâches jusqu'à l'arrêt"""
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        logger.info(f"Worker d'ingestion {self.name} démarré")
+        
+        last_recovery = 0.0
+        while not self._stopping:
+            try:
+                # Reprendre régulièrement les tâches d'un worker arrêté en cours de route
+                if time.monotonic() - last_recovery >= database.JOB_STALE_AFTER:
+                    await database.requeue_stale_jobs()
+                    last_recovery = time.monotonic()
+                
+                job = await database.claim_job(self.name)
+            except Exception as e:
+                logger.error(f"Erreur lors de la lecture de la file des tâches: {str(e)}")
+                job = None
+            
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            
+            await self.process_job(job)
+        
+        logger.info(f"Worker d'ingestion {self.name} arrêté")
+    
+    async def process_job(self, job: Dict[str, Any]):
+        """Exécute une tâche réservée: rafraîchit ses sources en parallèle"""
+        job_id = job["id"]
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            sources = {source["name"]: source for source in await database.get_sources(active_only=False)}
+            
+            # La concurrence est bornée par le FeedFetcher
+            await asyncio.gather(*(
+                self._process_source(job_id, job_source["name"], sources.get(job_source["name"]))
+                for job_source in job["sources"]
+                if job_source["status"] == database.JOB_QUEUED
+            ))
+            
+            await database.finish_job(job_id, database.JOB_DONE)
+            logger.info(f"Tâche d'ingestion {job_id} terminée")
+        except Exception as e:
+            logger.error(f"Erreur lors de l'exécution de la tâche {job_id}: {str(e)}")
+            await database.finish_job(job_id, database.JOB_FAILED, str(e))
+        finally:
+            heartbeat.cancel()
+    
+    async def _heartbeat(self, job_id: int):
+        """Signale régulièrement que la tâche est toujours en cours d'exécution"""
+        while True:
+            await asyncio.sleep(database.JOB_HEARTBEAT_INTERVAL)
+            try:
+                await database.touch_job(job_id)
+            except Exception as e:
+                logger.warning(f"Impossible de mettre à jour la tâche {job_id}: {str(e)}")
+    
+    async def _process_source(self, job_id: int, name: str, source: Optional[Dict[str, Any]]):
+        """Rafraîchit une source et enregistre son avancement dans la tâche"""
+        if source is None:
+            await database.update_job_source(job_id, name, database.JOB_FAILED, error="Source introuvable")
+            return
+        
+        await database.update_job_source(job_id, name, database.JOB_RUNNING)
+        try:
+            saved_count = await refresh_source(source, self.rss_parser, self.tag_generator)
+            await database.update_job_source(job_id, name, database.JOB_DONE, articles_count=saved_count)
+        except Exception as e:
+            logger.error(f"Erreur lors du rafraîchissement de {name}: {str(e)}")
+            await database.update_job_source(job_id, name, database.JOB_FAILED, error=str(e))
@@ -1,21 +1,52 @@
-import feedparser
+import asyncio
 import hashlib
 import logging
-import re
-from bs4 import BeautifulSoup
+import tempfile
+import xml.etree.ElementTree as ET
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import IO, AsyncIterator, Dict, List, Any, Optional, Tuple
 from dateutil import parser as date_parser
 from ..models.schemas import Article, Tag
+from .executor import TaskExecutor
+from .feed_fetcher import FeedFetcher
+from .feed_stream import FeedStreamParser
+from .html_processor import process_html
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Durée en secondes des périodes de syndication (sy:updatePeriod)
+UPDATE_PERIODS = {
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 604800,
+    "monthly": 2592000,
+    "yearly": 31536000
+}
+
+# Lecture en flux: au-delà de cette taille annoncée (ou si elle est inconnue), le flux
+# est analysé au fil du téléchargement et ses entrées normalisées par lots
+STREAMING_THRESHOLD = 1024 * 1024
+STREAM_BATCH_SIZE = 50
+STREAM_READ_SIZE = 64 * 1024  # Taille des blocs du fichier temporaire transmis au parser en flux
+
+class FeedError(Exception):
+    """Échec de la récupération ou du parsing d'un flux"""
+
 class RSSParser:
     """Classe pour parser et normaliser les flux RSS de différentes sources"""
     
-    def __init__(self):
+    def __init__(self, fetcher: Optional[FeedFetcher] = None, executor: Optional[TaskExecutor] = None):
+        """
+        Initialise le parser
+        
+        Args:
+            fetcher: Moteur de téléchargement partagé (concurrence bornée, délais par flux)
+            executor: Couche d'exécution; le parsing et le nettoyage HTML passent par son pool CPU
+        """
+        self._fetcher = fetcher
+        self.executor = executor
         self.handlers = {
             "aws": self._handle_aws,
             "azure": self._handle_azure,
@@ -24,39 +55,303 @@ class RSSParser:
             "default": self._handle_default
         }
     
-    async def fetch_and_parse(self, source_name: str, source_url: str) -> List[Dict[str, Any]]:
-        """Récupère et parse un flux RSS"""
+    @property
+    def fetcher(self) -> FeedFetcher:
+        """Moteur de téléchargement, créé au premier usage"""
+        if self._fetcher is None:
+            self._fetcher = FeedFetcher(executor=self.executor)
+        return self._fetcher
+    
+    async def fetch_and_parse(
+        self,
+        source_name: str,
+        source_url: str,
+        cache_state: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Récupère et parse un flux RSS
+        
+        Args:
+            source_name: Nom de la source
+            source_url: URL du flux
+            cache_state: État du cache HTTP de la source (etag, last_modified, content_hash).
+                Si fourni, une requête conditionnelle est envoyée et le dictionnaire est
+                mis à jour avec les nouvelles valeurs, ainsi que poll_hint (intervalle de
+                mise à jour annoncé par le flux) après un parsing.
+        
+        Returns:
+            Liste des articles, ou None si le flux n'a pas changé depuis la dernière récupération
+        """
         try:
-            # Utiliser feedparser pour récupérer le flux
-            feed = feedparser.parse(source_url)
+            # Télécharger le flux hors de la boucle d'événements (requête conditionnelle si l'état du cache est connu)
+            response = await self.fetcher.fetch(source_url, headers=self._conditional_headers(cache_state))
             
-            if hasattr(feed, 'bozo_exception'):
-                logger.error(f"Erreur lors du parsing de {source_name}: {feed.bozo_exception}")
-                return []
+            if response["status"] == 304:
+                logger.info(f"Flux inchangé pour {source_name} (304)")
+                return None
             
-            if not feed.entries:
-                logger.warning(f"Aucune entrée trouvée pour {source_name}")
+            if response["status"] >= 400:
+                logger.error(f"Erreur HTTP {response['status']} lors de la récupération de {source_name}")
                 return []
             
-            # Déterminer quel handler utiliser
-            handler = self.handlers.get(source_name.lower(), self.handlers["default"])
-            
-            # Parser les entrées
-            articles = []
-            for entry in feed.entries:
-                try:
-                    article = handler(entry, source_name)
-                    if article:
-                        articles.append(article)
-                except Exception as e:
-                    logger.error(f"Erreur lors du parsing de l'entrée {entry.get('title', 'Unknown')}: {str(e)}")
-            
-            return articles
+            return await self._parse_downloaded(source_name, response, cache_state)
         
+        except asyncio.TimeoutError:
+            logger.error(f"Délai dépassé lors de la récupération du flux {source_name}")
+            return []
         except Exception as e:
             logger.error(f"Erreur lors de la récupération du flux {source_name}: {str(e)}")
             return []
     
+    async def iter_articles(
+        self,
+        source_name: str,
+        source_url: str,
+        cache_state: Optional[Dict[str, Any]] = None,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Récupère un flux et produit ses articles au fur et à mesure
+        
+        Le flux est d'abord téléchargé dans un fichier temporaire (en mémoire
+        jusqu'à STREAMING_THRESHOLD octets, sur disque au-delà) et son empreinte
+        comparée à celle de la dernière récupération: un flux inchangé ne produit
+        aucun article. La connexion et les places de concurrence sont libérées
+        avant le parsing. Les flux de plus de STREAMING_THRESHOLD octets (ou de
+        taille inconnue) sont ensuite analysés par blocs hors de la boucle
+        d'événements et leurs entrées normalisées par lots de batch_size, sans
+        jamais conserver le flux complet en mémoire. Les autres suivent le même
+        chemin que fetch_and_parse.
+        
+        Args:
+            source_name: Nom de la source
+            source_url: URL du flux
+            cache_state: État du cache HTTP de la source, mis à jour une fois le flux entièrement lu
+            batch_size: Nombre d'entrées normalisées ensemble
+        
+        Yields:
+            Articles normalisés (aucun si le flux n'a pas changé)
+        
+        Raises:
+            FeedError: Si le flux ne peut pas être récupéré ou parsé
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=STREAMING_THRESHOLD)
+        try:
+            async with self.fetcher.stream(source_url, headers=self._conditional_headers(cache_state)) as response:
+                if response["status"] == 304:
+                    logger.info(f"Flux inchangé pour {source_name} (304)")
+                    return
+                
+                if response["status"] >= 400:
+                    raise FeedError(f"Erreur HTTP {response['status']} lors de la récupération de {source_name}")
+                
+                length = response["headers"].get("content-length", "")
+                streaming = not (length.isdigit() and int(length) <= STREAMING_THRESHOLD)
+                
+                digest = hashlib.sha256()
+                async for chunk in response["chunks"]:
+                    digest.update(chunk)
+                    await self._run_io(spool.write, chunk)
+                response = {key: value for key, value in response.items() if key != "chunks"}
+            
+            # Contenu identique à la dernière récupération: inutile de le parser
+            content_hash = digest.hexdigest()
+            if cache_state is not None and cache_state.get("content_hash") == content_hash:
+                logger.info(f"Contenu inchangé pour {source_name}")
+                self._update_cache_state(cache_state, response, content_hash)
+                return
+            
+            await self._run_io(spool.seek, 0)
+            
+            if streaming:
+                parser = FeedStreamParser()
+                pending: List[Dict[str, Any]] = []
+                done = False
+                
+                while not done:
+                    try:
+                        entries, done = await self._run_io(feed_next_chunk, parser, spool)
+                    except ET.ParseError as e:
+                        if parser.entry_count:
+                            raise FeedError(f"Flux mal formé pour {source_name}: {str(e)}")
+                        break
+                    
+                    pending.extend(entries)
+                    while len(pending) >= batch_size:
+                        batch, pending = pending[:batch_size], pending[batch_size:]
+                        for article in await self._normalize(source_name, batch):
+                            yield article
+                
+                if done and parser.entry_count:
+                    for article in await self._normalize(source_name, pending):
+                        yield article
+                    
+                    # Mémoriser l'état du cache uniquement après la lecture complète du flux
+                    if cache_state is not None:
+                        self._update_cache_state(cache_state, response, content_hash)
+                        cache_state["poll_hint"] = self._poll_hint(parser.channel)
+                    
+                    logger.info(f"{parser.entry_count} entrées lues en flux pour {source_name}")
+                    return
+                
+                # Aucune entrée reconnue ou XML non strict: format laissé à feedparser
+                logger.warning(f"Lecture en flux impossible pour {source_name}, parsing complet par feedparser")
+                await self._run_io(spool.seek, 0)
+            
+            content = await self._run_io(spool.read)
+            articles = await self._parse_downloaded(source_name, dict(response, content=content), cache_state)
+            if articles == []:
+                raise FeedError(f"Flux invalide ou vide pour {source_name}")
+            for article in articles or []:
+                yield article
+        finally:
+            spool.close()
+    
+    async def _run_io(self, func, *args) -> Any:
+        """Exécute une opération bloquante (fichier temporaire, parsing en flux) hors de la boucle d'événements"""
+        if self.executor is not None:
+            return await self.executor.run_io(func, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+    
+    def _conditional_headers(self, cache_state: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """En-têtes de requête conditionnelle à partir de l'état du cache HTTP"""
+        headers = {}
+        if cache_state is not None:
+            if cache_state.get("etag"):
+                headers["If-None-Match"] = cache_state["etag"]
+            if cache_state.get("last_modified"):
+                headers["If-Modified-Since"] = cache_state["last_modified"]
+        return headers
+    
+    async def _parse_downloaded(
+        self,
+        source_name: str,
+        response: Dict[str, Any],
+        cache_state: Optional[Dict[str, Any]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Parse un flux téléchargé: None si son contenu n'a pas changé, liste vide s'il est invalide"""
+        # Contenu identique à la dernière récupération: inutile de le parser
+        content_hash = hashlib.sha256(response["content"]).hexdigest()
+        if cache_state is not None and cache_state.get("content_hash") == content_hash:
+            logger.info(f"Contenu inchangé pour {source_name}")
+            self._update_cache_state(cache_state, response, content_hash)
+            return None
+        
+        # Parser le contenu et nettoyer le HTML hors de la boucle d'événements
+        if self.executor is not None:
+            parsed = await self.executor.run_cpu(
+                parse_feed_content, source_name, response["content"], response["headers"]
+            )
+        else:
+            loop = asyncio.get_running_loop()
+            parsed = await loop.run_in_executor(
+                None, self.parse_feed, source_name, response["content"], response["headers"]
+            )
+        
+        if parsed is None:
+            return []
+        
+        # Mémoriser l'état du cache uniquement après un parsing réussi
+        if cache_state is not None:
+            self._update_cache_state(cache_state, response, content_hash)
+            cache_state["poll_hint"] = parsed["poll_hint"]
+        
+        return parsed["articles"]
+    
+    async def _normalize(self, source_name: str, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Normalise un lot d'entrées lues en flux hors de la boucle d'événements"""
+        if not entries:
+            return []
+        if self.executor is not None:
+            return await self.executor.run_cpu(normalize_feed_entries, source_name, entries)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.normalize_entries, source_name, entries)
+    
+    def normalize_entries(self, source_name: str, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Normalise des entrées lues en flux (dictionnaires aux clés de feedparser, travail CPU bloquant)"""
+        from feedparser import FeedParserDict
+        
+        def to_feedparser(value):
+            if isinstance(value, dict):
+                return FeedParserDict({key: to_feedparser(item) for key, item in value.items()})
+            if isinstance(value, list):
+                return [to_feedparser(item) for item in value]
+            return value
+        
+        return self._normalize_entries(source_name, [to_feedparser(entry) for entry in entries])
+    
+    def parse_content(self, source_name: str, content: bytes, headers: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Parse le contenu brut d'un flux et normalise ses entrées (travail CPU bloquant)
+        
+        Returns:
+            Liste des articles, ou None si le flux est invalide ou vide
+        """
+        parsed = self.parse_feed(source_name, content, headers)
+        return parsed["articles"] if parsed is not None else None
+    
+    def parse_feed(self, source_name: str, content: bytes, headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Parse le contenu brut d'un flux: articles normalisés et fréquence de mise à jour annoncée
+        
+        Returns:
+            Dictionnaire avec articles et poll_hint (intervalle annoncé par le flux en
+            secondes, ou None), ou None si le flux est invalide ou vide
+        """
+        # Importé au premier parsing: feedparser reste hors du chemin d'import du serveur web
+        import feedparser
+        
+        feed = feedparser.parse(content, response_headers=headers)
+        
+        if hasattr(feed, 'bozo_exception'):
+            logger.error(f"Erreur lors du parsing de {source_name}: {feed.bozo_exception}")
+            return None
+        
+        if not feed.entries:
+            logger.warning(f"Aucune entrée trouvée pour {source_name}")
+            return None
+        
+        return {"articles": self._normalize_entries(source_name, feed.entries), "poll_hint": self._poll_hint(feed.feed)}
+    
+    def _normalize_entries(self, source_name: str, entries: List[Any]) -> List[Dict[str, Any]]:
+        """Applique le handler de la source à chaque entrée"""
+        # Déterminer quel handler utiliser
+        handler = self.handlers.get(source_name.lower(), self.handlers["default"])
+        
+        # Parser les entrées
+        articles = []
+        for entry in entries:
+            try:
+                article = handler(entry, source_name)
+                if article:
+                    articles.append(article)
+            except Exception as e:
+                logger.error(f"Erreur lors du parsing de l'entrée {entry.get('title', 'Unknown')}: {str(e)}")
+        
+        return articles
+    
+    def _poll_hint(self, channel: Dict[str, Any]) -> Optional[int]:
+        """Intervalle de mise à jour annoncé par le flux (ttl en minutes, ou sy:updatePeriod/updateFrequency)"""
+        try:
+            if channel.get("ttl"):
+                return int(channel["ttl"]) * 60
+            
+            period = UPDATE_PERIODS.get(str(channel.get("sy_updateperiod", "")).strip().lower())
+            if period:
+                frequency = max(1, int(channel.get("sy_updatefrequency") or 1))
+                return period // frequency
+        except (TypeError, ValueError):
+            logger.warning(f"Fréquence de mise à jour invalide: {channel.get('ttl') or channel.get('sy_updateperiod')}")
+        
+        return None
+    
+    def _update_cache_state(self, cache_state: Dict[str, Any], response: Dict[str, Any], content_hash: str):
+        """Met à jour l'état du cache HTTP d'une source à partir d'une réponse"""
+        cache_state["etag"] = response["headers"].get("etag")
+        cache_state["last_modified"] = response["headers"].get("last-modified")
+        cache_state["content_hash"] = content_hash
+    
     def _handle_default(self, entry: Dict[str, Any], source_name: str) -> Dict[str, Any]:
         """Handler par défaut pour les flux RSS standards"""
         # Générer un ID unique
@@ -71,11 +366,9 @@ class RSSParser:
         
         # Récupérer le contenu complet si disponible
         content = None
-        if 'content' in entry and entry.content:
-            for content_item in entry.content:
-                if content_item.get('type') == 'text/html':
-                    content = self._clean_html(content_item.value)
-                    break
+        content_html = self._content_html(entry)
+        if content_html is not None:
+            content = self._clean_html(content_html)
         
         # Récupérer les tags/catégories si disponibles
         tags = []
@@ -138,25 +431,18 @@ class RSSParser:
         
         return article
     
+    def _content_html(self, entry: Dict[str, Any]) -> Optional[str]:
+        """Contenu HTML complet de l'entrée, s'il est disponible"""
+        if 'content' in entry and entry.content:
+            for content_item in entry.content:
+                if content_item.get('type') == 'text/html':
+                    return content_item.value
+        return None
+    
     def _clean_html(self, html_content: str) -> str:
         """Nettoie le HTML pour extraire le texte"""
-        if not html_content:
-            return ""
-        
-        # Utiliser BeautifulSoup pour nettoyer le HTML
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Supprimer les scripts et styles
-        for script in soup(["script", "style"]):
-            script.extract()
-        
-        # Récupérer le texte
-        text = soup.get_text(separator=' ', strip=True)
-        
-        # Nettoyer les espaces
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        # Chaque fragment n'est analysé qu'une fois: texte et images sont extraits ensemble
+        return process_html(html_content).text
     
     def _parse_date(self, date_str: str) -> str:
         """Parse une date depuis différents formats possibles"""
@@ -183,30 +469,14 @@ class RSSParser:
                 if 'type' in enclosure and enclosure['type'].startswith('image/'):
                     return enclosure.get('href', enclosure.get('url'))
         
-        # Chercher dans le contenu HTML
-        content_html = entry.get('description', '')
-        if 'content' in entry and entry.content:
-            for content_item in entry.content:
-                if content_item.get('type') == 'text/html':
-                    content_html = content_item.value
-                    break
-        
-        if content_html:
-            soup = BeautifulSoup(content_html, 'html.parser')
-            # Chercher d'abord les grandes images
-            for img in soup.find_all('img'):
-                src = img.get('src')
-                # Vérifier si c'est une image "substantielle" (pas une icône)
-                width = img.get('width')
-                height = img.get('height')
-                if src and ((width and int(width) > 150) or (height and int(height) > 150) or 
-                           ('width' not in img.attrs and 'height' not in img.attrs)):
-                    return src
-            
-            # Si pas de grande image trouvée, prendre la première
-            img = soup.find('img')
-            if img and img.get('src'):
-                return img['src']
+        # Chercher dans le contenu HTML (fragment déjà analysé pour en extraire le texte)
+        content_html = self._content_html(entry)
+        if content_html is None:
+            content_html = entry.get('description', '')
+        
+        image_url = process_html(content_html).image if content_html else None
+        if image_url:
+            return image_url
         
         # Essayer les attributs spécifiques
         image_url = None
@@ -223,11 +493,41 @@ class RSSParser:
                 if link.get('type', '').startswith('image/'):
                     return link.get('href')
         
-        # Essayer d'examiner un éventuel résumé
+        # Essayer d'examiner un éventuel résumé (souvent identique à la description, déjà analysée):
+        # sa première image, comme avant le traitement en une passe
         if hasattr(entry, 'summary') and entry.summary:
-            soup = BeautifulSoup(entry.summary, 'html.parser')
-            img = soup.find('img')
-            if img and img.get('src'):
-                return img['src']
+            return process_html(entry.summary).first_image
         
-        return None 
\ No newline at end of file
+        return None
+
+# Parser propre à chaque processus du pool CPU
+_worker_parser: Optional[RSSParser] = None
+
+def parse_feed_content(source_name: str, content: bytes, headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Parse un flux téléchargé dans un processus du pool CPU (voir RSSParser.parse_feed)"""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = RSSParser()
+    return _worker_parser.parse_feed(source_name, content, headers)
+
+def normalize_feed_entries(source_name: str, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Normalise des entrées lues en flux dans un processus du pool CPU (voir RSSParser.normalize_entries)"""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = RSSParser()
+    return _worker_parser.normalize_entries(source_name, entries)
+
+def feed_next_chunk(parser: FeedStreamParser, spool: IO[bytes]) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Transmet le bloc suivant d'un flux téléchargé au parser en flux (travail bloquant)
+    
+    Returns:
+        Entrées complètes lues et indicateur de fin du flux
+    
+    Raises:
+        ET.ParseError: Si le flux n'est pas du XML bien formé
+    """
+    chunk = spool.read(STREAM_READ_SIZE)
+    if not chunk:
+        return parser.close(), True
+    return parser.feed(chunk), False
@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Any, Callable, Optional
+from ..db import database
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Intervalles de récupération des sources, en secondes
+DEFAULT_POLL_INTERVAL = 30 * 60
+MIN_POLL_INTERVAL = 5 * 60
+MAX_POLL_INTERVAL = 12 * 3600
+MAX_FAILURE_BACKOFF = 24 * 3600
+
+# Ajustement de l'intervalle après chaque récupération
+POLL_SPEEDUP = 0.5  # Nouveaux articles: l'intervalle est divisé par deux
+POLL_SLOWDOWN = 1.5  # Aucun nouvel article: l'intervalle augmente de moitié
+POLL_JITTER = 0.1  # Variation aléatoire de ±10% pour étaler les récupérations
+
+# Premières récupérations (sources jamais planifiées) étalées sur cette durée, en secondes
+FIRST_POLL_SPREAD = MIN_POLL_INTERVAL
+
+# Délai maximal entre deux consultations des sources à récupérer, en secondes
+SCHEDULER_MAX_SLEEP = 60
+
+def next_poll(
+    source: Dict[str, Any],
+    new_articles: int,
+    failed: bool,
+    now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Calcule la prochaine récupération d'une source à partir du résultat de la dernière
+
+    L'intervalle raccourcit quand la source publie de nouveaux articles et s'allonge
+    sinon, sans descendre sous l'intervalle annoncé par le flux (ttl, sy:updatePeriod).
+    En cas d'échec, l'intervalle appris est conservé et la prochaine tentative est
+    retardée exponentiellement.
+
+    Args:
+        source: Source avec son état de planification (poll_interval, failure_count, poll_hint)
+        new_articles: Nombre d'articles nouveaux ou modifiés lors de la récupération
+        failed: Indique si la récupération a échoué
+        now: Date de référence (maintenant par défaut)
+
+    Returns:
+        Champs poll_interval, failure_count et next_poll_at à enregistrer sur la source
+    """
+    now = now or datetime.now()
+    interval = source.get("poll_interval") or DEFAULT_POLL_INTERVAL
+
+    if failed:
+        failure_count = (source.get("failure_count") or 0) + 1
+        delay = min(interval * 2 ** failure_count, MAX_FAILURE_BACKOFF)
+    else:
+        failure_count = 0
+        interval *= POLL_SPEEDUP if new_articles else POLL_SLOWDOWN
+
+        # Ne pas interroger le flux plus souvent qu'il ne l'annonce
+        floor = max(MIN_POLL_INTERVAL, min(source.get("poll_hint") or 0, MAX_POLL_INTERVAL))
+        interval = min(max(interval, floor), MAX_POLL_INTERVAL)
+        delay = interval
+
+    delay *= random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+    return {
+        "poll_interval": int(interval),
+        "failure_count": failure_count,
+        "next_poll_at": (now + timedelta(seconds=delay)).isoformat()
+    }
+
+def first_poll(name: str, now: Optional[datetime] = None) -> str:
+    """
+    Date de la première récupération d'une source jamais planifiée
+
+    Le décalage, compris entre 0 et FIRST_POLL_SPREAD, dépend uniquement du nom
+    de la source: au démarrage, les sources ne sont pas toutes récupérées en
+    même temps, et chaque source garde le même décalage d'un démarrage à l'autre.
+    """
+    now = now or datetime.now()
+    position = int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], "big") / 2 ** 64
+    return (now + timedelta(seconds=position * FIRST_POLL_SPREAD)).isoformat()
+
+class FeedScheduler:
+    """Planificateur de la récupération des sources
+
+    Met en file (voir database.enqueue_refresh_job) les sources dont la prochaine
+    récupération est échue, puis dort jusqu'à la prochaine échéance. Chaque réveil
+    coûte une requête indexée: le coût dépend du nombre de récupérations à faire,
+    pas du nombre de sources.
+    """
+
+    def __init__(self, on_enqueue: Optional[Callable[[], None]] = None, max_sleep: float = SCHEDULER_MAX_SLEEP):
+        """
+        Initialise le planificateur
+
+        Args:
+            on_enqueue: Fonction appelée après la mise en file d'une tâche (réveil du worker)
+            max_sleep: Délai maximal en secondes entre deux consultations des sources
+        """
+        self.on_enqueue = on_enqueue
+        self.max_sleep = max_sleep
+        self._stopping = False
+
+    def stop(self):
+        """Demande l'arrêt du planificateur"""
+        self._stopping = True
+
+    async def run_once(self) -> float:
+        """Met en file les sources échues, retourne le délai en secondes avant la prochaine échéance"""
+        now = datetime.now()
+
+        # Sources nouvelles ou jamais récupérées: premières récupérations étalées
+        unscheduled = await database.get_unscheduled_sources()
+        if unscheduled:
+            await database.schedule_first_polls({name: first_poll(name, now) for name in unscheduled})
+
+        due = await database.get_due_sources(now.isoformat())
+        if due:
+            job = await database.enqueue_refresh_job(due)
+            logger.info(f"{len(due)} sources à récupérer (tâche {job['job_id']})")
+            if self.on_enqueue:
+                self.on_enqueue()
+
+        # Les sources échues déjà en file sont ignorées: leur prochaine échéance sera fixée après récupération
+        next_poll_at = await database.get_next_poll_at(now.isoformat())
+        if next_poll_at is None:
+            return self.max_sleep
+        return (datetime.fromisoformat(next_poll_at) - now).total_seconds()
+
+    async def run(self):
+        """Boucle principale du planificateur"""
+        self._stopping = False
+        logger.info("Planificateur des sources démarré")
+
+        while not self._stopping:
+            try:
+                delay = await self.run_once()
+            except Exception as e:
+                logger.error(f"Erreur lors de la planification des sources: {str(e)}")
+                delay = self.max_sleep
+
+            await asyncio.sleep(min(max(delay, 1.0), self.max_sleep))
@@ -0,0 +1,146 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Emplacement et taille par défaut du cache des tags
+DEFAULT_TAG_CACHE_PATH = "data/tag_cache.db"
+DEFAULT_TAG_CACHE_SIZE = 100000
+
+class TagCache:
+    """Cache persistant des tags générés, par empreinte du texte de l'article
+
+    Les clés sont calculées par le TagGenerator à partir du titre, du contenu et
+    de la version du générateur. La version est aussi enregistrée dans la base:
+    si la taxonomie ou les modèles changent, le cache est vidé à l'ouverture.
+    Au-delà de max_entries, les entrées les moins récemment utilisées sont
+    supprimées.
+    """
+
+    def __init__(self, path: str = DEFAULT_TAG_CACHE_PATH, version: str = "", max_entries: int = DEFAULT_TAG_CACHE_SIZE):
+        """
+        Initialise le cache
+
+        Args:
+            path: Chemin du fichier SQLite du cache
+            version: Version du générateur de tags (taxonomie et modèles chargés)
+            max_entries: Nombre maximal d'entrées conservées
+        """
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Ouvre la base au premier usage et l'invalide si la version a changé"""
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("""
+            CREATE TABLE IF NOT EXISTS tag_cache (
+                key TEXT PRIMARY KEY,
+                tags TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS idx_tag_cache_last_used ON tag_cache(last_used)")
+            db.execute("CREATE TABLE IF NOT EXISTS tag_cache_meta (name TEXT PRIMARY KEY, value TEXT)")
+
+            row = db.execute("SELECT value FROM tag_cache_meta WHERE name = 'version'").fetchone()
+            if row is None or row[0] != self.version:
+                if row is not None:
+                    logger.info("Taxonomie ou modèles modifiés: cache des tags invalidé")
+                db.execute("DELETE FROM tag_cache")
+                db.execute("INSERT OR REPLACE INTO tag_cache_meta VALUES ('version', ?)", (self.version,))
+            db.commit()
+            self._db = db
+        return self._db
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Récupère les tags connus
+
+        Args:
+            keys: Clés calculées par le TagGenerator
+
+        Returns:
+            Clé -> tags, pour les clés présentes dans le cache
+        """
+        if not keys:
+            return {}
+
+        unique_keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            db = self._connection()
+            for start in range(0, len(unique_keys), 500):
+                batch = unique_keys[start:start + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                query = f"SELECT key, tags FROM tag_cache WHERE key IN ({placeholders})"
+                for key, tags in db.execute(query, batch):
+                    found[key] = json.loads(tags)
+
+            if found:
+                now = time.time()
+                db.executemany("UPDATE tag_cache SET last_used = ? WHERE key = ?", [(now, key) for key in found])
+                db.commit()
+
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, entries: Dict[str, List[Dict[str, Any]]]):
+        """Enregistre des tags et supprime les entrées les plus anciennes au-delà de la taille maximale"""
+        if not entries:
+            return
+
+        now = time.time()
+        rows = [(key, json.dumps(tags), now) for key, tags in entries.items()]
+        with self._lock:
+            db = self._connection()
+            db.executemany("INSERT OR REPLACE INTO tag_cache VALUES (?, ?, ?)", rows)
+
+            excess = db.execute("SELECT COUNT(*) FROM tag_cache").fetchone()[0] - self.max_entries
+            if excess > 0:
+                db.execute(
+                    "DELETE FROM tag_cache WHERE key IN (SELECT key FROM tag_cache ORDER BY last_used LIMIT ?)",
+                    (excess,)
+                )
+                self.evictions += excess
+            db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les compteurs du cache"""
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM tag_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
+    def close(self):
+        """Ferme la base"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -1,79 +1,89 @@
+import asyncio
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
 import logging
+import os
 import re
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 import string
-from collections import Counter
+from collections import Counter, OrderedDict
 
-# Importations conditionnelles
-try:
-    from keybert import KeyBERT
-    KEYBERT_AVAILABLE = True
-except ImportError:
-    KEYBERT_AVAILABLE = False
+# Modèles optionnels: seule leur présence est vérifiée ici, ils sont importés
+# et chargés au premier usage pour garder un démarrage rapide du serveur web
+KEYBERT_AVAILABLE = importlib.util.find_spec("keybert") is not None
+SPACY_AVAILABLE = importlib.util.find_spec("spacy") is not None
 
-try:
-    import spacy
-    SPACY_AVAILABLE = True
-except ImportError:
-    SPACY_AVAILABLE = False
+from .executor import TaskExecutor
+from .embedding_store import EmbeddingStore, DEFAULT_EMBEDDINGS_PATH
+from .tag_cache import TagCache, DEFAULT_TAG_CACHE_PATH
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Taxonomie par défaut des mots-clés techniques
+DEFAULT_KEYWORDS_PATH = os.path.join(os.path.dirname(__file__), "tech_keywords.json")
+
+# Extraction d'entités: seuls ces composants spaCy sont utiles à la NER
+SPACY_MODEL = "en_core_web_sm"
+NER_PIPES = ("tok2vec", "ner")
+NER_BATCH_SIZE = 32
+ENTITY_LABELS = {"ORG", "PRODUCT", "GPE", "PERSON", "WORK_OF_ART", "EVENT"}
+
+# Version de l'algorithme de génération des tags (à incrémenter s'il change)
+TAGGER_VERSION = 1
+
+# Extraction de mots-clés KeyBERT
+KEYBERT_MODEL = "all-MiniLM-L6-v2"
+KEYBERT_NGRAM_RANGE = (1, 2)
+KEYBERT_TOP_N = 5
+KEYBERT_MAX_CHARS = 5000
+CANDIDATE_CACHE_SIZE = 50000  # Embeddings de phrases candidates gardés en mémoire
+
+def _package_version(name: str) -> Optional[str]:
+    """Version d'un paquet installé, sans l'importer"""
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
 class TagGenerator:
     """Classe pour générer des tags à partir du contenu des articles"""
     
-    def __init__(self):
-        # Liste de mots-clés techniques à rechercher
-        self.tech_keywords = {
-            # Cloud providers
-            "aws": ["aws", "amazon web services", "ec2", "s3", "dynamodb", "lambda", "cloudfront"],
-            "azure": ["azure", "microsoft azure", "azure functions", "cosmos db", "blob storage"],
-            "gcp": ["gcp", "google cloud", "google cloud platform", "bigquery", "cloud storage"],
-            
-            # Technologies
-            "kubernetes": ["kubernetes", "k8s", "container orchestration", "kubectl"],
-            "docker": ["docker", "container", "containerization"],
-            "terraform": ["terraform", "infrastructure as code", "iac"],
-            "serverless": ["serverless", "faas", "function as a service"],
-            
-            # IA/ML
-            "ai": ["artificial intelligence", "ai", "machine learning", "ml"],
-            "llm": ["llm", "large language model", "language model", "gpt", "bert"],
-            "ml": ["machine learning", "deep learning", "neural network"],
-            
-            # Cybersécurité
-            "security": ["security", "cybersecurity", "cyber security", "infosec", "vulnerability", "exploit", "cve"],
-            "encryption": ["encryption", "cryptography", "crypto"],
-            "zero_trust": ["zero trust", "zero-trust"],
-            
-            # DevOps
-            "devops": ["devops", "ci/cd", "continuous integration", "continuous deployment"],
-            "gitops": ["gitops", "git-based operations"],
-            
-            # Data
-            "big_data": ["big data", "data lake", "data warehouse"],
-            "analytics": ["analytics", "business intelligence", "bi"],
-            
-            # Développement
-            "backend": ["backend", "api", "rest api", "graphql"],
-            "frontend": ["frontend", "spa", "single page application", "react", "vue", "angular"],
-            "microservices": ["microservices", "service mesh", "api gateway"],
-            
-            # Ajouts de nouveaux domaines
-            "blockchain": ["blockchain", "ethereum", "bitcoin", "crypto", "web3", "dapp", "nft"],
-            "iot": ["iot", "internet of things", "connected devices", "smart home"],
-            "mobile": ["mobile", "android", "ios", "swift", "kotlin", "react native", "flutter"],
-            "automation": ["automation", "rpa", "robotic process automation"],
-            "java": ["java", "spring", "spring boot", "hibernate", "jvm"],
-            "python": ["python", "django", "flask", "fastapi", "numpy", "pandas"],
-            "javascript": ["javascript", "typescript", "node.js", "nodejs", "npm", "react", "angular", "vue"],
-            "devops_tools": ["jenkins", "gitlab", "github actions", "circleci", "travis", "ansible", "puppet", "chef"],
-            "databases": ["database", "sql", "nosql", "postgresql", "mysql", "mongodb", "cassandra", "redis"],
-            "cloud_native": ["cloud native", "cncf", "istio", "envoy", "prometheus", "grafana"],
-            "networking": ["networking", "cdn", "dns", "load balancing", "firewall", "vpn", "proxy"]
-        }
+    def __init__(
+        self,
+        keywords_path: Optional[str] = None,
+        batch_size: int = NER_BATCH_SIZE,
+        n_process: int = 1,
+        executor: Optional[TaskExecutor] = None,
+        embeddings_path: Optional[str] = DEFAULT_EMBEDDINGS_PATH,
+        cache_path: Optional[str] = DEFAULT_TAG_CACHE_PATH
+    ):
+        """
+        Initialise le générateur de tags
+        
+        Args:
+            keywords_path: Fichier JSON de la taxonomie des mots-clés (tech_keywords.json par défaut)
+            batch_size: Nombre de documents envoyés ensemble à spaCy par generate_tags_batch
+            n_process: Nombre de processus spaCy utilisés pour les gros lots (1 = processus courant)
+            executor: Couche d'exécution; la génération des tags passe alors par son pool CPU
+            embeddings_path: Fichier de stockage des embeddings de documents (None pour ne pas les conserver)
+            cache_path: Fichier du cache des tags générés (None pour désactiver le cache)
+        """
+        self.keywords_path = keywords_path or DEFAULT_KEYWORDS_PATH
+        self.batch_size = batch_size
+        self.n_process = max(1, n_process)
+        self.executor = executor
+        self.embeddings_path = embeddings_path
+        
+        # Taxonomie des mots-clés techniques: tag -> synonymes, par ordre de priorité
+        self.tech_keywords = self._load_keywords(self.keywords_path)
+        
+        # Automate de correspondance construit une seule fois pour toute la taxonomie
+        self._keyword_pattern, self._keyword_prefixes = self._build_keyword_matcher(self.tech_keywords)
         
         # Liste des mots vides à ignorer
         self.stopwords = set([
@@ -89,95 +99,356 @@ class TagGenerator:
             "your", "yours", "yourself", "yourselves"
         ])
         
-        # Modèles d'IA conditionnels
+        # Modèles d'IA conditionnels, chargés au premier usage (voir load_models)
         self.nlp = None
         self.keyword_model = None
+        self._models_lock = threading.Lock()
+        self._models_loaded = False
+        self._model_status = {
+            "spacy": "not_loaded" if SPACY_AVAILABLE else "unavailable",
+            "keybert": "not_loaded" if KEYBERT_AVAILABLE else "unavailable"
+        }
+        # État des modèles rapporté par le dernier lot tagué dans le pool CPU
+        self._worker_model_status: Optional[Dict[str, str]] = None
         
-        if SPACY_AVAILABLE:
-            try:
-                # Charger NLP pour l'extraction d'entités
-                self.nlp = spacy.load("en_core_web_sm")
-                logger.info("Modèle SpaCy chargé avec succès")
-            except Exception as e:
-                logger.warning(f"Impossible de charger spaCy: {str(e)}")
+        # Caches de KeyBERT: embeddings des phrases candidates (LRU) et des documents (disque)
+        self._candidate_cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._embedding_store = None
         
-        if KEYBERT_AVAILABLE:
-            try:
-                # Initialiser KeyBERT pour l'extraction de mots-clés
-                self.keyword_model = KeyBERT()
-                logger.info("Modèle KeyBERT chargé avec succès")
-            except Exception as e:
-                logger.warning(f"Impossible de charger KeyBERT: {str(e)}")
+        # Cache des tags, invalidé dès que la taxonomie ou les modèles installés changent
+        self.version = self._compute_version()
+        self.cache = TagCache(cache_path, version=self.version) if cache_path else None
+    
+    def load_models(self):
+        """
+        Charge les modèles spaCy et KeyBERT s'ils ne le sont pas encore
+        
+        Appelé automatiquement avant la première génération de tags; l'import des
+        bibliothèques et le chargement des modèles ne sont payés que par le
+        processus qui tague réellement des articles.
+        """
+        if self._models_loaded:
+            return
+        
+        with self._models_lock:
+            if self._models_loaded:
+                return
+            
+            if SPACY_AVAILABLE:
+                self._model_status["spacy"] = "loading"
+                try:
+                    import spacy
+                    # Charger NLP pour l'extraction d'entités
+                    self.nlp = spacy.load(SPACY_MODEL)
+                    # Désactiver les composants inutiles à la NER (tagger, parser, lemmatizer...)
+                    self.nlp.select_pipes(enable=[pipe for pipe in NER_PIPES if pipe in self.nlp.pipe_names])
+                    self._model_status["spacy"] = "loaded"
+                    logger.info("Modèle SpaCy chargé avec succès")
+                except Exception as e:
+                    self._model_status["spacy"] = "error"
+                    logger.warning(f"Impossible de charger spaCy: {str(e)}")
+            
+            if KEYBERT_AVAILABLE:
+                self._model_status["keybert"] = "loading"
+                try:
+                    from keybert import KeyBERT
+                    # Initialiser KeyBERT pour l'extraction de mots-clés
+                    self.keyword_model = KeyBERT(model=KEYBERT_MODEL)
+                    if self.embeddings_path:
+                        self._embedding_store = EmbeddingStore(self.embeddings_path)
+                    self._model_status["keybert"] = "loaded"
+                    logger.info("Modèle KeyBERT chargé avec succès")
+                except Exception as e:
+                    self._model_status["keybert"] = "error"
+                    logger.warning(f"Impossible de charger KeyBERT: {str(e)}")
+            
+            self._models_loaded = True
+    
+    def model_status(self) -> Dict[str, str]:
+        """État de chaque modèle dans ce processus: unavailable, not_loaded, loading, loaded ou error"""
+        return dict(self._model_status)
+    
+    def tagging_model_status(self) -> Dict[str, str]:
+        """
+        État des modèles là où les tags sont générés
+        
+        Lorsque la couche d'exécution utilise des processus, les modèles sont chargés
+        dans le pool CPU et non dans ce processus: l'état est celui rapporté par le
+        dernier lot tagué, conservé ici. Aucune tâche n'est soumise au pool, où elle
+        attendrait derrière les lots en cours.
+        """
+        if self.executor is None or not self.executor.uses_processes:
+            return self.model_status()
+        
+        # Aucun lot encore tagué: les modèles ne sont pas chargés dans le pool
+        return dict(self._worker_model_status or self.model_status())
+    
+    def _worker_spec(self) -> tuple:
+        """Configuration transmise aux processus du pool CPU (voir tag_batch_in_worker)"""
+        return (self.keywords_path, self.batch_size, self.n_process, self.embeddings_path)
+    
+    def _compute_version(self) -> str:
+        """Empreinte de tout ce qui détermine les tags produits: algorithme, taxonomie et modèles"""
+        # Calculée sans charger les modèles, à partir des paquets installés
+        spacy_model = [SPACY_MODEL, _package_version(SPACY_MODEL), NER_PIPES] if SPACY_AVAILABLE else None
+        keybert_model = [KEYBERT_MODEL, _package_version("keybert")] if KEYBERT_AVAILABLE else None
+        
+        description = json.dumps([TAGGER_VERSION, self.tech_keywords, spacy_model, keybert_model])
+        return hashlib.sha256(description.encode()).hexdigest()[:16]
+    
+    def _cache_key(self, article: Dict[str, Any]) -> str:
+        """Clé de cache d'un article: empreinte du titre, du texte et des tags existants"""
+        title = article.get("title") or ""
+        content = article.get("content") or article.get("description") or ""
+        existing = article.get("tags") or []
+        key = json.dumps([self.version, title, content, existing], sort_keys=True)
+        return hashlib.sha256(key.encode()).hexdigest()
+    
+    async def _run_cache(self, func, *args):
+        """Accède au cache hors de la boucle d'événements lorsqu'une couche d'exécution est disponible"""
+        if self.executor is None:
+            return func(*args)
+        return await self.executor.run_io(func, *args)
+    
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Compteurs du cache des tags (None si le cache est désactivé)"""
+        return self.cache.stats() if self.cache else None
     
     async def generate_tags(self, title: str, content: str, existing_tags: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Générer des tags à partir du titre et du contenu"""
+        article = {"title": title, "content": content, "tags": existing_tags}
+        return (await self.generate_tags_batch([article]))[0]
+    
+    async def generate_tags_batch(self, articles: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Générer les tags d'un lot d'articles
+        
+        Les articles dont le texte a déjà été tagué sont servis par le cache sans
+        exécuter aucun extracteur. Avec une couche d'exécution, les autres sont
+        découpés en paquets de batch_size répartis sur les processus du pool CPU;
+        sinon ils sont traités sur place.
+        
+        Args:
+            articles: Articles contenant title, content (ou description) et éventuellement tags existants
+            
+        Returns:
+            Liste des tags de chaque article, dans le même ordre
+        """
+        if self.cache is None:
+            return await self._generate_tags_uncached(articles)
+        
+        keys = [self._cache_key(article) for article in articles]
+        cached = await self._run_cache(self.cache.get_many, keys)
+        
+        # Un même texte n'est tagué qu'une fois, même s'il apparaît plusieurs fois dans le lot
+        pending = {}
+        for key, article in zip(keys, articles):
+            if key not in cached and key not in pending:
+                pending[key] = article
+        
+        if pending:
+            generated = dict(zip(pending, await self._generate_tags_uncached(list(pending.values()))))
+            await self._run_cache(self.cache.put_many, generated)
+            cached.update(generated)
+        
+        return [cached[key] for key in keys]
+    
+    async def _generate_tags_uncached(self, articles: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Génère les tags d'un lot sans passer par le cache"""
+        if self.executor is None:
+            return self.tag_batch(articles)
+        
+        # Ne transmettre aux processus que les champs utiles
+        payload = [
+            {field: article.get(field) for field in ("id", "content_hash", "title", "description", "content", "tags")}
+            for article in articles
+        ]
+        # Paquets assez grands pour que chaque processus du pool répartisse la NER sur n_process
+        chunk_size = self.batch_size * self.n_process
+        chunks = [payload[start:start + chunk_size] for start in range(0, len(payload), chunk_size)]
+        
+        if not self.executor.uses_processes:
+            results = await asyncio.gather(*(self.executor.run_cpu(self.tag_batch, chunk) for chunk in chunks))
+            return [tags for chunk_tags in results for tags in chunk_tags]
+        
+        spec = self._worker_spec()
+        results = await asyncio.gather(*(self.executor.run_cpu(tag_batch_in_worker, spec, chunk) for chunk in chunks))
+        self._worker_model_status = results[-1][1]
+        return [tags for chunk_tags, _ in results for tags in chunk_tags]
+    
+    def tag_article(self, title: str, content: str, existing_tags: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Génère les tags d'un article (travail CPU bloquant)"""
+        self.load_models()
+        full_text = f"{title} {content}"
+        entity_tags = self._extract_entities(full_text) if self.nlp else []
+        keyword_tags = self._extract_keywords(content) if self.keyword_model and content else []
+        return self._collect_tags(title, content, existing_tags, entity_tags, keyword_tags)
+    
+    def tag_batch(self, articles: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Génère les tags d'un lot d'articles (travail CPU bloquant)
+        
+        Les textes sont envoyés ensemble à spaCy (nlp.pipe), par lots de batch_size
+        et sur au plus n_process processus (voir _pipe_processes). KeyBERT traite
+        aussi tout le lot en un seul appel au modèle.
+        """
+        self.load_models()
+        texts = []
+        for article in articles:
+            title = article.get("title") or ""
+            content = article.get("content") or article.get("description") or ""
+            texts.append((title, content))
+        
+        if self.nlp:
+            entity_tags = self._extract_entities_batch([f"{title} {content}" for title, content in texts])
+        else:
+            entity_tags = [[] for _ in texts]
+        
+        keyword_tags = [[] for _ in texts]
+        if self.keyword_model:
+            documents = [
+                (index, article.get("id"), article.get("content_hash"), content)
+                for index, ((_, content), article) in enumerate(zip(texts, articles)) if content
+            ]
+            extracted = self._extract_keywords_batch([document[1:] for document in documents])
+            for (index, *_), keywords in zip(documents, extracted):
+                keyword_tags[index] = keywords
+        
+        return [
+            self._collect_tags(title, content, article.get("tags") or None, entities, keywords)
+            for (title, content), article, entities, keywords in zip(texts, articles, entity_tags, keyword_tags)
+        ]
+    
+    def _collect_tags(
+        self,
+        title: str,
+        content: str,
+        existing_tags: Optional[List[Dict[str, Any]]],
+        entity_tags: List[tuple],
+        keyword_tags: List[tuple]
+    ) -> List[Dict[str, Any]]:
+        """Combine les tags de chaque extracteur, sans doublons, triés par confiance"""
         if existing_tags is None:
             existing_tags = []
         
         existing_tag_names = {tag["name"].lower() for tag in existing_tags}
         tags = existing_tags.copy()
         
-        # Texte complet à analyser
-        full_text = f"{title} {content}"
+        def add_tags(candidates: List[tuple]):
+            for tag_name, confidence in candidates:
+                if tag_name.lower() not in existing_tag_names:
+                    tags.append({"name": tag_name, "confidence": confidence})
+                    existing_tag_names.add(tag_name.lower())
+        
+        # Texte complet à analyser (mis en minuscules une seule fois)
+        lowered_text = f"{title} {content}".lower()
         
         # 1. Recherche par mots-clés définis
-        keyword_tags = self._match_keywords(full_text)
-        for tag_name, confidence in keyword_tags:
-            if tag_name.lower() not in existing_tag_names:
-                tags.append({"name": tag_name, "confidence": confidence})
-                existing_tag_names.add(tag_name.lower())
+        add_tags(self._match_keywords(lowered_text))
         
         # 2. Extraction de mots-clés basique (fonctionne même sans modèles)
-        basic_tags = self._extract_basic_keywords(full_text)
-        for tag_name, confidence in basic_tags:
-            if tag_name.lower() not in existing_tag_names:
-                tags.append({"name": tag_name, "confidence": confidence})
-                existing_tag_names.add(tag_name.lower())
+        add_tags(self._extract_basic_keywords(lowered_text))
         
-        # 3. Extraction d'entités via SpaCy si disponible
-        if self.nlp:
-            entity_tags = self._extract_entities(full_text)
-            for tag_name, confidence in entity_tags:
-                if tag_name.lower() not in existing_tag_names:
-                    tags.append({"name": tag_name, "confidence": confidence})
-                    existing_tag_names.add(tag_name.lower())
+        # 3. Entités extraites via SpaCy si disponible
+        add_tags(entity_tags)
         
-        # 4. Extraction de mots-clés via KeyBERT si disponible
-        if self.keyword_model and content:
-            keyword_tags = self._extract_keywords(content)
-            for tag_name, confidence in keyword_tags:
-                if tag_name.lower() not in existing_tag_names:
-                    tags.append({"name": tag_name, "confidence": confidence})
-                    existing_tag_names.add(tag_name.lower())
+        # 4. Mots-clés extraits via KeyBERT si disponible
+        add_tags(keyword_tags)
         
         # Limiter le nombre de tags
         tags.sort(key=lambda x: x["confidence"], reverse=True)
         return tags[:10]  # Limiter à 10 tags max
     
+    @staticmethod
+    def _load_keywords(path: str) -> Dict[str, List[str]]:
+        """Charge la taxonomie des mots-clés depuis un fichier JSON"""
+        with open(path, "r", encoding="utf-8") as f:
+            keywords = json.load(f)
+        return {tag_name: [keyword.lower() for keyword in synonyms] for tag_name, synonyms in keywords.items()}
+    
+    @staticmethod
+    def _build_keyword_matcher(tech_keywords: Dict[str, List[str]]) -> tuple:
+        """
+        Construit une expression régulière unique en forme de trie pour tous les synonymes
+        
+        À chaque position du texte, l'expression trouve le plus long synonyme délimité
+        par des frontières de mots. Les synonymes plus courts qui en sont préfixes (et se
+        terminent eux aussi sur une frontière de mot) sont précalculés pour être comptés
+        au même passage, ce qui reproduit exactement une recherche par synonyme.
+        
+        Returns:
+            Tuple (pattern compilé, dictionnaire synonyme -> synonymes préfixes)
+        """
+        terms = sorted({keyword for synonyms in tech_keywords.values() for keyword in synonyms if keyword})
+        
+        # Trie des caractères: la clé "" marque la fin d'un synonyme
+        trie: Dict[str, Any] = {}
+        for term in terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = True
+        
+        def to_regex(node: Dict[str, Any]) -> str:
+            branches = [re.escape(char) + to_regex(child) for char, child in node.items() if char != ""]
+            if not branches:
+                return ""
+            if len(branches) == 1 and "" not in node:
+                return branches[0]
+            regex = "(?:" + "|".join(branches) + ")"
+            # Quantificateur glouton: la forme longue est essayée avant la forme courte
+            return regex + "?" if "" in node else regex
+        
+        def is_word(char: str) -> bool:
+            return char.isalnum() or char == "_"
+        
+        prefixes = {}
+        term_set = set(terms)
+        for term in terms:
+            prefixes[term] = [
+                term[:end] for end in range(1, len(term))
+                if term[:end] in term_set and is_word(term[end - 1]) != is_word(term[end])
+            ]
+        
+        pattern = re.compile(r"\b(?=(" + to_regex(trie) + r")\b)") if terms else None
+        return pattern, prefixes
+    
+    def _count_keywords(self, text: str) -> Dict[str, int]:
+        """Compte en un seul passage les occurrences (sans chevauchement) de chaque synonyme"""
+        counts: Dict[str, int] = {}
+        if self._keyword_pattern is None:
+            return counts
+        
+        last_end: Dict[str, int] = {}
+        for match in self._keyword_pattern.finditer(text):
+            start = match.start()
+            longest = match.group(1)
+            for term in [longest] + self._keyword_prefixes[longest]:
+                if start >= last_end.get(term, 0):
+                    counts[term] = counts.get(term, 0) + 1
+                    last_end[term] = start + len(term)
+        
+        return counts
+    
     def _match_keywords(self, text: str) -> List[tuple]:
-        """Correspond le texte avec les mots-clés prédéfinis"""
-        text = text.lower()
+        """Correspond le texte (déjà en minuscules) avec les mots-clés prédéfinis"""
+        counts = self._count_keywords(text)
         matched_tags = []
         
         for tag_name, keywords in self.tech_keywords.items():
             for keyword in keywords:
-                # Recherche de correspondance avec des mots entiers
-                pattern = r'\b{}\b'.format(re.escape(keyword.lower()))
-                matches = re.findall(pattern, text)
+                matches = counts.get(keyword, 0)
                 
                 if matches:
                     # La confiance est basée sur le nombre de correspondances
-                    confidence = min(1.0, 0.6 + (len(matches) * 0.1))
+                    confidence = min(1.0, 0.6 + (matches * 0.1))
                     matched_tags.append((tag_name.replace("_", " ").title(), confidence))
                     break  # Pas besoin de chercher d'autres mots-clés pour ce tag
         
         return matched_tags
     
     def _extract_basic_keywords(self, text: str) -> List[tuple]:
-        """Extrait des mots-clés basiques du texte sans modèles d'IA"""
-        # Nettoyer le texte
-        text = text.lower()
-        
+        """Extrait des mots-clés basiques du texte (déjà en minuscules) sans modèles d'IA"""
         # Supprimer la ponctuation et remplacer par des espaces
         for punct in string.punctuation:
             text = text.replace(punct, ' ')
@@ -218,47 +489,163 @@ class TagGenerator:
         
         return keyword_tags[:15]  # Limiter aux 15 mots-clés les plus pertinents
     
+    def _entity_tags(self, doc) -> List[tuple]:
+        """Filtre les entités pertinentes d'un document spaCy"""
+        entity_tags = []
+        for ent in doc.ents:
+            if ent.label_ in ENTITY_LABELS:
+                # Filtrage des entités pertinentes
+                ent_text = ent.text.strip()
+                if (len(ent_text) > 2 and 
+                    ent_text.lower() not in self.stopwords and 
+                    not ent_text.isdigit()):
+                    entity_tags.append((ent_text, 0.7))
+        return entity_tags
+    
     def _extract_entities(self, text: str) -> List[tuple]:
         """Extrait les entités du texte via SpaCy"""
-        entity_tags = []
-        
         try:
             doc = self.nlp(text[:10000])  # Limiter à 10K caractères pour la performance
-            
-            for ent in doc.ents:
-                if ent.label_ in ["ORG", "PRODUCT", "GPE", "PERSON", "WORK_OF_ART", "EVENT"]:
-                    # Filtrage des entités pertinentes
-                    ent_text = ent.text.strip()
-                    if (len(ent_text) > 2 and 
-                        ent_text.lower() not in self.stopwords and 
-                        not ent_text.isdigit()):
-                        entity_tags.append((ent_text, 0.7))
+            return self._entity_tags(doc)
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction d'entités: {str(e)}")
-        
-        return entity_tags
+            return []
+    
+    def _pipe_processes(self, text_count: int) -> int:
+        """Nombre de processus spaCy pour un lot: un par paquet de batch_size textes, au plus n_process"""
+        return max(1, min(self.n_process, -(-text_count // self.batch_size)))
+    
+    def _extract_entities_batch(self, texts: List[str]) -> List[List[tuple]]:
+        """Extrait les entités d'un lot de textes via nlp.pipe"""
+        try:
+            docs = self.nlp.pipe(
+                (text[:10000] for text in texts),
+                batch_size=self.batch_size,
+                n_process=self._pipe_processes(len(texts))
+            )
+            return [self._entity_tags(doc) for doc in docs]
+        except Exception as e:
+            logger.error(f"Erreur lors de l'extraction d'entités par lot: {str(e)}")
+            return [[] for _ in texts]
     
     def _extract_keywords(self, text: str) -> List[tuple]:
         """Extrait les mots-clés du texte via KeyBERT"""
-        keyword_tags = []
+        return self._extract_keywords_batch([(None, None, text)])[0]
+    
+    def _candidate_embeddings(self, phrases: List[str]):
+        """Embeddings des phrases candidates: cache LRU, et un seul appel au modèle pour les absentes"""
+        import numpy as np
+        
+        missing = [phrase for phrase in phrases if phrase not in self._candidate_cache]
+        if missing:
+            for phrase, vector in zip(missing, self.keyword_model.model.embed(missing)):
+                self._candidate_cache[phrase] = vector
+        
+        vectors = []
+        for phrase in phrases:
+            self._candidate_cache.move_to_end(phrase)
+            vectors.append(self._candidate_cache[phrase])
+        
+        while len(self._candidate_cache) > CANDIDATE_CACHE_SIZE:
+            self._candidate_cache.popitem(last=False)
+        
+        return np.vstack(vectors)
+    
+    def _document_embeddings(self, documents: List[tuple]):
+        """Embeddings des documents: réutilisés depuis le disque si le contenu n'a pas changé"""
+        import numpy as np
+        
+        hashes = {article_id: content_hash for article_id, content_hash, _ in documents if article_id}
+        stored = self._embedding_store.get_many(hashes) if self._embedding_store else {}
+        
+        missing = [index for index, (article_id, _, _) in enumerate(documents) if article_id not in stored]
+        computed = {}
+        if missing:
+            vectors = self.keyword_model.model.embed([documents[index][2] for index in missing])
+            computed = dict(zip(missing, vectors))
+            if self._embedding_store:
+                self._embedding_store.put_many(
+                    {documents[index][0]: vector for index, vector in computed.items() if documents[index][0]},
+                    hashes
+                )
+        
+        return np.vstack([
+            computed[index] if index in computed else stored[article_id]
+            for index, (article_id, _, _) in enumerate(documents)
+        ])
+    
+    def _extract_keywords_batch(self, documents: List[tuple]) -> List[List[tuple]]:
+        """
+        Extrait les mots-clés d'un lot de textes via KeyBERT
+        
+        Les phrases candidates de tout le lot sont extraites ensemble, leurs embeddings
+        proviennent du cache LRU, et ceux des documents du stockage sur disque; seuls
+        les manquants sont calculés, en un appel au modèle pour chaque type.
+        
+        Args:
+            documents: Tuples (identifiant d'article ou None, empreinte du contenu, texte)
+        
+        Returns:
+            Mots-clés de chaque document, dans le même ordre
+        """
+        if not documents:
+            return []
         
         try:
             # Limiter la taille du texte pour la performance
-            text = text[:5000]
+            documents = [(article_id, content_hash, text[:KEYBERT_MAX_CHARS]) for article_id, content_hash, text in documents]
+            docs = [text for _, _, text in documents]
+            
+            from sklearn.feature_extraction.text import CountVectorizer
+            vectorizer = CountVectorizer(ngram_range=KEYBERT_NGRAM_RANGE, stop_words='english')
+            try:
+                phrases = list(vectorizer.fit(docs).get_feature_names_out())
+            except ValueError:
+                # Aucun mot exploitable dans le lot
+                return [[] for _ in documents]
             
-            # Extraction de mots-clés avec KeyBERT
+            # Extraction de mots-clés avec KeyBERT à partir des embeddings précalculés
             keywords = self.keyword_model.extract_keywords(
-                text, 
-                keyphrase_ngram_range=(1, 2),
-                stop_words='english', 
-                use_maxsum=True, 
-                top_n=5
+                docs,
+                vectorizer=vectorizer,
+                use_maxsum=True,
+                top_n=KEYBERT_TOP_N,
+                doc_embeddings=self._document_embeddings(documents),
+                word_embeddings=self._candidate_embeddings(phrases)
             )
+            # KeyBERT retourne une liste simple pour un document unique
+            if len(docs) == 1:
+                keywords = [keywords]
             
-            for keyword, score in keywords:
-                keyword_tags.append((keyword.title(), float(score)))
+            return [
+                [(keyword.title(), float(score)) for keyword, score in document_keywords]
+                for document_keywords in keywords
+            ]
         
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction de mots-clés: {str(e)}")
-        
-        return keyword_tags 
\ No newline at end of file
+            return [[] for _ in documents]
+
+# Générateurs propres à chaque processus du pool CPU, par configuration
+_worker_generators: Dict[tuple, TagGenerator] = {}
+
+def tag_batch_in_worker(spec: tuple, articles: List[Dict[str, Any]]) -> Tuple[List[List[Dict[str, Any]]], Dict[str, str]]:
+    """
+    Génère les tags d'un lot dans un processus du pool CPU (voir TagGenerator.tag_batch)
+    
+    Returns:
+        Tags de chaque article et état des modèles de ce processus
+    """
+    generator = _worker_generators.get(spec)
+    if generator is None:
+        keywords_path, batch_size, n_process, embeddings_path = spec
+        # Le cache est géré par le processus principal
+        generator = TagGenerator(
+            keywords_path=keywords_path,
+            batch_size=batch_size,
+            n_process=n_process,
+            embeddings_path=embeddings_path,
+            cache_path=None
+        )
+        _worker_generators[spec] = generator
+    return generator.tag_batch(articles), generator.model_status()
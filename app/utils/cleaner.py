@@ -10,20 +10,23 @@ logger = logging.getLogger(__name__)
 class DataCleaner:
     """Classe utilitaire pour nettoyer les données périmées"""
     
-    def __init__(self, retention_days: int = 30):
+    def __init__(self, retention_days: int = 30, job_retention_days: int = 7):
         """
         Initialise le nettoyeur de données
         
         Args:
             retention_days: Nombre de jours de rétention des articles
+            job_retention_days: Nombre de jours de rétention des tâches d'ingestion terminées
         """
         self.retention_days = retention_days
+        self.job_retention_days = job_retention_days
     
     async def clean_old_data(self):
         """Nettoie les articles plus anciens que la période de rétention"""
         try:
             logger.info(f"Nettoyage des articles plus anciens que {self.retention_days} jours")
             await database.delete_old_articles(days=self.retention_days)
+            await database.delete_old_jobs(days=self.job_retention_days)
             logger.info("Nettoyage terminé avec succès")
         except Exception as e:
             logger.error(f"Erreur lors du nettoyage des données: {str(e)}")
@@ -0,0 +1,50 @@
+import asyncio
+import logging
+
+from .db import init_db, init_pool, close_pool
+from .services.executor import TaskExecutor
+from .services.feed_fetcher import FeedFetcher
+from .services.rss_parser import RSSParser
+from .services.tag_generator import TagGenerator
+from .services.ingestion_worker import IngestionWorker
+from .services.scheduler import FeedScheduler
+
+# Configuration du logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+async def main():
+    """
+    Exécute le worker d'ingestion et le planificateur des sources dans un processus dédié
+    
+    À lancer avec `python -m app.worker`, le serveur web étant démarré avec
+    TECHPULSE_INGESTION_WORKER=external pour ne pas exécuter son propre worker.
+    """
+    await init_db()
+    await init_pool(readers=2)
+    
+    task_executor = TaskExecutor()
+    feed_fetcher = FeedFetcher(max_concurrency=task_executor.io_workers, per_host_limit=4, timeout=20.0, executor=task_executor)
+    rss_parser = RSSParser(fetcher=feed_fetcher, executor=task_executor)
+    tag_generator = TagGenerator(executor=task_executor)
+    worker = IngestionWorker(rss_parser=rss_parser, tag_generator=tag_generator)
+    scheduler = FeedScheduler(on_enqueue=worker.notify)
+    
+    scheduler_task = asyncio.create_task(scheduler.run())
+    try:
+        await worker.run()
+    finally:
+        scheduler.stop()
+        scheduler_task.cancel()
+        feed_fetcher.close()
+        task_executor.shutdown()
+        await close_pool()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("Worker d'ingestion interrompu")
@@ -0,0 +1,151 @@
+"""
+Micro-benchmark du traitement HTML des entrées de flux
+
+Compare le traitement historique du RSSParser (un BeautifulSoup "html.parser"
+par nettoyage et par recherche d'image, jusqu'à quatre par entrée) au
+traitement en une seule passe de app.services.html_processor, avec chaque
+moteur installé (selectolax, lxml, html.parser). Les textes et images obtenus
+sont comparés à ceux du traitement historique.
+
+Le corpus est constitué des entrées de vrais flux: les sources de
+sources_example.json par défaut, ou les fichiers et URLs passés en argument.
+
+Usage: python -m benchmarks.bench_html_processing [--iterations N] [flux ...]
+"""
+import argparse
+import importlib.util
+import json
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+import feedparser
+from bs4 import BeautifulSoup
+
+from app.services.html_processor import clear_html_cache, process_html
+
+SOURCES_PATH = "sources_example.json"
+
+def legacy_clean_html(html_content: str) -> str:
+    """Implémentation historique de RSSParser._clean_html"""
+    if not html_content:
+        return ""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    for script in soup(["script", "style"]):
+        script.extract()
+    text = soup.get_text(separator=' ', strip=True)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def legacy_find_image(content_html: str, summary: str) -> Optional[str]:
+    """Partie HTML de l'implémentation historique de RSSParser._extract_image"""
+    if content_html:
+        soup = BeautifulSoup(content_html, 'html.parser')
+        for img in soup.find_all('img'):
+            src = img.get('src')
+            width = img.get('width')
+            height = img.get('height')
+            try:
+                if src and ((width and int(width) > 150) or (height and int(height) > 150) or
+                           ('width' not in img.attrs and 'height' not in img.attrs)):
+                    return src
+            except ValueError:
+                pass
+        img = soup.find('img')
+        if img and img.get('src'):
+            return img['src']
+
+    if summary:
+        soup = BeautifulSoup(summary, 'html.parser')
+        img = soup.find('img')
+        if img and img.get('src'):
+            return img['src']
+    return None
+
+def entry_fragments(entry: Dict[str, Any]) -> Dict[str, str]:
+    """Fragments HTML d'une entrée, tels que lus par le RSSParser"""
+    content = ""
+    for content_item in entry.get('content') or []:
+        if content_item.get('type') == 'text/html':
+            content = content_item.value
+            break
+    return {
+        "description": entry.get('description', ''),
+        "content": content,
+        "summary": entry.get('summary', '')
+    }
+
+def legacy_process(fragments: Dict[str, str]) -> tuple:
+    """Traitement historique: une analyse par usage"""
+    description = legacy_clean_html(fragments["description"])
+    content = legacy_clean_html(fragments["content"])
+    image = legacy_find_image(fragments["content"] or fragments["description"], fragments["summary"])
+    return description, content, image
+
+def single_pass_process(fragments: Dict[str, str], backend: str) -> tuple:
+    """Traitement en une passe: chaque fragment distinct n'est analysé qu'une fois"""
+    description = process_html(fragments["description"], backend)
+    content = process_html(fragments["content"], backend)
+    image = (content if fragments["content"] else description).image
+    if not image and fragments["summary"]:
+        image = process_html(fragments["summary"], backend).first_image
+    return description.text, content.text, image
+
+def load_entries(feeds: List[str]) -> List[Dict[str, str]]:
+    """Charge les fragments HTML des entrées des flux (fichiers ou URLs)"""
+    corpus = []
+    for feed in feeds:
+        parsed = feedparser.parse(feed)
+        fragments = [entry_fragments(entry) for entry in parsed.entries]
+        fragments = [fragment for fragment in fragments if any(fragment.values())]
+        print(f"  {feed}: {len(fragments)} entrées")
+        corpus.extend(fragments)
+    return corpus
+
+def time_entries(func, corpus: List[Dict[str, str]], iterations: int, clear_cache: bool = False) -> float:
+    """Durée moyenne du traitement d'une entrée en microsecondes"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for fragments in corpus:
+            if clear_cache:
+                # Aucune réutilisation d'une entrée à l'autre: seul le partage au sein d'une entrée est mesuré
+                clear_html_cache()
+            func(fragments)
+    return (time.perf_counter() - start) / (iterations * len(corpus)) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du traitement HTML des entrées de flux")
+    parser.add_argument("feeds", nargs="*", help="Fichiers ou URLs de flux (sources de sources_example.json par défaut)")
+    parser.add_argument("--iterations", type=int, default=5, help="Nombre de passages sur le corpus")
+    args = parser.parse_args()
+
+    feeds = args.feeds
+    if not feeds:
+        with open(SOURCES_PATH, "r", encoding="utf-8") as f:
+            feeds = [source["url"] for source in json.load(f)]
+
+    print("Chargement du corpus:")
+    corpus = load_entries(feeds)
+    if not corpus:
+        print("Aucune entrée chargée")
+        return
+
+    expected = [legacy_process(fragments) for fragments in corpus]
+    legacy = time_entries(legacy_process, corpus, args.iterations)
+    print(f"\n{len(corpus)} entrées, {sum(len(''.join(f.values())) for f in corpus)} caractères HTML")
+    print(f"  historique (bs4, jusqu'à 4 analyses) : {legacy:10.1f} µs/entrée")
+
+    backends = ["html.parser"] + [name for name in ("lxml", "selectolax") if importlib.util.find_spec(name)]
+    for backend in backends:
+        clear_html_cache()
+        mismatches = sum(
+            1 for fragments, result in zip(corpus, expected)
+            if single_pass_process(fragments, backend) != result
+        )
+        duration = time_entries(lambda fragments: single_pass_process(fragments, backend), corpus, args.iterations, True)
+        print(
+            f"  une passe ({backend:<11})            : {duration:10.1f} µs/entrée  (x{legacy / duration:.1f}, "
+            f"{mismatches} entrées différentes)"
+        )
+
+if __name__ == "__main__":
+    main()
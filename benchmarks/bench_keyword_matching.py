@@ -0,0 +1,103 @@
+"""
+Micro-benchmark de TagGenerator._match_keywords
+
+Compare l'implémentation historique (une expression régulière par synonyme et
+par article) à l'expression unique construite au chargement de la taxonomie,
+sur la taxonomie par défaut puis sur une taxonomie synthétique de plusieurs
+milliers de termes. Les résultats des deux implémentations sont vérifiés.
+
+Usage: python -m benchmarks.bench_keyword_matching [--iterations N]
+"""
+import argparse
+import json
+import random
+import re
+import tempfile
+import time
+from typing import Dict, List
+
+from app.services.tag_generator import TagGenerator, DEFAULT_KEYWORDS_PATH
+
+SAMPLE_TEXT = """
+Amazon Web Services annonce la disponibilité de nouvelles instances EC2 pour
+l'entraînement de modèles de machine learning. Les équipes DevOps peuvent
+déployer leurs conteneurs Docker sur Kubernetes (k8s) avec Terraform, et
+exposer leurs API via un API gateway. Google Cloud et Microsoft Azure proposent
+des services similaires; la sécurité zero-trust et le chiffrement restent au
+coeur des architectures cloud native observées avec Prometheus et Grafana.
+"""
+
+def legacy_match_keywords(tech_keywords: Dict[str, List[str]], text: str) -> List[tuple]:
+    """Implémentation historique: une recherche regex par synonyme"""
+    text = text.lower()
+    matched_tags = []
+    
+    for tag_name, keywords in tech_keywords.items():
+        for keyword in keywords:
+            pattern = r'\b{}\b'.format(re.escape(keyword.lower()))
+            matches = re.findall(pattern, text)
+            
+            if matches:
+                confidence = min(1.0, 0.6 + (len(matches) * 0.1))
+                matched_tags.append((tag_name.replace("_", " ").title(), confidence))
+                break
+    
+    return matched_tags
+
+def synthetic_taxonomy(size: int, seed: int = 42) -> Dict[str, List[str]]:
+    """Génère une taxonomie de size tags avec quelques synonymes chacun"""
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ra", "te", "zu", "ne", "po", "si", "va", "do", "ge"]
+    
+    def word() -> str:
+        return "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+    
+    return {
+        f"tag_{index}": [" ".join(word() for _ in range(rng.randint(1, 3))) for _ in range(rng.randint(1, 4))]
+        for index in range(size)
+    }
+
+def time_calls(func, iterations: int) -> float:
+    """Durée moyenne d'un appel en microsecondes"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def run(name: str, keywords_path: str, text: str, iterations: int):
+    """Compare les deux implémentations sur une taxonomie"""
+    tag_generator = TagGenerator(keywords_path=keywords_path)
+    tech_keywords = tag_generator.tech_keywords
+    lowered_text = text.lower()
+    
+    expected = legacy_match_keywords(tech_keywords, text)
+    actual = tag_generator._match_keywords(lowered_text)
+    assert actual == expected, f"Résultats différents: {actual} != {expected}"
+    
+    legacy = time_calls(lambda: legacy_match_keywords(tech_keywords, text), iterations)
+    single_pass = time_calls(lambda: tag_generator._match_keywords(lowered_text), iterations)
+    
+    terms = sum(len(synonyms) for synonyms in tech_keywords.values())
+    print(f"{name}: {terms} synonymes, {len(text)} caractères")
+    print(f"  une regex par synonyme : {legacy:10.1f} µs/article")
+    print(f"  passage unique         : {single_pass:10.1f} µs/article  (x{legacy / single_pass:.1f})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la correspondance des mots-clés")
+    parser.add_argument("--iterations", type=int, default=200, help="Nombre d'appels mesurés par implémentation")
+    args = parser.parse_args()
+    
+    text = SAMPLE_TEXT * 10
+    run("Taxonomie par défaut", DEFAULT_KEYWORDS_PATH, text, args.iterations)
+    
+    taxonomy = synthetic_taxonomy(2000)
+    # Injecter quelques termes de la taxonomie synthétique dans le texte
+    rng = random.Random(7)
+    injected = " ".join(rng.choice(synonyms) for synonyms in rng.sample(list(taxonomy.values()), 50))
+    with tempfile.NamedTemporaryFile("w", suffix=".json", encoding="utf-8") as f:
+        json.dump(taxonomy, f)
+        f.flush()
+        run("Taxonomie synthétique", f.name, f"{text} {injected}", max(1, args.iterations // 10))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Micro-benchmark de la sérialisation des pages d'articles
+
+Compare le chemin historique de FastAPI (validation de la page par le
+response_model ArticleResponse: HttpUrl, datetime et un modèle Tag par tag, puis
+sérialisation par JSONResponse) à FastJSONResponse, qui écrit directement les
+lignes lues en base (orjson s'il est installé). Les deux sorties sont comparées.
+
+Usage: python -m benchmarks.bench_serialization [--iterations N] [--page-size N]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.responses import FastJSONResponse, ORJSON_AVAILABLE
+from app.models.schemas import ArticleResponse
+
+TAG_NAMES = ["aws", "azure", "kubernetes", "docker", "ia", "sécurité", "devops", "terraform", "python", "data"]
+
+def make_page(page_size: int) -> Dict[str, Any]:
+    """Page d'articles telle que retournée par database.get_articles (projection list)"""
+    random.seed(42)
+    articles: List[Dict[str, Any]] = []
+    for i in range(page_size):
+        articles.append({
+            "id": f"{i:032x}",
+            "title": f"Annonce {i}: nouvelle fonctionnalité pour les architectures cloud native",
+            "link": f"https://example.com/blog/{i}/nouvelle-fonctionnalite",
+            "pub_date": f"2024-05-{1 + i % 28:02d}T10:{i % 60:02d}:00+00:00",
+            "description": "Les équipes DevOps peuvent désormais déployer leurs conteneurs. " * 5,
+            "summary": None,
+            "source": random.choice(["AWS", "Azure", "Google Cloud"]),
+            "tags": [{"name": name, "confidence": 0.9} for name in random.sample(TAG_NAMES, 5)],
+            "read_later": False,
+            "read": bool(i % 3 == 0),
+            "image_url": f"https://example.com/images/{i}.png" if i % 2 else None,
+            "canonical_id": None
+        })
+    return {"articles": articles, "total": 1000, "page": 1, "page_size": page_size, "next_cursor": None}
+
+async def validated_body(field, page: Dict[str, Any]) -> bytes:
+    """Chemin historique: validation par le response_model puis JSONResponse"""
+    content = await serialize_response(field=field, response_content=page, exclude_unset=True, is_coroutine=True)
+    return JSONResponse(content).body
+
+def fast_body(page: Dict[str, Any]) -> bytes:
+    """Chemin rapide: sérialisation directe des lignes"""
+    return FastJSONResponse(page).body
+
+def time_calls(func, iterations: int) -> float:
+    """Durée moyenne d'un appel en microsecondes"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la sérialisation des pages d'articles")
+    parser.add_argument("--iterations", type=int, default=200, help="Nombre de sérialisations par chemin")
+    parser.add_argument("--page-size", type=int, default=100, help="Nombre d'articles par page")
+    args = parser.parse_args()
+
+    page = make_page(args.page_size)
+    field = create_response_field(name="response", type_=ArticleResponse)
+    loop = asyncio.new_event_loop()
+
+    validated = json.loads(loop.run_until_complete(validated_body(field, page)))
+    fast = json.loads(fast_body(page))
+    # Seule différence attendue: la normalisation des URLs et dates par Pydantic
+    mismatches = sum(
+        1 for expected, actual in zip(validated["articles"], fast["articles"])
+        if set(expected) != set(actual) or expected["tags"] != actual["tags"] or expected["title"] != actual["title"]
+    )
+
+    legacy = time_calls(lambda: loop.run_until_complete(validated_body(field, page)), args.iterations)
+    direct = time_calls(lambda: fast_body(page), args.iterations)
+    loop.close()
+
+    print(f"{args.page_size} articles par page, {len(fast_body(page))} octets")
+    print(f"  response_model + JSONResponse : {legacy:10.1f} µs/page")
+    print(f"  FastJSONResponse ({'orjson' if ORJSON_AVAILABLE else 'json'})     : {direct:10.1f} µs/page  (x{legacy / direct:.1f})")
+    print(f"  {mismatches} articles différents")
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from app.db import init_db
 from app.utils.import_sources import import_sources_from_json
 from app.services.rss_parser import RSSParser
 from app.services.tag_generator import TagGenerator
+from app.services.ingestion import ingest_articles
 
 # Configuration du logging
 logging.basicConfig(
@@ -47,35 +48,33 @@ async def initialize_app(import_sources: bool = True, fetch_initial: bool = True
     if fetch_initial and imported_sources:
         logger.info("Récupération des articles initiaux...")
         rss_parser = RSSParser()
-        tag_generator = TagGenerator()
+        # Tous les coeurs sont utilisés pour la NER de l'import initial
+        tag_generator = TagGenerator(n_process=os.cpu_count() or 1)
         
-        total_articles = 0
+        # Les articles de tous les flux sont tagués ensemble: un lot par flux serait
+        # trop petit pour répartir la NER sur tous les processus
+        articles = []
         for source in imported_sources:
             try:
                 source_name = source.get("name")
                 source_url = source.get("url")
                 logger.info(f"Récupération des articles pour {source_name}...")
                 
-                articles = await rss_parser.fetch_and_parse(source_name, source_url)
-                
-                for article in articles:
-                    # Générer des tags
-                    if not article.get("tags"):
-                        title = article.get("title", "")
-                        content = article.get("content", article.get("description", ""))
-                        article["tags"] = await tag_generator.generate_tags(title, content)
-                
-                    # Sauvegarder l'article
-                    from app.db import save_article
-                    await save_article(article)
-                
-                total_articles += len(articles)
-                logger.info(f"{len(articles)} articles récupérés pour {source_name}")
+                source_articles = await rss_parser.fetch_and_parse(source_name, source_url)
+                articles.extend(source_articles)
+                logger.info(f"{len(source_articles)} articles récupérés pour {source_name}")
             
             except Exception as e:
                 logger.error(f"Erreur lors de la récupération des articles pour {source.get('name')}: {str(e)}")
         
-        logger.info(f"Total: {total_articles} articles récupérés")
+        # Générer les tags et sauvegarder les articles nouveaux ou modifiés
+        total_articles = 0
+        try:
+            total_articles = await ingest_articles(articles, tag_generator)
+        except Exception as e:
+            logger.error(f"Erreur lors de l'enregistrement des articles initiaux: {str(e)}")
+        
+        logger.info(f"Total: {total_articles} articles enregistrés")
     
     logger.info("Initialisation terminée")
 
@@ -0,0 +1,20 @@
+import asyncio
+import logging
+from app.db import init_db, rebuild_search_index
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+async def main():
+    """Crée l'index plein texte si nécessaire et le reconstruit à partir des articles existants"""
+    try:
+        await init_db()
+        logger.info("Reconstruction de l'index de recherche...")
+        await rebuild_search_index()
+        logger.info("Index de recherche reconstruit avec succès")
+    except Exception as e:
+        logger.error(f"Erreur lors de la reconstruction de l'index: {str(e)}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -11,9 +11,9 @@ let currentState = {
     search: null,
     readLater: null,
     read: null,
+    collapse: false, // Regrouper les quasi-doublons (sur demande: le total est alors recompté)
     view: 'grid', // Vue par défaut (grid ou list)
     allTags: new Set(),
-    generatedTags: new Set(),
     sourceCounts: {}, // Pour stocker le nombre d'articles par source
     isLoading: false
 };
@@ -34,6 +34,7 @@ const elements = {
     totalCount: document.getElementById('totalCount'),
     saveCount: document.getElementById('saveCount'),
     viewControls: document.querySelector('.view-controls'),
+    collapseBtn: document.getElementById('collapseBtn'),
     filterDropdown: document.getElementById('filterDropdown'),
     tagFilters: document.getElementById('tagFilters')
 };
@@ -53,6 +54,20 @@ document.addEventListener('DOMContentLoaded', async () => {
     initializeView();
 });
 
+// Attend la fin d'une tâche d'ingestion en consultant régulièrement son état
+async function waitForJob(jobId, interval = 1500) {
+    while (true) {
+        const response = await fetch(`${API_BASE_URL}/jobs/${jobId}`);
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        
+        const job = await response.json();
+        if (job.status === 'done' || job.status === 'failed') {
+            return job;
+        }
+        await new Promise(resolve => setTimeout(resolve, interval));
+    }
+}
+
 // Configuration des écouteurs d'événements
 function setupEventListeners() {
     // Recherche
@@ -69,11 +84,23 @@ function setupEventListeners() {
         elements.refreshBtn.classList.add('spin');
         
         try {
-            await fetch(`${API_BASE_URL}/refresh`, {
+            // Le rafraîchissement est exécuté en arrière-plan: suivre la tâche jusqu'à sa fin
+            const response = await fetch(`${API_BASE_URL}/refresh`, {
                 method: 'POST'
             });
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            const { job_id: jobId } = await response.json();
+            
+            const job = jobId ? await waitForJob(jobId) : null;
             await loadArticles();
-            showToast('Flux rafraîchis avec succès!', 'success');
+            
+            if (job && job.status === 'failed') {
+                showToast('Erreur lors du rafraîchissement des flux', 'danger');
+            } else if (job && job.progress.failed > 0) {
+                showToast(`Flux rafraîchis (${job.progress.failed} source(s) en erreur)`, 'warning');
+            } else {
+                showToast('Flux rafraîchis avec succès!', 'success');
+            }
         } catch (error) {
             console.error('Erreur lors du rafraîchissement:', error);
             showToast('Erreur lors du rafraîchissement des flux', 'danger');
@@ -229,6 +256,14 @@ function setupEventListeners() {
         }
     });
 
+    // Regroupement des quasi-doublons (même annonce publiée par plusieurs sources)
+    elements.collapseBtn.addEventListener('click', () => {
+        currentState.collapse = !currentState.collapse;
+        elements.collapseBtn.classList.toggle('active', currentState.collapse);
+        currentState.page = 1;
+        loadArticles();
+    });
+
     // Délégation d'événements pour le conteneur d'articles (boutons d'action)
     elements.articlesContainer.addEventListener('click', async (e) => {
         // Pour le bouton "à lire plus tard"
@@ -425,29 +460,10 @@ async function loadArticles() {
     `;
     
     // Construire l'URL avec les paramètres
-    let url = `${API_BASE_URL}/articles?page=${currentState.page}&page_size=${currentState.pageSize}`;
-    
-    if (currentState.source) {
-        url += `&source=${currentState.source}`;
-    }
-    
-    if (currentState.tag) {
-        url += `&tag=${encodeURIComponent(currentState.tag)}`;
-    }
-    
-    if (currentState.search) {
-        url += `&search=${encodeURIComponent(currentState.search)}`;
-    }
-    
-    if (currentState.readLater) {
-        url += '&read_later=true';
-    }
-    
-    if (currentState.read === true) {
-        url += '&read=true';
-    } else if (currentState.read === false) {
-        url += '&read=false';
-    }
+    const filters = buildFilterParams();
+    // Les quasi-doublons ne sont regroupés que sur demande
+    const collapse = currentState.collapse ? '&collapse=true' : '';
+    const url = `${API_BASE_URL}/articles?page=${currentState.page}&page_size=${currentState.pageSize}${collapse}${filters}`;
     
     try {
         const response = await fetch(url);
@@ -457,7 +473,7 @@ async function loadArticles() {
         
         renderArticles(data);
         renderPagination(data);
-        updateTagFilters(data.articles);
+        loadTagFacets(filters);
         
         // Mettre à jour le compteur total
         elements.totalCount.textContent = data.total;
@@ -479,6 +495,46 @@ async function loadArticles() {
     }
 }
 
+// Paramètres de filtrage communs aux articles et aux facettes
+function buildFilterParams() {
+    let params = '';
+    
+    if (currentState.source) {
+        params += `&source=${encodeURIComponent(currentState.source)}`;
+    }
+    
+    if (currentState.tag) {
+        params += `&tag=${encodeURIComponent(currentState.tag)}`;
+    }
+    
+    if (currentState.search) {
+        params += `&search=${encodeURIComponent(currentState.search)}`;
+    }
+    
+    if (currentState.readLater) {
+        params += '&read_later=true';
+    }
+    
+    if (currentState.read === true) {
+        params += '&read=true';
+    } else if (currentState.read === false) {
+        params += '&read=false';
+    }
+    
+    return params;
+}
+
+// Chargement des tags populaires (calculés par le serveur) pour les filtres courants
+async function loadTagFacets(filters) {
+    try {
+        const response = await fetch(`${API_BASE_URL}/articles/facets?limit=100${filters}`);
+        const facets = await response.json();
+        updateTagFilters(facets);
+    } catch (error) {
+        console.error('Erreur lors du chargement des tags:', error);
+    }
+}
+
 // Chargement des sources depuis l'API
 async function loadSources() {
     try {
@@ -490,9 +546,9 @@ async function loadSources() {
         
         // Compter les articles à lire plus tard
         try {
-            const readLaterResponse = await fetch(`${API_BASE_URL}/articles?read_later=true&page=1&page_size=1`);
-            const readLaterData = await readLaterResponse.json();
-            elements.saveCount.textContent = readLaterData.total;
+            const countsResponse = await fetch(`${API_BASE_URL}/counts`);
+            const counts = await countsResponse.json();
+            elements.saveCount.textContent = counts.read_later;
         } catch (error) {
             console.error('Erreur lors du comptage des articles à lire plus tard:', error);
         }
@@ -595,6 +651,10 @@ function renderArticles(data) {
         // Badge source et date
         const sourceElement = clone.querySelector('.article-source');
         sourceElement.textContent = article.source;
+        if (article.duplicate_count) {
+            sourceElement.textContent += ` +${article.duplicate_count}`;
+            sourceElement.title = `Également publié par ${article.duplicate_count} autre(s) source(s)`;
+        }
         
         // Déterminer une catégorie basée sur la source (si aucune fournie)
         let category = 'tech';
@@ -742,35 +802,11 @@ function renderSourcesList(sources) {
 }
 
 // Mise à jour des filtres de tag
-function updateTagFilters(articles) {
-    // Réinitialiser les tags pour éviter les duplications
-    currentState.allTags = new Set();
-    
-    // Collecter tous les tags de tous les articles
-    articles.forEach(article => {
-        if (article.tags && article.tags.length > 0) {
-            article.tags.forEach(tag => {
-                const tagName = typeof tag === 'string' ? tag : tag.name;
-                if (tagName) currentState.allTags.add(tagName);
-            });
-        }
-    });
-    
-    // Convertir en array et trier alphabétiquement
-    const allTagsArray = Array.from(currentState.allTags).sort((a, b) => 
-        a.toLowerCase().localeCompare(b.toLowerCase())
-    );
-    
-    // Ajouter les tags générés
-    if (currentState.generatedTags.size > 0) {
-        currentState.generatedTags.forEach(tag => {
-            if (!allTagsArray.includes(tag)) {
-                allTagsArray.push(tag);
-            }
-        });
-        // Retrier après l'ajout des nouveaux tags
-        allTagsArray.sort((a, b) => a.toLowerCase().localeCompare(b.toLowerCase()));
-    }
+function updateTagFilters(facets) {
+    // Tags déjà triés par fréquence par le serveur
+    currentState.allTags = new Set(facets.map(facet => facet.name));
+    const allTagsArray = Array.from(currentState.allTags);
+    const tagCounts = Object.fromEntries(facets.map(facet => [facet.name, facet.count]));
     
     // Mettre à jour l'UI avec tous les tags
     elements.tagFilters.innerHTML = '';
@@ -787,6 +823,7 @@ function updateTagFilters(articles) {
         tagElement.classList.add('tag-badge');
         tagElement.dataset.tag = tag;
         tagElement.textContent = tag;
+        tagElement.title = `${tagCounts[tag]} articles`;
         
         if (currentState.tag === tag) {
             tagElement.classList.add('active');
@@ -996,9 +1033,6 @@ function generateTagsFromContent(title, description) {
     // Combiner les tags techniques et les mots fréquents
     const allTags = [...new Set([...technicalTags, ...frequentWords])];
     
-    // Ajouter ces tags à l'ensemble des tags générés
-    allTags.forEach(tag => currentState.generatedTags.add(tag));
-    
     // Limiter à 5 tags maximum
     return allTags.slice(0, 5);
 }
@@ -0,0 +1,32 @@
+import asyncio
+from typing import Any, Dict
+
+import pytest
+
+from app.db import database
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Base de données vide dans un répertoire temporaire (connexions ponctuelles, sans pool)"""
+    monkeypatch.setattr(database, "DATABASE_PATH", str(tmp_path / "rss_data.db"))
+    # Aucun résultat en cache d'un test précédent
+    database._articles_cache.bump()
+    database._sources_cache.bump()
+    database._count_cache.clear()
+    asyncio.run(database.init_db())
+    return database.DATABASE_PATH
+
+def make_article(index: int, source: str = "AWS", **fields) -> Dict[str, Any]:
+    """Article normalisé tel que produit par le RSSParser"""
+    article = {
+        "id": f"{index:032x}",
+        "title": f"Article {index}",
+        "link": f"https://example.com/articles/{index}",
+        "pub_date": f"2024-05-{1 + index % 28:02d}T10:00:00",
+        "description": f"Description de l'article {index}",
+        "content": f"Contenu de l'article {index}",
+        "source": source,
+        "tags": []
+    }
+    article.update(fields)
+    return article
@@ -0,0 +1,30 @@
+import asyncio
+
+from app.db import database
+
+from .conftest import make_article
+
+def test_maintained_counters_follow_writes(db):
+    async def scenario():
+        await database.save_articles([make_article(index, source="AWS" if index % 2 else "Azure") for index in range(6)])
+        await database.update_article_status(make_article(1)["id"], read=True)
+        await database.update_article_status(make_article(2)["id"], read_later=True)
+        return await database.get_counts(), await database.get_articles(read=False)
+    
+    counts, unread = asyncio.run(scenario())
+    assert counts == {"total": 6, "read": 1, "read_later": 1, "sources": {"AWS": 3, "Azure": 3}}
+    assert unread["total"] == 5
+
+def test_cached_total_follows_writes(db):
+    # Combinaison de filtres sans compteur maintenu: le total passe par _count_cache
+    async def scenario():
+        await database.save_articles([make_article(index) for index in range(3)])
+        before = await database.get_articles(source="AWS", read=True)
+        await database.update_article_status(make_article(1)["id"], read=True)
+        after = await database.get_articles(source="AWS", read=True)
+        return before, after
+    
+    before, after = asyncio.run(scenario())
+    assert before["total"] == 0
+    assert len(after["articles"]) == 1
+    assert after["total"] == 1
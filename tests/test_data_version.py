@@ -0,0 +1,63 @@
+import asyncio
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db import database
+from app.main import app
+
+from .conftest import make_article
+
+@pytest.fixture
+def client(db):
+    """Client de l'API sans les tâches de démarrage (worker d'ingestion, planificateur)"""
+    asyncio.run(database.save_articles([make_article(1), make_article(2)]))
+    return TestClient(app)
+
+def test_articles_not_modified_with_matching_etag(client):
+    response = client.get("/api/articles")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    
+    cached = client.get("/api/articles", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+    
+    # Préfixe W/ (ETag faible rendu par un proxy après compression) accepté
+    assert client.get("/api/articles", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+def test_articles_etag_changes_after_write(client):
+    etag = client.get("/api/articles").headers["etag"]
+    
+    asyncio.run(database.update_article_status(make_article(1)["id"], read=True))
+    
+    response = client.get("/api/articles", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert {article["id"]: article["read"] for article in response.json()["articles"]}[make_article(1)["id"]] is True
+
+def test_sources_etag_is_independent_of_articles(client):
+    etag = client.get("/api/sources").headers["etag"]
+    
+    asyncio.run(database.update_article_status(make_article(1)["id"], read=True))
+    
+    assert client.get("/api/sources", headers={"If-None-Match": etag}).status_code == 304
+
+def test_cached_reads_follow_writes_from_another_process(db):
+    async def read():
+        return await database.get_articles(), await database.get_counts()
+    
+    asyncio.run(database.save_articles([make_article(1)]))
+    page, counts = asyncio.run(read())
+    assert page["articles"][0]["read"] is False and counts["read"] == 0
+    
+    # Écriture hors de l'application (worker séparé): les caches ne sont pas notifiés
+    connection = sqlite3.connect(db)
+    connection.execute("UPDATE articles SET read = 1")
+    connection.commit()
+    connection.close()
+    
+    page, counts = asyncio.run(read())
+    assert page["articles"][0]["read"] is True and counts["read"] == 1
@@ -0,0 +1,46 @@
+import asyncio
+
+from app.db import database
+from app.services.dedup import mark_near_duplicates, simhash
+from app.services.executor import TaskExecutor
+from app.services.ingestion import ingest_articles
+
+from .conftest import make_article
+
+class SlowTagger:
+    """Générateur de tags lent: laisse les ingestions concurrentes s'entrelacer"""
+    
+    executor = None
+    
+    async def generate_tags_batch(self, articles):
+        await asyncio.sleep(0.05)
+        return [[{"name": "Cloud", "confidence": 0.9}] for _ in articles]
+
+ANNOUNCEMENT = (
+    "Amazon annonce la disponibilité générale d'un nouveau service de bases de données "
+    "serverless compatible PostgreSQL dans toutes les régions commerciales"
+)
+
+def test_concurrent_sources_share_one_canonical_article(db):
+    async def scenario():
+        await asyncio.gather(
+            ingest_articles([make_article(1, source="AWS", title="Nouveau service", description=ANNOUNCEMENT)], SlowTagger()),
+            ingest_articles([make_article(2, source="Blog", title="Nouveau service", description=ANNOUNCEMENT)], SlowTagger())
+        )
+        return await database.get_article(make_article(1)["id"]), await database.get_article(make_article(2)["id"])
+    
+    first, second = asyncio.run(scenario())
+    canonical = [article for article in (first, second) if article["canonical_id"] is None]
+    assert len(canonical) == 1
+    assert {first["canonical_id"], second["canonical_id"]} == {None, canonical[0]["id"]}
+
+def test_fingerprints_are_computed_in_the_cpu_pool(db):
+    executor = TaskExecutor(io_workers=2, cpu_workers=0)
+    articles = [make_article(index, title="Nouveau service", description=ANNOUNCEMENT) for index in range(3)]
+    try:
+        asyncio.run(mark_near_duplicates(articles, executor))
+    finally:
+        executor.shutdown()
+    
+    assert executor.metrics()["cpu"]["completed"] == 1
+    assert [article["simhash"] for article in articles] == [simhash(f"Nouveau service {ANNOUNCEMENT}")] * 3
@@ -0,0 +1,68 @@
+import asyncio
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import responses
+from app.db import database
+from app.main import app
+
+from .conftest import make_article
+
+ARTICLES = [
+    make_article(1, tags=[{"name": "Cloud", "confidence": 0.9}, {"name": "AI", "confidence": 0.8}]),
+    make_article(2, source="Azure", content="Contenu, avec virgule\net retour à la ligne"),
+    make_article(3)
+]
+
+@pytest.fixture
+def client(db):
+    asyncio.run(database.save_articles(ARTICLES))
+    return TestClient(app)
+
+def test_ndjson_export_streams_every_article(client):
+    response = client.get("/api/articles/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(row["id"] for row in rows) == sorted(article["id"] for article in ARTICLES)
+    exported = {row["id"]: row for row in rows}[ARTICLES[1]["id"]]
+    assert exported["content"] == ARTICLES[1]["content"]
+    assert exported["created_at"] and exported["updated_at"]
+
+def test_csv_export_round_trips(client):
+    response = client.get("/api/articles/export", params={"format": "csv", "fields": "title,content,tags"})
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert list(rows[0]) == ["id", "title", "pub_date", "content", "tags", "created_at", "updated_at"]
+    by_id = {row["id"]: row for row in rows}
+    assert by_id[ARTICLES[1]["id"]]["content"] == ARTICLES[1]["content"]
+    assert by_id[ARTICLES[0]["id"]]["tags"] == "Cloud, AI"
+
+def test_export_applies_filters(client):
+    rows = client.get("/api/articles/export", params={"source": "Azure"}).text.splitlines()
+    assert [json.loads(line)["id"] for line in rows] == [ARTICLES[1]["id"]]
+
+def test_export_rejects_invalid_parameters(client):
+    assert client.get("/api/articles/export", params={"format": "xml"}).status_code == 400
+    assert client.get("/api/articles/export", params={"since": "hier"}).status_code == 400
+    assert client.get("/api/articles/export", params={"fields": "password"}).status_code == 400
+
+def test_ndjson_chunks_are_bounded(monkeypatch):
+    monkeypatch.setattr(responses, "EXPORT_CHUNK_SIZE", 100)
+    
+    async def rows():
+        for index in range(10):
+            yield {"id": index, "title": "x" * 40}
+    
+    async def encode():
+        return [chunk async for chunk in responses.ndjson_chunks(rows())]
+    
+    chunks = asyncio.run(encode())
+    assert len(chunks) > 1
+    assert [json.loads(line)["id"] for line in b"".join(chunks).splitlines()] == list(range(10))
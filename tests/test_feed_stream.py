@@ -0,0 +1,133 @@
+import asyncio
+import time
+import xml.etree.ElementTree as ET
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.services import rss_parser as rss_parser_module
+from app.services.feed_fetcher import FeedFetcher
+from app.services.feed_stream import FeedStreamParser
+from app.services.rss_parser import FeedError, RSSParser, feed_next_chunk
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:media="http://search.yahoo.com/mrss/">
+<channel>
+<title>Blog</title><link>https://example.com</link><ttl>60</ttl>
+<item>
+<title>Kubernetes 1.30 released</title><link>https://example.com/k8s</link><guid>https://example.com/k8s</guid>
+<pubDate>Tue, 14 May 2024 10:00:00 GMT</pubDate><category>Cloud</category>
+<description>&lt;p&gt;Kubernetes &lt;b&gt;1.30&lt;/b&gt; is out.&lt;/p&gt;</description>
+<content:encoded><![CDATA[<p>Full <img src="https://example.com/a.png"> release notes</p>]]></content:encoded>
+</item>
+<item>
+<title>Second post</title><link>https://example.com/2</link><pubDate>Wed, 15 May 2024 10:00:00 GMT</pubDate>
+<description>Plain text</description><media:content url="https://example.com/m.jpg" type="image/jpeg"/>
+</item>
+</channel>
+</rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<title>Atom</title><id>urn:feed</id><updated>2024-05-14T10:00:00Z</updated>
+<entry>
+<title>Serverless update</title><link rel="alternate" href="https://example.com/s"/><id>urn:1</id>
+<published>2024-05-14T10:00:00Z</published><category term="Serverless"/>
+<summary>Short summary</summary><content type="html">&lt;p&gt;Long &lt;em&gt;content&lt;/em&gt;&lt;/p&gt;</content>
+</entry>
+<entry>
+<title>Xhtml entry</title><link href="https://example.com/x"/><id>urn:2</id><published>2024-05-13T10:00:00Z</published>
+<content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><p>Inline <b>xhtml</b></p></div></content>
+</entry>
+</feed>"""
+
+def stream_entries(content, chunk_size):
+    parser = FeedStreamParser()
+    entries = []
+    for start in range(0, len(content), chunk_size):
+        entries.extend(parser.feed(content[start:start + chunk_size]))
+    return entries + parser.close(), parser
+
+@pytest.mark.parametrize("content", [RSS, ATOM], ids=["rss", "atom"])
+def test_stream_parser_matches_feedparser(content):
+    parser = RSSParser()
+    entries, _ = stream_entries(content, len(content))
+    assert parser.normalize_entries("Blog", entries) == parser.parse_feed("Blog", content, {})["articles"]
+
+@pytest.mark.parametrize("content", [RSS, ATOM], ids=["rss", "atom"])
+def test_split_chunks_give_the_same_entries(content):
+    whole, _ = stream_entries(content, len(content))
+    split, parser = stream_entries(content, 7)
+    assert split == whole
+    assert parser.entry_count == 2
+
+def test_channel_hints_are_read():
+    _, parser = stream_entries(RSS, 7)
+    assert parser.channel == {"ttl": "60"}
+
+def test_malformed_feed_raises_parse_error(tmp_path):
+    spool = tmp_path.joinpath("feed.xml")
+    spool.write_bytes(b"<rss><channel><item><title>Broken</item></channel></rss>")
+    with spool.open("rb") as file, pytest.raises(ET.ParseError):
+        feed_next_chunk(FeedStreamParser(), file)
+
+class ChunkedFetcher:
+    """Moteur de récupération servant un contenu fixe en blocs, sans Content-Length"""
+    
+    def __init__(self, content, chunk_size=16):
+        self.content = content
+        self.chunk_size = chunk_size
+    
+    @asynccontextmanager
+    async def stream(self, url, headers=None):
+        async def chunks():
+            for start in range(0, len(self.content), self.chunk_size):
+                yield self.content[start:start + self.chunk_size]
+        yield {"status": 200, "url": url, "headers": {}, "chunks": chunks()}
+
+async def collect(parser, cache_state=None):
+    return [article async for article in parser.iter_articles("Blog", "https://example.com/feed", cache_state, batch_size=1)]
+
+def test_iter_articles_streams_large_feeds(monkeypatch):
+    monkeypatch.setattr(rss_parser_module, "STREAM_READ_SIZE", 16)
+    cache_state = {}
+    articles = asyncio.run(collect(RSSParser(fetcher=ChunkedFetcher(RSS)), cache_state))
+    assert articles == RSSParser().parse_feed("Blog", RSS, {})["articles"]
+    assert cache_state["poll_hint"] == 3600
+
+def test_iter_articles_rejects_feed_broken_after_entries(monkeypatch):
+    monkeypatch.setattr(rss_parser_module, "STREAM_READ_SIZE", 16)
+    broken = RSS.replace(b"</channel>", b"</item></channel>")
+    cache_state = {}
+    with pytest.raises(FeedError):
+        asyncio.run(collect(RSSParser(fetcher=ChunkedFetcher(broken)), cache_state))
+    assert "content_hash" not in cache_state
+
+class SlowResponse:
+    """Réponse dont chaque bloc arrive lentement, mais dans le délai d'un bloc"""
+    
+    status_code = 200
+    url = "https://example.com/feed"
+    headers = {}
+    
+    def iter_content(self, chunk_size):
+        for _ in range(10):
+            time.sleep(0.05)
+            yield b"x" * chunk_size
+    
+    def close(self):
+        pass
+
+def test_stream_deadline_covers_the_whole_request():
+    fetcher = FeedFetcher(timeout=0.2)
+    fetcher._open = lambda url, headers: SlowResponse()
+    
+    async def download():
+        async with fetcher.stream("https://example.com/feed") as response:
+            return [chunk async for chunk in response["chunks"]]
+    
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(download())
+    finally:
+        fetcher.close()
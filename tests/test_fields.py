@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db import database
+from app.main import app
+
+from .conftest import make_article
+
+def test_resolve_article_fields():
+    assert database.resolve_article_fields(None) == database.ARTICLE_LIST_FIELDS
+    assert "content" not in database.resolve_article_fields("list")
+    assert database.resolve_article_fields("full") == database.ARTICLE_FIELDS
+    # Ordre de ARTICLE_FIELDS, avec id et pub_date toujours présents
+    assert database.resolve_article_fields("tags, title") == ("id", "title", "pub_date", "tags")
+    with pytest.raises(ValueError):
+        database.resolve_article_fields("title,password")
+
+@pytest.fixture
+def client(db):
+    asyncio.run(database.save_articles([make_article(1, tags=[{"name": "Cloud", "confidence": 0.9}])]))
+    return TestClient(app)
+
+def test_list_omits_content_by_default(client):
+    article = client.get("/api/articles").json()["articles"][0]
+    assert "content" not in article
+    assert article["description"] == make_article(1)["description"]
+
+def test_list_returns_requested_fields_only(client):
+    articles = client.get("/api/articles", params={"fields": "title,tags"}).json()["articles"]
+    assert articles == [{
+        "id": make_article(1)["id"],
+        "title": "Article 1",
+        "pub_date": make_article(1)["pub_date"],
+        "tags": [{"name": "Cloud", "confidence": 0.9}]
+    }]
+    
+    full = client.get("/api/articles", params={"fields": "full"}).json()["articles"][0]
+    assert full["content"] == make_article(1)["content"]
+
+def test_unknown_field_is_rejected(client):
+    assert client.get("/api/articles", params={"fields": "title,password"}).status_code == 400
+
+def test_detail_returns_the_full_article(client):
+    article = client.get(f"/api/articles/{make_article(1)['id']}").json()
+    assert set(article) == set(database.ARTICLE_FIELDS)
+    assert article["content"] == make_article(1)["content"]
+    assert article["read"] is False
+    
+    assert client.get(f"/api/articles/{make_article(2)['id']}").status_code == 404
@@ -0,0 +1,72 @@
+import importlib.util
+import re
+from typing import Optional
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.services.html_processor import clear_html_cache, process_html
+
+BACKENDS = ["html.parser"] + [name for name in ("lxml", "selectolax") if importlib.util.find_spec(name)]
+
+FRAGMENTS = [
+    "<p>Kubernetes <b>1.30</b> est   disponible.</p>\n<p>Notes de version</p>",
+    "<div><script>track()</script><style>p {color: red}</style><p>Texte visible</p></div>",
+    "Texte brut &amp; entités &lt;échappées&gt;",
+    '<p><img src="/icon.png" width="16" height="16">Annonce<img src="/banner.png" width="800"></p>',
+    '<p><img src="/a.png" width="20"><img src="/b.png" height="40"></p>',
+    '<p><img src="/sans-dimensions.png">Illustration</p>',
+    '<p><img src="/invalide.png" width="auto"><img src="/grande.png" width="300"></p>',
+    '<ul><li>Un</li><li>Deux</li></ul><pre>  code   indenté </pre>',
+    "   "
+]
+
+def legacy_clean_html(html_content: str) -> str:
+    """Ancien RSSParser._clean_html"""
+    if not html_content:
+        return ""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    for script in soup(["script", "style"]):
+        script.extract()
+    text = soup.get_text(separator=' ', strip=True)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def legacy_content_image(content_html: str) -> Optional[str]:
+    """Ancienne recherche de l'image principale dans le contenu (RSSParser._extract_image)"""
+    soup = BeautifulSoup(content_html, 'html.parser')
+    for img in soup.find_all('img'):
+        src = img.get('src')
+        width = img.get('width')
+        height = img.get('height')
+        try:
+            if src and ((width and int(width) > 150) or (height and int(height) > 150) or
+                       ('width' not in img.attrs and 'height' not in img.attrs)):
+                return src
+        except ValueError:
+            pass
+    img = soup.find('img')
+    if img and img.get('src'):
+        return img['src']
+    return None
+
+def legacy_first_image(summary: str) -> Optional[str]:
+    """Ancienne recherche d'image dans le résumé"""
+    img = BeautifulSoup(summary, 'html.parser').find('img')
+    return img['src'] if img and img.get('src') else None
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("html", FRAGMENTS)
+def test_single_pass_matches_beautifulsoup(backend, html):
+    processed = process_html(html, backend)
+    assert processed.text == legacy_clean_html(html)
+    assert processed.image == legacy_content_image(html)
+    assert processed.first_image == legacy_first_image(html)
+
+def test_identical_fragments_are_processed_once():
+    html = FRAGMENTS[0]
+    first = process_html(html)
+    assert process_html(html) is first
+    
+    clear_html_cache()
+    again = process_html(html)
+    assert again is not first and again == first
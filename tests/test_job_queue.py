@@ -0,0 +1,82 @@
+import asyncio
+
+from app.db import database
+from app.services.ingestion import refresh_source
+from app.services.ingestion_worker import IngestionWorker
+from app.services.rss_parser import FeedError
+
+from .conftest import make_article
+
+class FailingParser:
+    """Parser dont le flux est introuvable"""
+    
+    async def iter_articles(self, source_name, source_url, cache_state=None):
+        raise FeedError(f"Erreur HTTP 404 lors de la récupération de {source_name}")
+        yield
+
+class DownloadedParser:
+    """Parser d'un petit flux: l'état du cache HTTP est mis à jour avant le premier article"""
+    
+    async def iter_articles(self, source_name, source_url, cache_state=None):
+        cache_state.update(etag='"v2"', last_modified=None, content_hash="h2")
+        yield make_article(1, source=source_name)
+
+class FailingTagger:
+    executor = None
+    
+    async def generate_tags_batch(self, articles):
+        raise RuntimeError("Modèle indisponible")
+
+class NoTagger:
+    executor = None
+    
+    async def generate_tags_batch(self, articles):
+        return [[] for _ in articles]
+
+SOURCE = {"name": "AWS", "url": "https://example.com/feed.xml", "category": "cloud"}
+
+def test_failed_refresh_marks_job_source_failed(db):
+    async def scenario():
+        await database.save_source(dict(SOURCE))
+        await database.enqueue_refresh_job(["AWS"])
+        job = await database.claim_job("test")
+        await IngestionWorker(FailingParser(), NoTagger(), name="test").process_job(job)
+        return await database.get_job(job["id"]), (await database.get_sources())[0]
+    
+    job, source = asyncio.run(scenario())
+    assert job["progress"]["failed"] == 1
+    assert job["progress"]["done"] == 0
+    assert job["sources"][0]["status"] == database.JOB_FAILED
+    assert "404" in job["sources"][0]["error"]
+    # Le nouvel essai est tout de même planifié
+    assert source["failure_count"] == 1
+    assert source["next_poll_at"] is not None
+
+def test_failed_ingestion_keeps_previous_cache_state(db):
+    async def scenario():
+        await database.save_source(dict(SOURCE, etag='"v1"', content_hash="h1"))
+        source = (await database.get_sources())[0]
+        try:
+            await refresh_source(source, DownloadedParser(), FailingTagger())
+        except RuntimeError:
+            pass
+        return (await database.get_sources())[0]
+    
+    source = asyncio.run(scenario())
+    # Le flux sera retéléchargé et ses articles ingérés à la prochaine récupération
+    assert source["etag"] == '"v1"'
+    assert source["content_hash"] == "h1"
+    assert source["failure_count"] == 1
+
+def test_successful_refresh_stores_cache_state(db):
+    async def scenario():
+        await database.save_source(dict(SOURCE, etag='"v1"', content_hash="h1"))
+        source = (await database.get_sources())[0]
+        saved = await refresh_source(source, DownloadedParser(), NoTagger())
+        return saved, (await database.get_sources())[0]
+    
+    saved, source = asyncio.run(scenario())
+    assert saved == 1
+    assert source["etag"] == '"v2"'
+    assert source["content_hash"] == "h2"
+    assert source["failure_count"] == 0
@@ -0,0 +1,25 @@
+import pytest
+
+from app.services.tag_generator import TagGenerator
+
+@pytest.fixture(scope="module")
+def generator():
+    return TagGenerator(embeddings_path=None, cache_path=None)
+
+def tag_names(generator, text):
+    return {name for name, _ in generator._match_keywords(text.lower())}
+
+def test_keywords_match_whole_words_only(generator):
+    # "ai" dans "maintain" ou "email", "java" dans "javascript", "iot" dans "idiot"
+    assert tag_names(generator, "How to maintain your email client") == set()
+    assert tag_names(generator, "Modern JavaScript frameworks") == {"Javascript"}
+    assert "Iot" not in tag_names(generator, "Do not be an idiot")
+
+def test_keywords_match_synonyms_and_punctuation(generator):
+    assert tag_names(generator, "Running k8s clusters") == {"Kubernetes"}
+    assert tag_names(generator, "Node.js and CI/CD pipelines") == {"Javascript", "Devops"}
+
+def test_keyword_confidence_grows_with_matches(generator):
+    once = dict(generator._match_keywords("terraform"))["Terraform"]
+    thrice = dict(generator._match_keywords("terraform terraform terraform"))["Terraform"]
+    assert thrice > once
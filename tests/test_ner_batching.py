@@ -0,0 +1,50 @@
+import asyncio
+
+from app.services.executor import TaskExecutor
+from app.services.tag_generator import TagGenerator, tag_batch_in_worker, _worker_generators
+
+class RecordingPipeline:
+    """Pipeline spaCy sans entités qui enregistre les paramètres de nlp.pipe"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def pipe(self, texts, batch_size, n_process):
+        texts = list(texts)
+        self.calls.append((len(texts), n_process))
+        return [type("Doc", (), {"ents": []})() for _ in texts]
+
+def make_generator(executor=None):
+    generator = TagGenerator(batch_size=8, n_process=4, executor=executor, embeddings_path=None, cache_path=None)
+    generator.nlp = RecordingPipeline()
+    generator._models_loaded = True
+    return generator
+
+def articles(count):
+    return [{"title": f"Article {index}", "content": "Kubernetes release notes"} for index in range(count)]
+
+def test_large_batch_uses_every_process():
+    generator = make_generator()
+    generator.tag_batch(articles(64))
+    assert generator.nlp.calls == [(64, 4)]
+
+def test_process_count_follows_text_count():
+    generator = make_generator()
+    generator.tag_batch(articles(20))
+    assert generator.nlp.calls == [(20, 3)]
+    assert generator._pipe_processes(1) == 1
+
+def test_executor_chunks_feed_every_process():
+    executor = TaskExecutor(io_workers=2, cpu_workers=0)
+    generator = make_generator(executor)
+    try:
+        asyncio.run(generator.generate_tags_batch(articles(64)))
+    finally:
+        executor.shutdown()
+    assert generator.nlp.calls == [(32, 4), (32, 4)]
+
+def test_worker_spec_keeps_process_count():
+    generator = TagGenerator(batch_size=8, n_process=4, embeddings_path=None, cache_path=None)
+    spec = generator._worker_spec()
+    tag_batch_in_worker(spec, [])
+    assert _worker_generators[spec].n_process == 4
@@ -0,0 +1,21 @@
+import asyncio
+
+from app.db import database
+
+from .conftest import make_article
+
+def test_cursor_walk_returns_every_article_once(db):
+    # Plusieurs articles par date: le curseur départage par identifiant
+    articles = [make_article(index, pub_date=f"2024-05-{1 + index % 5:02d}T10:00:00") for index in range(23)]
+    
+    async def walk():
+        await database.save_articles(articles)
+        seen, cursor = [], ""
+        while cursor is not None:
+            page = await database.get_articles(page_size=5, cursor=cursor, include_total=False)
+            seen.extend(article["id"] for article in page["articles"])
+            cursor = page["next_cursor"]
+        return seen
+    
+    expected = [article["id"] for article in sorted(articles, key=lambda a: (a["pub_date"], a["id"]), reverse=True)]
+    assert asyncio.run(walk()) == expected
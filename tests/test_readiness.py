@@ -0,0 +1,23 @@
+import asyncio
+
+from app.services.executor import TaskExecutor
+from app.services.tag_generator import TagGenerator
+
+def test_readiness_does_not_use_the_cpu_pool():
+    executor = TaskExecutor(io_workers=2, cpu_workers=1)
+    generator = TagGenerator(executor=executor, embeddings_path=None, cache_path=None)
+    try:
+        # Aucun lot tagué: état de ce processus, sans démarrer le pool
+        assert generator.tagging_model_status() == generator.model_status()
+        assert executor._cpu_pool is None
+        
+        asyncio.run(generator.generate_tags_batch([{"title": "Kubernetes", "content": "Release notes"}]))
+        completed = executor.metrics()["cpu"]["completed"]
+        
+        # État rapporté par le lot tagué dans le pool, lu sans nouvelle tâche
+        status = generator.tagging_model_status()
+        assert status == generator._worker_model_status
+        assert set(status) == {"spacy", "keybert"}
+        assert executor.metrics()["cpu"]["completed"] == completed
+    finally:
+        executor.shutdown()
@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db import database
+from app.services import scheduler
+from app.services.scheduler import FeedScheduler, first_poll, next_poll
+
+NOW = datetime(2024, 5, 14, 10, 0, 0)
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(scheduler.random, "uniform", lambda low, high: 1.0)
+
+def delay(poll):
+    return (datetime.fromisoformat(poll["next_poll_at"]) - NOW).total_seconds()
+
+def test_interval_shrinks_with_new_articles_and_grows_without():
+    source = {"poll_interval": 3600}
+    
+    faster = next_poll(source, new_articles=3, failed=False, now=NOW)
+    assert faster == {"poll_interval": 1800, "failure_count": 0, "next_poll_at": (NOW + timedelta(seconds=1800)).isoformat()}
+    assert next_poll(source, new_articles=0, failed=False, now=NOW)["poll_interval"] == 5400
+
+def test_interval_respects_feed_hint_and_bounds():
+    assert next_poll({"poll_interval": 600, "poll_hint": 3600}, 5, False, NOW)["poll_interval"] == 3600
+    assert next_poll({"poll_interval": 400}, 5, False, NOW)["poll_interval"] == scheduler.MIN_POLL_INTERVAL
+    assert next_poll({"poll_interval": scheduler.MAX_POLL_INTERVAL}, 0, False, NOW)["poll_interval"] == scheduler.MAX_POLL_INTERVAL
+
+def test_failures_back_off_and_keep_the_interval():
+    poll = next_poll({"poll_interval": 1800, "failure_count": 1}, 0, True, NOW)
+    assert poll["poll_interval"] == 1800
+    assert poll["failure_count"] == 2
+    assert delay(poll) == 1800 * 4
+    assert delay(next_poll({"poll_interval": 1800, "failure_count": 10}, 0, True, NOW)) == scheduler.MAX_FAILURE_BACKOFF
+
+def test_first_polls_are_spread_per_source():
+    offsets = [(datetime.fromisoformat(first_poll(f"Source {index}", NOW)) - NOW).total_seconds() for index in range(20)]
+    assert all(0 <= offset < scheduler.FIRST_POLL_SPREAD for offset in offsets)
+    assert len(set(offsets)) == 20
+    assert first_poll("Source 1", NOW) == first_poll("Source 1", NOW)
+
+def test_unscheduled_sources_are_not_all_polled_at_startup(db):
+    async def scenario():
+        for index in range(5):
+            await database.save_source({"name": f"Source {index}", "url": f"https://example.com/{index}.xml", "category": "cloud"})
+        await FeedScheduler().run_once()
+        return await database.get_sources()
+    
+    sources = asyncio.run(scenario())
+    polls = sorted(source["next_poll_at"] for source in sources)
+    assert all(polls)
+    assert len(set(polls)) == 5
+    assert datetime.fromisoformat(polls[-1]) - datetime.fromisoformat(polls[0]) < timedelta(seconds=scheduler.FIRST_POLL_SPREAD)
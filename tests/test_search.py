@@ -0,0 +1,50 @@
+import asyncio
+
+from app.db import database
+
+from .conftest import make_article
+
+def search_ids(**filters):
+    async def search():
+        page = await database.get_articles(**filters)
+        return [article["id"] for article in page["articles"]], page
+    return asyncio.run(search())
+
+def test_search_matches_prefixes_and_accents(db):
+    asyncio.run(database.save_articles([
+        make_article(1, title="Déploiement Kubernetes en production"),
+        make_article(2, title="Nouveautés de Terraform")
+    ]))
+    
+    assert search_ids(search="kubern")[0] == [make_article(1)["id"]]
+    assert search_ids(search="deploiement")[0] == [make_article(1)["id"]]
+    assert search_ids(search="kubernetes terraform")[0] == []
+
+def test_search_ranks_title_matches_first(db):
+    # Le terme n'apparaît que dans le contenu de l'article le plus récent
+    asyncio.run(database.save_articles([
+        make_article(1, title="Serverless en pratique", pub_date="2024-05-01T10:00:00"),
+        make_article(2, content="Un paragraphe qui cite serverless", pub_date="2024-05-20T10:00:00")
+    ]))
+    
+    ids, page = search_ids(search="serverless")
+    assert ids == [make_article(1)["id"], make_article(2)["id"]]
+    assert page["total"] == 2
+
+def test_search_index_follows_updates(db):
+    asyncio.run(database.save_articles([make_article(1, title="Annonce Kubernetes")]))
+    asyncio.run(database.save_articles([make_article(1, title="Annonce Terraform")]))
+    
+    assert search_ids(search="kubernetes")[0] == []
+    assert search_ids(search="terraform")[0] == [make_article(1)["id"]]
+
+def test_search_highlight_marks_terms(db):
+    asyncio.run(database.save_articles([make_article(1, title="Déploiement Kubernetes")]))
+    
+    _, page = search_ids(search="kubernetes", highlight=True)
+    assert "<mark>Kubernetes</mark>" in page["articles"][0]["snippet"]
+
+def test_search_without_terms_falls_back_to_like(db):
+    asyncio.run(database.save_articles([make_article(1, title="Nouveautés C++")]))
+    
+    assert search_ids(search="++")[0] == [make_article(1)["id"]]
@@ -0,0 +1,64 @@
+import asyncio
+import json
+import time
+
+from app.services.tag_cache import TagCache
+from app.services.tag_generator import TagGenerator
+
+TAGS = [{"name": "Cloud", "confidence": 0.9}]
+
+def test_cache_is_cleared_when_the_version_changes(tmp_path):
+    path = str(tmp_path / "tag_cache.db")
+    cache = TagCache(path, version="v1")
+    cache.put_many({"key": TAGS})
+    cache.close()
+    
+    same = TagCache(path, version="v1")
+    assert same.get_many(["key"]) == {"key": TAGS}
+    same.close()
+    
+    changed = TagCache(path, version="v2")
+    assert changed.get_many(["key"]) == {}
+    changed.close()
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = TagCache(str(tmp_path / "tag_cache.db"), max_entries=2)
+    # Pauses: dates d'utilisation distinctes quelle que soit la résolution de l'horloge
+    cache.put_many({"first": TAGS})
+    time.sleep(0.01)
+    cache.put_many({"second": TAGS})
+    time.sleep(0.01)
+    cache.get_many(["first"])
+    time.sleep(0.01)
+    cache.put_many({"third": TAGS})
+    
+    assert set(cache.get_many(["first", "second", "third"])) == {"first", "third"}
+    assert cache.stats()["evictions"] == 1
+    cache.close()
+
+def write_keywords(path, keywords):
+    path.write_text(json.dumps(keywords), encoding="utf-8")
+    return str(path)
+
+def generate(keywords_path, cache_path, article):
+    generator = TagGenerator(keywords_path=keywords_path, embeddings_path=None, cache_path=cache_path)
+    try:
+        tags = asyncio.run(generator.generate_tags_batch([article]))[0]
+        return {tag["name"] for tag in tags}, generator.cache_stats()
+    finally:
+        generator.cache.close()
+
+def test_taxonomy_change_invalidates_cached_tags(tmp_path):
+    cache_path = str(tmp_path / "tag_cache.db")
+    article = {"title": "Running k8s clusters", "content": "Kubernetes upgrade notes"}
+    keywords = write_keywords(tmp_path / "keywords.json", {"kubernetes": ["kubernetes"]})
+    
+    first, stats = generate(keywords, cache_path, article)
+    assert "Kubernetes" in first and stats["misses"] == 1
+    assert generate(keywords, cache_path, article)[1]["hits"] == 1
+    
+    # Nouveau synonyme: les tags mis en cache avec l'ancienne taxonomie ne sont plus servis
+    keywords = write_keywords(tmp_path / "keywords.json", {"kubernetes": ["kubernetes"], "clusters": ["k8s"]})
+    updated, stats = generate(keywords, cache_path, article)
+    assert stats["misses"] == 1
+    assert "Clusters" in updated
@@ -0,0 +1,31 @@
+import asyncio
+
+from app.db import database
+
+from .conftest import make_article
+
+def test_tag_filter_matches_exact_tag(db):
+    async def scenario():
+        await database.save_articles([
+            make_article(1, tags=[{"name": "AI", "confidence": 0.9}]),
+            make_article(2, tags=[{"name": "AI Ethics", "confidence": 0.9}]),
+            make_article(3, tags=[{"name": "Email", "confidence": 0.9}])
+        ])
+        return await database.get_articles(tag="AI")
+    
+    page = asyncio.run(scenario())
+    assert [article["id"] for article in page["articles"]] == [make_article(1)["id"]]
+    assert page["total"] == 1
+
+def test_tag_facets_follow_filters(db):
+    async def scenario():
+        await database.save_articles([
+            make_article(1, tags=[{"name": "AI", "confidence": 0.9}, {"name": "Cloud", "confidence": 0.8}]),
+            make_article(2, source="Azure", tags=[{"name": "Cloud", "confidence": 0.9}]),
+            make_article(3, source="Azure", tags=[{"name": "Cloud", "confidence": 0.9}])
+        ])
+        return await database.get_tag_facets(), await database.get_tag_facets(source="AWS")
+    
+    everything, aws = asyncio.run(scenario())
+    assert everything == [{"name": "Cloud", "count": 3}, {"name": "AI", "count": 1}]
+    assert aws == [{"name": "AI", "count": 1}, {"name": "Cloud", "count": 1}]
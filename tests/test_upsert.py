@@ -0,0 +1,56 @@
+import asyncio
+import sqlite3
+
+from app.db import database
+
+from .conftest import make_article
+
+def test_upsert_preserves_user_status(db):
+    async def scenario():
+        article = make_article(1)
+        await database.save_articles([article])
+        await database.update_article_status(article["id"], read_later=True, read=True)
+        
+        # Nouvelle version de l'article reçue du flux
+        await database.save_articles([dict(article, title="Titre corrigé", read=False, read_later=False)])
+        return await database.get_article(article["id"])
+    
+    saved = asyncio.run(scenario())
+    assert saved["title"] == "Titre corrigé"
+    assert saved["read"] is True
+    assert saved["read_later"] is True
+
+def test_retention_keeps_articles_still_in_their_feed(db):
+    still_listed, dropped = make_article(1), make_article(2)
+    
+    async def scenario():
+        await database.save_articles([still_listed, dropped])
+        connection = sqlite3.connect(db)
+        connection.execute("UPDATE articles SET created_at = '2020-01-01T00:00:00', last_seen_at = '2020-01-01T00:00:00'")
+        connection.commit()
+        connection.close()
+        
+        # Le premier article figure toujours dans le flux, inchangé
+        await database.mark_articles_seen([still_listed["id"]])
+        await database.delete_old_articles(days=30)
+        return await database.get_article(still_listed["id"]), await database.get_article(dropped["id"])
+    
+    kept, deleted = asyncio.run(scenario())
+    assert kept is not None
+    assert deleted is None
+
+def test_export_since_includes_updated_articles(db):
+    async def scenario():
+        await database.save_articles([make_article(1), make_article(2)])
+        connection = sqlite3.connect(db)
+        connection.execute("UPDATE articles SET created_at = '2020-01-01T00:00:00', updated_at = '2020-01-01T00:00:00'")
+        connection.commit()
+        connection.close()
+        
+        # Article modifié dans son flux après le dernier export
+        await database.save_articles([make_article(2, title="Titre modifié")])
+        return [row async for row in database.export_articles(since="2021-01-01T00:00:00")]
+    
+    rows = asyncio.run(scenario())
+    assert [row["title"] for row in rows] == ["Titre modifié"]
+    assert rows[0]["created_at"] == "2020-01-01T00:00:00"